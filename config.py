@@ -11,9 +11,95 @@ AUDIO_FOLDER = "audio"
 # Media-Wechsel-Konfiguration
 IMAGE_DISPLAY_TIME = 30.0  # Sekunden pro Bild (Standardwert: 30 Sekunden Bildwechsel)
 VIDEO_LOOP_CHECK_TIME = 30.0  # Sekunden bis Video-Wechsel geprüft wird
+VIDEO_LOOP_SINGLE = True  # Einzelnes Video nahtlos wiederholen (input-repeat statt Neu-Öffnen)
 AUDIO_FADE_TIME = 0.04  # Sekunden für Audio-Übergang (Standardwert: 40ms Audiofade)
+AUDIO_FADE_TICK_RATE = 50  # Max. Lautstärke-Updates pro Sekunde während eines Fades
+SLIDESHOW_PREFETCH_COUNT = 3  # Anzahl Bilder, die im Hintergrund vorab dekodiert werden
 
 # Mindestlaufzeiten (Stabilität bei schwankenden Sensorwerten)
 MIN_VIDEO_RUNTIME = 3.0  # Sekunden (Standardwert: 3s Min-Video-Zeit)
 MIN_IMAGE_DISPLAY_TIME = 3.0  # Sekunden (Standardwert: 3s Min-Bild-Zeit)
 MIN_AUDIO_RUNTIME = 3.0  # Sekunden (Standardwert: 3s Min-Audio-Zeit)
+
+# Fortsetzen bei Rückkehr eines Besuchers
+RESUME_TIMEOUT = 120.0  # Sekunden, in denen ein Video an der alten Position fortgesetzt wird
+
+# Medien-Index (Dauer, Codecs, Auflösung - im Hintergrund per libvlc ermittelt)
+PROBE_DB_PATH = "media_index.db"  # SQLite-Datei im Projektverzeichnis
+PROBE_WORKERS = 2  # Parallele Analysen (Pi: nicht mehr als 2)
+PROBE_TIMEOUT = 5.0  # Sekunden pro Datei bis zum Abbruch
+
+# Decode-Budget (was der Pi flüssig dekodiert - Pi 4: 1080p30 H.264 per Hardware)
+DECODE_MAX_PIXEL_RATE = 1920 * 1080 * 30  # Pixel pro Sekunde (Breite x Höhe x Bildrate)
+DECODE_MAX_BITRATE = 20_000_000  # Bit pro Sekunde
+DECODE_ALLOWED_CODECS = ('h264', 'avc1', 'mpeg-4 avc')  # Teilstrings des Codec-Namens, Kleinschreibung
+DECODE_TEST_SECONDS = 8.0  # Dauer des Test-Decodes pro Datei
+DECODE_MAX_LOST_RATIO = 0.02  # Anteil verlorener Frames, ab dem ein Video als zu schwer gilt
+
+# Fehler-Register (nicht abspielbare Dateien)
+FAILURE_REGISTRY_FILE = "media_failures.json"  # Wird im Projektverzeichnis gespeichert
+FAILURE_QUARANTINE_AFTER = 3  # Fehlschläge bis zur Quarantäne
+FAILURE_BACKOFF_BASE = 60.0  # Sekunden Quarantäne beim ersten Mal, verdoppelt sich danach
+FAILURE_BACKOFF_MAX = 6 * 3600.0  # Sekunden, längste Quarantäne
+FAILURE_SUCCESS_AFTER = 5.0  # Sekunden echter Wiedergabe (oder normales Ende), bis Fehler einer Datei verworfen werden
+
+# Wiedergabe-Telemetrie (libvlc-Statistik: dekodierte/verlorene Frames, Bitrate)
+TELEMETRY_INTERVAL = 5.0  # Sekunden zwischen zwei Messungen
+TELEMETRY_EXPORT_FILE = "playback_metrics.json"  # Export für Fernabfrage (leer = kein Export)
+TELEMETRY_EXPORT_INTERVAL = 60.0  # Sekunden zwischen zwei Exporten
+TELEMETRY_KEEP_HOURS = 48  # Stunden-Aggregate, die im Export behalten werden
+
+# VLC-Watchdog (Neuaufbau der VLC-Instanz bei Hängern statt Absturz + systemd-Neustart)
+WATCHDOG_ENABLED = True
+WATCHDOG_INTERVAL = 0.25  # Sekunden zwischen zwei Prüfungen
+WATCHDOG_OPEN_TIMEOUT = 5.0  # Sekunden in Opening/Buffering bis zum Neuaufbau
+WATCHDOG_STALL_TIMEOUT = 3.0  # Sekunden ohne Zeitfortschritt (Playing) bis zum Neuaufbau
+
+# Player-Prozess (libvlc in eigenem Prozess - ein VLC-Absturz beendet nicht die ganze Station)
+PLAYER_PROCESS = False  # True = Video-Player als Kindprozess starten
+PLAYER_CALL_TIMEOUT = 10.0  # Sekunden bis ein Aufruf als hängend gilt und der Prozess neu startet
+PLAYER_START_TIMEOUT = 10.0  # Sekunden bis der Player-Prozess bereit sein muss
+PLAYER_SUPERVISE_INTERVAL = 0.5  # Sekunden zwischen zwei Prüfungen des Player-Prozesses
+
+# Wiedergabe-Backend für Videos
+MEDIA_ENGINE = "vlc"  # "vlc" (libvlc) oder "mpv" (langlebiger mpv-Prozess über JSON-IPC)
+MPV_SOCKET_PATH = "/tmp/pi-media-station-mpv.sock"  # IPC-Socket des mpv-Prozesses
+MPV_EXTRA_ARGS = ('--hwdec=auto-safe',)  # Zusätzliche mpv-Optionen (Pi: Hardware-Dekodierung)
+MPV_START_TIMEOUT = 5.0  # Sekunden bis der IPC-Socket erreichbar sein muss
+
+# Backend-Auswahl pro Medientyp (erstes verfügbares gewinnt, Prüfung beim Start)
+# "engine" = Haupt-Backend der Engine (libvlc, mpv oder Player-Prozess)
+MEDIA_BACKENDS = {
+    'image': ('pil', 'engine'),  # Standbilder direkt per PIL ins tk-Label - kein Decoder-Start
+    'cue': ('pygame', 'engine'),  # Kurze WAV-Signale über den pygame-Mixer
+    'audio': ('engine',),
+    'video': ('engine',),
+}
+AUDIO_CUE_MAX_SECONDS = 10.0  # WAV-Dateien bis zu dieser Länge gelten als Signal ("cue")
+
+# Page-Cache-Vorladen (SD-Karte/USB-Stick: Dateianfänge vor dem Start lesen)
+PREFETCH_ENABLED = True
+PREFETCH_COUNT = 2  # Nächste Playlist-Einträge, die vorgeladen werden
+PREFETCH_HEAD_BYTES = 32 * 1024 * 1024  # Bytes pro Datei (Anfang - deckt die ersten Sekunden ab)
+PREFETCH_BUDGET_BYTES = 128 * 1024 * 1024  # Obergrenze für alle vorgeladenen Dateien zusammen
+PREFETCH_REFRESH = 300.0  # Sekunden bis eine Datei erneut vorgewärmt wird
+
+# RAM-Cache für häufig ausgelöste Medien (tmpfs - nur sinnvoll bei kleiner Playlist auf langsamem Datenträger)
+HOT_CACHE_ENABLED = False
+HOT_CACHE_DIR = "/dev/shm/pi-media-station"  # tmpfs-Verzeichnis für die Kopien
+HOT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Obergrenze im RAM, darüber wird nach LRU verdrängt
+HOT_CACHE_MIN_PLAYS = 2  # Starts, ab denen eine Datei in den RAM kopiert wird
+HOT_CACHE_STATS_FILE = "hot_cache_stats.json"  # Start-Zähler (überlebt Neustarts, tmpfs nicht)
+
+# Ordnerüberwachung (watchdog) - neue/gelöschte Dateien ohne "Neu scannen" übernehmen
+FOLDER_WATCH_ENABLED = True
+FOLDER_WATCH_DEBOUNCE = 1.0  # Sekunden Ruhe nach dem letzten Ereignis bis zum Abgleich
+FOLDER_WATCH_MAX_DELAY = 5.0  # Spätestens nach so vielen Sekunden abgleichen (z.B. beim Kopieren vieler Dateien)
+FOLDER_WATCH_POLL_MS = 250  # Abfrageintervall im tk-Thread
+
+# Katalog-Snapshot (nach Stromausfall sofort die bekannten Dateien zeigen, Prüfung im Hintergrund)
+CATALOG_SNAPSHOT_ENABLED = True
+CATALOG_DB_PATH = "media_catalog.db"  # SQLite-Datei im Projektverzeichnis
+
+# Dateiauswahl in der GUI
+SELECTION_DEBOUNCE_MS = 300  # Schnelles Klicken wird zu einer Aktualisierung von Vorschau/Prefetch zusammengefasst
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Decode-Budget-Prüfung: findet Videos, die der Pi nicht flüssig dekodiert
+Nutzt die Daten des Medien-Index und optional einen kurzen Test-Decode (libvlc mit Dummy-Ausgabe)
+
+Aufruf: python3 decode_advisor.py [--quick] [videodateien...]
+  --quick   nur Index-Daten prüfen, keinen Test-Decode ausführen
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from config import (VIDEO_FOLDER, PROBE_DB_PATH, DECODE_MAX_PIXEL_RATE, DECODE_MAX_BITRATE,
+                    DECODE_ALLOWED_CODECS, DECODE_TEST_SECONDS, DECODE_MAX_LOST_RATIO)
+from media_probe import get_probe_index
+from media_catalog import extensions, sort_key
+from media_scanner import scan_tree
+
+# VLC-Integration
+try:
+    import vlc
+    VLC_AVAILABLE = True
+except ImportError:
+    VLC_AVAILABLE = False
+
+VERDICT_OK = "ok"
+VERDICT_WARN = "warn"  # Grenzwertig - läuft evtl. mit gelegentlichen Rucklern
+VERDICT_HEAVY = "heavy"  # Über dem Budget - ruckelt auf dem Pi
+
+_advisor_singleton = None
+
+
+class DecodeAdvisor:
+    def __init__(self, db_path=PROBE_DB_PATH):
+        self.probe_index = get_probe_index()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS decode_advice (
+                path TEXT PRIMARY KEY,
+                mtime REAL,
+                size INTEGER,
+                decoded_frames INTEGER,
+                lost_frames INTEGER,
+                expected_frames INTEGER,
+                tested_at REAL
+            )
+        """)
+        self._db.commit()
+
+    # Bewertung
+    def classify(self, path):
+        """Urteil und Gründe für eine Datei: (verdict, [gründe]) oder None falls noch nicht analysiert"""
+        probe = self.probe_index.get(path)
+        if probe is None or probe['error']:
+            return None
+
+        verdict, reasons = self._check_budget(probe)
+
+        test = self._get_test_result(probe)
+        if test:
+            decoded, lost, expected = test
+            lost_ratio = lost / max(1, decoded + lost)
+            if lost_ratio > DECODE_MAX_LOST_RATIO:
+                verdict = VERDICT_HEAVY
+                reasons.append(f"{lost_ratio * 100:.0f}% verlorene Frames")
+            elif expected and decoded < expected * 0.9:
+                verdict = VERDICT_HEAVY
+                reasons.append(f"nur {decoded}/{expected} Frames dekodiert")
+            elif verdict == VERDICT_WARN and lost == 0:
+                # Test-Decode war sauber - statische Warnung entschärfen
+                verdict = VERDICT_OK
+
+        return verdict, reasons
+
+    def _check_budget(self, probe):
+        """Statische Prüfung gegen das Decode-Budget aus config.py"""
+        reasons = []
+        verdict = VERDICT_OK
+
+        pixel_rate = probe['width'] * probe['height'] * (probe['frame_rate'] or 25.0)
+        if pixel_rate > DECODE_MAX_PIXEL_RATE:
+            verdict = VERDICT_HEAVY
+            reasons.append(f"{probe['width']}x{probe['height']}@{probe['frame_rate'] or '?'}")
+
+        if probe['bitrate'] > DECODE_MAX_BITRATE:
+            verdict = VERDICT_HEAVY
+            reasons.append(f"{probe['bitrate'] / 1_000_000:.1f} Mbit/s")
+        elif probe['bitrate'] > DECODE_MAX_BITRATE * 0.8:
+            verdict = max(verdict, VERDICT_WARN, key=_severity)
+            reasons.append(f"{probe['bitrate'] / 1_000_000:.1f} Mbit/s (knapp)")
+
+        codec = (probe['video_codec'] or '').lower()
+        if codec and not any(allowed in codec for allowed in DECODE_ALLOWED_CODECS):
+            verdict = max(verdict, VERDICT_WARN, key=_severity)
+            reasons.append(f"Codec {probe['video_codec']}")
+
+        return verdict, reasons
+
+    def _get_test_result(self, probe):
+        """Gespeichertes Test-Decode-Ergebnis, nur wenn die Datei unverändert ist"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT mtime, size, decoded_frames, lost_frames, expected_frames FROM decode_advice WHERE path = ?",
+                (probe['path'],)
+            ).fetchone()
+        if row and row[0] == probe['mtime'] and row[1] == probe['size']:
+            return row[2], row[3], row[4]
+        return None
+
+    # Test-Decode
+    def run_test_decode(self, path, seconds=DECODE_TEST_SECONDS):
+        """Datei kurz mit Dummy-Ausgabe abspielen und dekodierte/verlorene Frames zählen"""
+        probe = self.probe_index.get(path)
+        if not VLC_AVAILABLE or probe is None:
+            return None
+
+        instance = vlc.Instance('--quiet', '--vout=dummy', '--aout=dummy', '--no-video-title-show')
+        player = instance.media_player_new()
+        media = instance.media_new(path)
+        player.set_media(media)
+        try:
+            player.play()
+            start = time.monotonic()
+            while time.monotonic() - start < seconds:
+                if player.get_state() in (vlc.State.Ended, vlc.State.Error):
+                    break
+                time.sleep(0.1)
+            elapsed = time.monotonic() - start
+
+            stats = vlc.MediaStats()
+            media.get_stats(stats)
+            decoded = stats.decoded_video
+            lost = stats.lost_pictures
+        finally:
+            player.stop()
+            media.release()
+            player.release()
+            instance.release()
+
+        expected = int(elapsed * probe['frame_rate']) if probe['frame_rate'] else 0
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO decode_advice VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, probe['mtime'], probe['size'], decoded, lost, expected, time.time())
+            )
+            self._db.commit()
+        return decoded, lost, expected
+
+    def close(self):
+        """Datenbank schließen"""
+        with self._lock:
+            self._db.close()
+
+
+def _severity(verdict):
+    return (VERDICT_OK, VERDICT_WARN, VERDICT_HEAVY).index(verdict)
+
+
+def get_decode_advisor():
+    """Gemeinsamen Advisor holen (Singleton)"""
+    global _advisor_singleton
+    if _advisor_singleton is None:
+        _advisor_singleton = DecodeAdvisor()
+    return _advisor_singleton
+
+
+if __name__ == "__main__":
+    print("=== Decode-Budget-Prüfung ===")
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    quick = '--quick' in sys.argv
+
+    # {pfad: (mtime, size)} - Unterordner eingeschlossen, nur Video-Endungen
+    if args:
+        stats = {}
+        for path in args:
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                print(f"✗ {path}: {e}")
+                continue
+            stats[path] = (stat.st_mtime, stat.st_size)
+    else:
+        stats = scan_tree(VIDEO_FOLDER, extensions('video'))
+    files = sorted(stats, key=sort_key)
+
+    if not files:
+        print("✗ Keine Videos gefunden")
+        sys.exit(1)
+
+    if not VLC_AVAILABLE and not quick:
+        print("⚠ VLC nicht verfügbar - nur Prüfung der Index-Daten")
+        quick = True
+
+    index = get_probe_index()
+    index.update_paths(stats)
+    while any(index.is_pending(f) for f in files):
+        time.sleep(0.2)
+
+    advisor = get_decode_advisor()
+    print(f"Budget: {DECODE_MAX_PIXEL_RATE / 1_000_000:.0f} MPixel/s, {DECODE_MAX_BITRATE / 1_000_000:.0f} Mbit/s, "
+          f"Codecs: {', '.join(DECODE_ALLOWED_CODECS)}\n")
+
+    heavy = 0
+    for path in files:
+        name = os.path.basename(path)
+        if not quick:
+            print(f"  Test-Decode {name} ({DECODE_TEST_SECONDS:.0f}s)...")
+            advisor.run_test_decode(path)
+
+        result = advisor.classify(path)
+        if result is None:
+            print(f"✗ {name}: keine Index-Daten")
+            continue
+
+        verdict, reasons = result
+        mark = {VERDICT_OK: "✓", VERDICT_WARN: "⚠", VERDICT_HEAVY: "✗"}[verdict]
+        detail = f" - {', '.join(reasons)}" if reasons else ""
+        print(f"{mark} {name}: {verdict}{detail}")
+        if verdict == VERDICT_HEAVY:
+            heavy += 1
+
+    print(f"\n=== {heavy} von {len(files)} Videos über dem Budget ===")
+    advisor.close()
+    index.close()
+    sys.exit(1 if heavy else 0)
@@ -0,0 +1,119 @@
+"""
+Ordnerüberwachung für die Medienordner (watchdog)
+Ereignisse werden gesammelt und nach einer Ruhepause als ein Katalog-Abgleich im tk-Thread angewendet
+"""
+import os
+import threading
+import time
+
+from config import FOLDER_WATCH_ENABLED, FOLDER_WATCH_DEBOUNCE, FOLDER_WATCH_MAX_DELAY, FOLDER_WATCH_POLL_MS
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+
+class _EventCollector(FileSystemEventHandler):
+    """Merkt sich betroffene Pfade - läuft im watchdog-Thread"""
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory and event.event_type not in ('created', 'deleted', 'moved'):
+            return  # "modified" eines Ordners begleitet nur Änderungen an seinen Dateien
+        paths = [event.src_path, getattr(event, 'dest_path', None)]  # Verschieben: Quelle und Ziel
+        self.watcher.add_paths([os.fsdecode(path) for path in paths if path])
+
+
+class FolderWatcher:
+    def __init__(self, catalog, scanner=None, debounce=FOLDER_WATCH_DEBOUNCE, max_delay=FOLDER_WATCH_MAX_DELAY,
+                 enabled=FOLDER_WATCH_ENABLED):
+        self.catalog = catalog
+        self.scanner = scanner  # Stat-Aufrufe im Scanner-Thread statt im tk-Thread
+        self.debounce = debounce
+        self.max_delay = max(debounce, max_delay)
+        self.enabled = enabled and WATCHDOG_AVAILABLE
+
+        self._lock = threading.Lock()
+        self._pending = set()  # Pfade mit Ereignissen seit dem letzten Abgleich
+        self._first_event = None
+        self._last_event = None
+        self._observer = None
+        self._root = None
+        self._poll_id = None
+        self.events = 0
+        self.flushes = 0
+
+    def start(self, root):
+        """Überwachung starten - Abgleich läuft über root.after im tk-Thread"""
+        if not self.enabled:
+            if not WATCHDOG_AVAILABLE:
+                print("[FolderWatch] watchdog nicht installiert - nur manueller Scan")
+            return False
+
+        self._observer = Observer()
+        handler = _EventCollector(self)
+        for folder in self.catalog.folders.values():
+            if os.path.isdir(folder):
+                self._observer.schedule(handler, folder, recursive=True)
+        try:
+            self._observer.start()
+        except Exception as e:
+            print(f"[FolderWatch] Überwachung konnte nicht gestartet werden: {e}")
+            self._observer = None
+            return False
+
+        self._root = root
+        self._poll_id = root.after(FOLDER_WATCH_POLL_MS, self._poll)
+        print(f"[FolderWatch] Überwache {', '.join(self.catalog.folders.values())} "
+              f"(Abgleich {self.debounce:.1f}s nach dem letzten Ereignis)")
+        return True
+
+    def add_paths(self, paths):
+        """Betroffene Pfade vormerken (thread-sicher)"""
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending:
+                self._first_event = now
+            self._pending.update(paths)
+            self._last_event = now
+            self.events += 1
+
+    def _poll(self):
+        """Im tk-Thread: fällige Ereignisse als ein Abgleich an den Katalog geben"""
+        self._poll_id = None
+        paths = None
+        now = time.monotonic()
+        with self._lock:
+            if self._pending and (now - self._last_event >= self.debounce
+                                  or now - self._first_event >= self.max_delay):
+                paths, self._pending = self._pending, set()
+        if paths:
+            self.flushes += 1
+            if self.scanner is not None:
+                self.scanner.submit(self.catalog.stat_paths, paths, on_done=self.catalog.apply_updates)
+            else:
+                try:
+                    self.catalog.update_paths(paths)
+                except Exception as e:
+                    print(f"[FolderWatch] Fehler beim Abgleich: {e}")
+        if self._observer is not None:
+            self._poll_id = self._root.after(FOLDER_WATCH_POLL_MS, self._poll)
+
+    def stop(self):
+        """Überwachung beenden"""
+        observer, self._observer = self._observer, None
+        if self._poll_id is not None:
+            try:
+                self._root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=2.0)
@@ -7,6 +7,8 @@ import os
 import time
 from config import DEFAULT_MIN_DIST, DEFAULT_MAX_DIST, DEFAULT_INTERVAL, VIDEO_FOLDER, IMAGE_FOLDER, AUDIO_FOLDER, IMAGE_DISPLAY_TIME, VIDEO_LOOP_CHECK_TIME, AUDIO_FADE_TIME, MIN_VIDEO_RUNTIME, MIN_IMAGE_DISPLAY_TIME, MIN_AUDIO_RUNTIME
 from media_player import MediaPlayer
+from media_catalog import extensions
+from status_view import StatusView
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
@@ -75,6 +77,9 @@ class MediaStationGUI:
         self.update_status()
         
     def setup_gui(self):
+        # Sensor- und Media-Status werden nur bei Änderungen neu konfiguriert
+        self.status_view = StatusView()
+        
         # Hauptframe
         main_frame = tk.Frame(self.root, bg='black')
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -85,8 +90,8 @@ class MediaStationGUI:
         title_label.pack(pady=(0, 30))
         
         # Sensor-Status
-        self.status_label = tk.Label(main_frame, text="Abstand: -- cm", 
-                                   font=('Arial', 18), fg='lime', bg='black')
+        self.status_label = self.status_view.wrap(tk.Label(main_frame, text="Abstand: -- cm", 
+                                   font=('Arial', 18), fg='lime', bg='black'))
         self.status_label.pack(pady=10)
         
         # Einstellungen Frame
@@ -213,8 +218,8 @@ class MediaStationGUI:
         self.audio_status_label.pack(pady=5)
         
         # Media-Status
-        self.media_status_label = tk.Label(main_frame, text="Status: Schwarzes Bild", 
-                                         font=('Arial', 16), fg='yellow', bg='black')
+        self.media_status_label = self.status_view.wrap(tk.Label(main_frame, text="Status: Schwarzes Bild", 
+                                         font=('Arial', 16), fg='yellow', bg='black'))
         self.media_status_label.pack(pady=20)
         
         self.refresh_file_lists()
@@ -247,7 +252,7 @@ class MediaStationGUI:
         self.all_video_files = []
         if os.path.exists(VIDEO_FOLDER):
             for file in os.listdir(VIDEO_FOLDER):
-                if file.lower().endswith(('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv')):
+                if file.lower().endswith(extensions('video')):
                     full_path = os.path.join(VIDEO_FOLDER, file)
                     self.all_video_files.append(full_path)
         
@@ -256,7 +261,7 @@ class MediaStationGUI:
         self.all_image_files = []
         if os.path.exists(IMAGE_FOLDER):
             for file in os.listdir(IMAGE_FOLDER):
-                if file.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff')):
+                if file.lower().endswith(extensions('image')):
                     full_path = os.path.join(IMAGE_FOLDER, file)
                     self.all_image_files.append(full_path)
         
@@ -265,7 +270,7 @@ class MediaStationGUI:
         self.all_audio_files = []
         if os.path.exists(AUDIO_FOLDER):
             for file in os.listdir(AUDIO_FOLDER):
-                if file.lower().endswith(('.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma')):
+                if file.lower().endswith(extensions('audio')):
                     full_path = os.path.join(AUDIO_FOLDER, file)
                     self.all_audio_files.append(full_path)
         
@@ -506,7 +511,6 @@ class MediaStationGUI:
         """Status-Update (wird zyklisch aufgerufen)"""
         # Abstand anzeigen
         distance = self.sensor_thread.distance
-        print(f"[DEBUG] Sensor-Abstand: {distance:.1f} cm")  # Debug-Output
         
         if distance == 0.0:
             self.status_label.config(text="Sensor: Nicht verbunden", fg='red')
@@ -608,6 +612,7 @@ class MediaStationGUI:
             self.root.mainloop()
         finally:
             # Cleanup
+            print(f"[GUI] Status-Labels: {self.status_view.summary()}")
             self.observer.stop()
             self.observer.join()
             self.sensor_thread.stop()
@@ -5,27 +5,68 @@ import tkinter as tk
 from tkinter import ttk, simpledialog
 import os
 import time
-import json
-import datetime
 import subprocess
 import platform
 from config import DEFAULT_MIN_DIST, DEFAULT_MAX_DIST, DEFAULT_INTERVAL, VIDEO_FOLDER, IMAGE_FOLDER, AUDIO_FOLDER, IMAGE_DISPLAY_TIME, AUDIO_FADE_TIME, MIN_VIDEO_RUNTIME, MIN_IMAGE_DISPLAY_TIME, MIN_AUDIO_RUNTIME
-from media_player_vlc import VLCMediaPlayer
+from config import PLAYER_PROCESS, MEDIA_ENGINE, SELECTION_DEBOUNCE_MS
+from media_player_vlc import VLCMediaPlayer, VLCAudioPlayer
+from media_player_mpv import MPVMediaPlayer
+from player_process import ProcessMediaPlayer
+from slideshow import SlideshowEngine
+from media_probe import get_probe_index
+from decode_advisor import get_decode_advisor, VERDICT_WARN, VERDICT_HEAVY
+from media_failures import get_failure_registry
+from playback_telemetry import get_playback_telemetry
+from media_prefetch import get_media_prefetcher
+from media_cache import get_hot_media_cache
+from selection_model import SelectionModel
+from media_list_view import VirtualCheckList
+from media_catalog import get_media_catalog
+from folder_watcher import FolderWatcher
+from media_scanner import MediaScanner
+import playlist_store
+from media_search import SearchIndex
+from status_view import StatusView
 
 class VLCMediaStationGUI:
     def __init__(self, sensor_thread, kiosk_mode=False):
         self.sensor_thread = sensor_thread
-        self.media_player = VLCMediaPlayer()
+        # Video-Player: mpv, libvlc im GUI-Prozess oder libvlc isoliert als Kindprozess
+        if MEDIA_ENGINE == "mpv":
+            self.media_player = MPVMediaPlayer()
+        elif PLAYER_PROCESS:
+            self.media_player = ProcessMediaPlayer()
+        else:
+            self.media_player = VLCMediaPlayer()
+        self.audio_player = VLCAudioPlayer()  # Soundtrack im Audio-Modus
         self.kiosk_mode = kiosk_mode  # Nur für GUI-Fenster, nicht für Media-Vorschau
         self.sensor_mode = "video"  # "video" oder "audio"
-        
-        # Dateien
-        self.all_video_files = []
-        self.all_image_files = []
-        self.all_audio_files = []
-        self.video_checkboxes = {}
-        self.image_checkboxes = {}
-        self.audio_checkboxes = {}
+        self.sensor_playback_active = False  # Sensor-Wiedergabe (Video oder Audio) läuft
+        
+        # Dateien (Katalog) und Auswahl
+        # Auswahl pro Medientyp - die Listen zeichnen nur sichtbare Zeilen
+        self.video_selection = SelectionModel()
+        self.image_selection = SelectionModel()
+        self.audio_selection = SelectionModel()
+        self._selection_after = {}  # {typ: after-id} der ausstehenden Aktualisierung
+        for kind, selection in (('video', self.video_selection), ('image', self.image_selection),
+                                ('audio', self.audio_selection)):
+            selection.add_listener(lambda changed, selection_changed, kind=kind:
+                                   selection_changed and self._schedule_selection_update(kind))
+        self.catalog = get_media_catalog()
+        # Suchindex vor der GUI abgleichen - on_catalog_changed filtert mit dem neuen Stand
+        self.search_index = SearchIndex(self.catalog)
+        self.catalog.add_listener(self.search_index.on_catalog_changed)
+        self.catalog.add_listener(self.on_catalog_changed)
+        self.search_vars = {}  # {typ: StringVar} der Suchfelder
+        self.loaded_playlist = {}  # {typ: [pfade]} in der Reihenfolge der zuletzt geladenen Playlist
+        self.playlist_options = {}  # {pfad: {'duration', 'start', 'stop'}} der geladenen Playlist
+        
+        # Listen-Markierungen (Quarantäne, Decode-Budget) - nur geänderte Pfade werden neu bewertet
+        self._marks_after = None
+        self._marks_dirty = set()  # Neue/geänderte Dateien seit dem letzten Durchlauf
+        self._marked_quarantine = set()
+        self._heavy_videos = set()
         
         # Konfigurable Werte (wie in der alten GUI)
         self.current_image_display_time = IMAGE_DISPLAY_TIME
@@ -34,6 +75,10 @@ class VLCMediaStationGUI:
         self.current_min_image_time = MIN_IMAGE_DISPLAY_TIME
         self.current_min_audio_time = MIN_AUDIO_RUNTIME
         
+        # Slideshow für die Bildvorschau
+        self.media_player.set_min_display_time(self.current_image_display_time)
+        self.slideshow = SlideshowEngine(self.media_player, display_time=self.current_image_display_time)
+        
         # GUI erstellen
         self.root = tk.Tk()
         self.root.title("Pi Media Station - VLC Edition")
@@ -46,8 +91,15 @@ class VLCMediaStationGUI:
             self.root.geometry("1200x800")
         
         self.setup_gui()
+        # Dateisystem-Zugriffe laufen im Scanner-Thread, Ergebnisse kommen per after zurück
+        self.scanner = MediaScanner(self.catalog)
+        self.scanner.start(self.root)
         self.scan_media_files()
         
+        # Medienordner überwachen - Änderungen gesammelt in den Katalog übernehmen
+        self.folder_watcher = FolderWatcher(self.catalog, self.scanner)
+        self.folder_watcher.start(self.root)
+        
         # Entry-Felder mit aktuellen Werten synchronisieren
         self.sync_entry_fields()
         
@@ -58,6 +110,8 @@ class VLCMediaStationGUI:
     
     def setup_gui(self):
         """Vollständige GUI-Layout mit allen Features"""
+        # Status-Labels werden nur bei geänderten Optionen neu konfiguriert
+        self.status_view = StatusView()
         # Hauptframe mit Scrolling
         canvas = tk.Canvas(self.root, bg='black')
         scrollbar = tk.Scrollbar(self.root, orient="vertical", command=canvas.yview)
@@ -81,8 +135,8 @@ class VLCMediaStationGUI:
                 font=('Arial', 24, 'bold'), fg='cyan', bg='black').pack(pady=10)
         
         # Status
-        self.status_label = tk.Label(main_frame, text="Sensor: Initialisierung...", 
-                                   font=('Arial', 16), fg='yellow', bg='black')
+        self.status_label = self.status_view.wrap(tk.Label(main_frame, text="Sensor: Initialisierung...", 
+                                   font=('Arial', 16), fg='yellow', bg='black'))
         self.status_label.pack(pady=5)
         
         # Sensor-Einstellungen
@@ -258,19 +312,14 @@ class VLCMediaStationGUI:
         tk.Button(video_frame, text="Ordner öffnen", bg='lightblue', fg='black', 
                  font=('Arial', 9), command=self.open_video_folder).pack(pady=2)
         
+        self._create_search_box(video_frame, 'video')
+        
         video_scroll_container = tk.Frame(video_frame, bg='black', relief='sunken', bd=1)
         video_scroll_container.pack(fill='both', expand=True, pady=2)
         
-        video_canvas = tk.Canvas(video_scroll_container, bg='gray10', height=200)
-        video_scrollbar = tk.Scrollbar(video_scroll_container, orient="vertical", command=video_canvas.yview)
-        self.video_scroll_frame = tk.Frame(video_canvas, bg='gray10')
-        
-        self.video_scroll_frame.bind("<Configure>", lambda e: video_canvas.configure(scrollregion=video_canvas.bbox("all")))
-        video_canvas.create_window((0, 0), window=self.video_scroll_frame, anchor="nw")
-        video_canvas.configure(yscrollcommand=video_scrollbar.set)
-        
-        video_canvas.pack(side="left", fill="both", expand=True)
-        video_scrollbar.pack(side="right", fill="y")
+        self.video_list = VirtualCheckList(video_scroll_container, self.video_selection)
+        self.video_list.pack(fill="both", expand=True)
+        self._create_selection_buttons(video_frame, self.video_selection, self.video_list)
         
         # Bild-Spalte
         image_frame = tk.Frame(columns_frame, bg='black')
@@ -280,19 +329,14 @@ class VLCMediaStationGUI:
         tk.Button(image_frame, text="Ordner öffnen", bg='lightblue', fg='black', 
                  font=('Arial', 9), command=self.open_image_folder).pack(pady=2)
         
+        self._create_search_box(image_frame, 'image')
+        
         image_scroll_container = tk.Frame(image_frame, bg='black', relief='sunken', bd=1)
         image_scroll_container.pack(fill='both', expand=True, pady=2)
         
-        image_canvas = tk.Canvas(image_scroll_container, bg='gray10', height=200)
-        image_scrollbar = tk.Scrollbar(image_scroll_container, orient="vertical", command=image_canvas.yview)
-        self.image_scroll_frame = tk.Frame(image_canvas, bg='gray10')
-        
-        self.image_scroll_frame.bind("<Configure>", lambda e: image_canvas.configure(scrollregion=image_canvas.bbox("all")))
-        image_canvas.create_window((0, 0), window=self.image_scroll_frame, anchor="nw")
-        image_canvas.configure(yscrollcommand=image_scrollbar.set)
-        
-        image_canvas.pack(side="left", fill="both", expand=True)
-        image_scrollbar.pack(side="right", fill="y")
+        self.image_list = VirtualCheckList(image_scroll_container, self.image_selection)
+        self.image_list.pack(fill="both", expand=True)
+        self._create_selection_buttons(image_frame, self.image_selection, self.image_list)
         
         # Audio-Spalte
         audio_frame = tk.Frame(columns_frame, bg='black')
@@ -302,39 +346,41 @@ class VLCMediaStationGUI:
         tk.Button(audio_frame, text="Ordner öffnen", bg='lightblue', fg='black', 
                  font=('Arial', 9), command=self.open_audio_folder).pack(pady=2)
         
+        self._create_search_box(audio_frame, 'audio')
+        
         audio_scroll_container = tk.Frame(audio_frame, bg='black', relief='sunken', bd=1)
         audio_scroll_container.pack(fill='both', expand=True, pady=2)
         
-        audio_canvas = tk.Canvas(audio_scroll_container, bg='gray10', height=200)
-        audio_scrollbar = tk.Scrollbar(audio_scroll_container, orient="vertical", command=audio_canvas.yview)
-        self.audio_scroll_frame = tk.Frame(audio_canvas, bg='gray10')
-        
-        self.audio_scroll_frame.bind("<Configure>", lambda e: audio_canvas.configure(scrollregion=audio_canvas.bbox("all")))
-        audio_canvas.create_window((0, 0), window=self.audio_scroll_frame, anchor="nw")
-        audio_canvas.configure(yscrollcommand=audio_scrollbar.set)
-        
-        audio_canvas.pack(side="left", fill="both", expand=True)
-        audio_scrollbar.pack(side="right", fill="y")
+        self.audio_list = VirtualCheckList(audio_scroll_container, self.audio_selection)
+        self.audio_list.pack(fill="both", expand=True)
+        self._create_selection_buttons(audio_frame, self.audio_selection, self.audio_list)
         
         # Status-Labels für Dateien
         status_frame = tk.Frame(files_frame, bg='black')
         status_frame.pack(fill='x', pady=5)
         
-        self.video_status_label = tk.Label(status_frame, text="Videos: Wird geladen...", 
-                                          font=('Arial', 10), fg='gray', bg='black')
+        self.video_status_label = self.status_view.wrap(tk.Label(status_frame, text="Videos: Wird geladen...", 
+                                          font=('Arial', 10), fg='gray', bg='black'))
         self.video_status_label.pack(side='left', padx=20)
         
-        self.image_status_label = tk.Label(status_frame, text="Bilder: Wird geladen...", 
-                                          font=('Arial', 10), fg='gray', bg='black')
+        self.image_status_label = self.status_view.wrap(tk.Label(status_frame, text="Bilder: Wird geladen...", 
+                                          font=('Arial', 10), fg='gray', bg='black'))
         self.image_status_label.pack(side='left', padx=20)
         
-        self.audio_status_label = tk.Label(status_frame, text="Audio: Wird geladen...", 
-                                          font=('Arial', 10), fg='gray', bg='black')
+        self.audio_status_label = self.status_view.wrap(tk.Label(status_frame, text="Audio: Wird geladen...", 
+                                          font=('Arial', 10), fg='gray', bg='black'))
         self.audio_status_label.pack(side='left', padx=20)
         
+        # Quarantäne (nicht abspielbare Dateien)
+        tk.Button(status_frame, text="Quarantäne aufheben", bg='gray30', fg='white',
+                 command=self.release_quarantine, font=('Arial', 9)).pack(side='right', padx=5)
+        self.quarantine_status_label = self.status_view.wrap(tk.Label(status_frame, text="", 
+                                               font=('Arial', 10), fg='gray', bg='black'))
+        self.quarantine_status_label.pack(side='right', padx=10)
+        
         # Media-Status
-        self.media_status_label = tk.Label(main_frame, text="Status: VLC bereit", 
-                                         font=('Arial', 14, 'bold'), fg='lime', bg='black')
+        self.media_status_label = self.status_view.wrap(tk.Label(main_frame, text="Status: VLC bereit", 
+                                         font=('Arial', 14, 'bold'), fg='lime', bg='black'))
         self.media_status_label.pack(pady=10)
         
         # Tastenkombinationen für GUI
@@ -342,92 +388,213 @@ class VLCMediaStationGUI:
         self.root.bind('<Escape>', lambda e: self.root.quit())
     
     def scan_media_files(self):
-        """Mediendateien scannen und Checkboxen erstellen"""
-        # Video-Dateien
-        video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv']
-        if os.path.exists(VIDEO_FOLDER):
-            self.all_video_files = [
-                os.path.join(VIDEO_FOLDER, f) 
-                for f in os.listdir(VIDEO_FOLDER) 
-                if any(f.lower().endswith(ext) for ext in video_extensions)
-            ]
-        
-        # Bild-Dateien
-        image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
-        if os.path.exists(IMAGE_FOLDER):
-            self.all_image_files = [
-                os.path.join(IMAGE_FOLDER, f) 
-                for f in os.listdir(IMAGE_FOLDER) 
-                if any(f.lower().endswith(ext) for ext in image_extensions)
-            ]
-        
-        # Audio-Dateien
-        audio_extensions = ['.mp3', '.wav', '.ogg', '.m4a']
-        if os.path.exists(AUDIO_FOLDER):
-            self.all_audio_files = [
-                os.path.join(AUDIO_FOLDER, f) 
-                for f in os.listdir(AUDIO_FOLDER) 
-                if any(f.lower().endswith(ext) for ext in audio_extensions)
-            ]
-        
-        # Checkboxen erstellen
-        self.create_checkboxes()
-    
-    def create_checkboxes(self):
-        """Checkboxen für alle Medientypen erstellen"""
-        # Videos
-        for widget in self.video_scroll_frame.winfo_children():
-            widget.destroy()
-        self.video_checkboxes.clear()
-        
-        for video_file in self.all_video_files:
-            var = tk.BooleanVar(value=True)  # Standardmäßig alle ausgewählt
-            self.video_checkboxes[video_file] = var
-            cb = tk.Checkbutton(self.video_scroll_frame, text=os.path.basename(video_file), 
-                               variable=var, bg='gray10', fg='white', selectcolor='darkgray',
-                               font=('Arial', 9))
-            cb.pack(anchor='w', padx=3, pady=1)
-        
-        # Bilder
-        for widget in self.image_scroll_frame.winfo_children():
-            widget.destroy()
-        self.image_checkboxes.clear()
-        
-        for image_file in self.all_image_files:
-            var = tk.BooleanVar(value=True)
-            self.image_checkboxes[image_file] = var
-            cb = tk.Checkbutton(self.image_scroll_frame, text=os.path.basename(image_file), 
-                               variable=var, bg='gray10', fg='white', selectcolor='darkgray',
-                               font=('Arial', 9),
-                               command=self.on_image_selection_changed)  # Callback hinzugefügt
-            cb.pack(anchor='w', padx=3, pady=1)
-        
-        # Audio
-        for widget in self.audio_scroll_frame.winfo_children():
-            widget.destroy()
-        self.audio_checkboxes.clear()
-        
-        for audio_file in self.all_audio_files:
-            var = tk.BooleanVar(value=True)
-            self.audio_checkboxes[audio_file] = var
-            cb = tk.Checkbutton(self.audio_scroll_frame, text=os.path.basename(audio_file), 
-                               variable=var, bg='gray10', fg='white', selectcolor='darkgray',
-                               font=('Arial', 9))
-            cb.pack(anchor='w', padx=3, pady=1)
+        """Bekannte Dateien sofort aus dem Snapshot zeigen, Ordner im Hintergrund prüfen
+
+        Der Katalog meldet nur die Unterschiede an on_catalog_changed.
+        """
+        self.catalog.load_snapshot()
+        self.scanner.scan(full=False)
+    
+    def schedule_media_marks(self, delay_ms=0, paths=()):
+        """Markierungen später aktualisieren - mehrere Anforderungen ergeben einen Durchlauf"""
+        self._marks_dirty.update(paths)
+        if self._marks_after is None:
+            self._marks_after = self.root.after(delay_ms, self.update_media_marks)
+    
+    def update_media_marks(self):
+        """Dateien in Quarantäne und Videos über dem Decode-Budget in den Listen markieren
+
+        Neu bewertet werden nur frisch analysierte, neue/geänderte und (ehemals) gesperrte Dateien.
+        """
+        if self._marks_after is not None:
+            self.root.after_cancel(self._marks_after)
+            self._marks_after = None
+        try:
+            quarantined = get_failure_registry().get_quarantined()
+            probed = self.catalog.refresh_probe(get_probe_index())
+            if probed:
+                # Auflösung/Codec/Dauer sind jetzt suchbar
+                self.search_index.update(probed)
+                self.apply_search()
+            
+            # Gesperrte Dateien jedes Mal (Restzeit), dazu frei gewordene
+            dirty = self._marks_dirty | set(probed) | set(quarantined) | self._marked_quarantine
+            self._marks_dirty = set()
+            self._marked_quarantine = set(quarantined)
+            
+            lists = {'video': self.video_list, 'image': self.image_list, 'audio': self.audio_list}
+            videos = []
+            for path in dirty:
+                record = self.catalog.get(path)
+                if record is None:
+                    self._heavy_videos.discard(path)
+                    continue
+                if self._mark_entry(lists[record.kind], path, quarantined.get(path)) or record.kind != 'video':
+                    continue
+                videos.append(path)
+            
+            # Decode-Urteile lesen SQLite - im Scanner-Thread, Markierung danach im tk-Thread
+            if videos:
+                self.scanner.submit(self._classify_videos, videos, on_done=self._apply_video_marks)
+            self._update_video_status()
+            
+            if quarantined:
+                self.quarantine_status_label.config(text=f"Quarantäne: {len(quarantined)} Datei(en)", fg='red')
+            else:
+                self.quarantine_status_label.config(text="", fg='gray')
+            
+            # Solange der Index noch analysiert, später erneut prüfen
+            if get_probe_index().pending_count():
+                self.schedule_media_marks(2000)
+        except Exception as e:
+            print(f"[VLC-GUI] Fehler bei Listen-Markierung: {e}")
+    
+    @staticmethod
+    def _classify_videos(videos):
+        """Im Scanner-Thread: Urteile des Decode-Advisors als [(pfad, urteil oder None)]"""
+        advisor = get_decode_advisor()
+        return [(path, advisor.classify(path)) for path in videos]
+    
+    def _apply_video_marks(self, results):
+        """Im tk-Thread: Urteile übernehmen - inzwischen entfernte oder gesperrte Videos auslassen"""
+        for path, result in results:
+            record = self.catalog.get(path)
+            if record is None or record.kind != 'video' or path in self._marked_quarantine:
+                continue
+            self._mark_video(path, result)
+        self._update_video_status()
+    
+    def _update_video_status(self):
+        """Video-Status-Label mit Anzahl der zu schweren Videos"""
+        if self._heavy_videos:
+            self.video_status_label.config(
+                text=f"Videos: {self.catalog.count('video')} gefunden, "
+                     f"{len(self._heavy_videos)} zu schwer für den Pi",
+                fg='orange'
+            )
+        else:
+            self.video_status_label.config(text=f"Videos: {self.catalog.count('video')} gefunden", fg='lime')
+    
+    def _mark_video(self, video_file, result):
+        """Video nach dem Urteil des Decode-Advisors markieren"""
+        if result is None or result[0] not in (VERDICT_WARN, VERDICT_HEAVY):
+            self.video_list.set_mark(video_file)
+            self._heavy_videos.discard(video_file)
+            return
+        verdict, reasons = result
+        color = 'red' if verdict == VERDICT_HEAVY else 'orange'
+        self.video_list.set_mark(video_file, f"⚠ {os.path.basename(video_file)} ({', '.join(reasons)})", color)
+        if verdict == VERDICT_HEAVY:
+            self._heavy_videos.add(video_file)
+        else:
+            self._heavy_videos.discard(video_file)
+    
+    def _mark_entry(self, media_list, media_file, failure):
+        """Listeneintrag als Quarantäne markieren - gibt True zurück falls markiert"""
+        if failure is None:
+            media_list.set_mark(media_file)
+            return False
+        
+        minutes = max(1, int((failure['quarantined_until'] - time.time()) / 60))
+        media_list.set_mark(media_file, f"⛔ {os.path.basename(media_file)} "
+                                        f"(Quarantäne {minutes} min: {failure['last_error']})", 'gray50')
+        return True
+    
+    def release_quarantine(self):
+        """Alle Dateien aus der Quarantäne holen (z.B. nachdem sie repariert wurden)"""
+        get_failure_registry().release()
+        print("[VLC-GUI] Quarantäne aufgehoben")
+        self.update_media_marks()
+    
+    def on_catalog_changed(self, changes):
+        """Katalog-Unterschiede in Dateilisten und Auswahl übernehmen (neue Dateien ausgewählt)"""
+        lists = {'video': self.video_list, 'image': self.image_list, 'audio': self.audio_list}
+        for kind, change in changes.items():
+            lists[kind].forget(change.removed)
+            lists[kind].model.apply_change(change)
+        self.apply_search(changes.keys())
         
         # Status-Labels aktualisieren
-        self.video_status_label.config(text=f"Videos: {len(self.all_video_files)} gefunden", fg='lime')
-        self.image_status_label.config(text=f"Bilder: {len(self.all_image_files)} gefunden", fg='lime')
-        self.audio_status_label.config(text=f"Audio: {len(self.all_audio_files)} gefunden", fg='lime')
-        
-        print(f"[VLC-GUI] Gefunden: {len(self.all_video_files)} Videos, {len(self.all_image_files)} Bilder, {len(self.all_audio_files)} Audio")
-        
-        # Bildvorschau starten falls Bilder ausgewählt sind
-        if self.all_image_files:
-            # Kurz warten damit GUI vollständig geladen ist
-            self.root.after(500, self.on_image_selection_changed)
+        videos, images, audios = (self.catalog.count(kind) for kind in ('video', 'image', 'audio'))
+        self.video_status_label.config(text=f"Videos: {videos} gefunden", fg='lime')
+        self.image_status_label.config(text=f"Bilder: {images} gefunden", fg='lime')
+        self.audio_status_label.config(text=f"Audio: {audios} gefunden", fg='lime')
+        
+        print(f"[VLC-GUI] Gefunden: {videos} Videos, {images} Bilder, {audios} Audio")
+        
+        # Vorschau und Prefetch folgen über die Auswahl-Beobachter (_schedule_selection_update)
+        # Medien-Index im Hintergrund abgleichen - nur die gemeldeten Dateien, ohne Ordner-Scan
+        stats = {path: record.stat() for change in changes.values() for path in change.added + change.changed
+                 for record in (self.catalog.get(path),) if record is not None}
+        get_probe_index().update_paths_async(stats, [path for change in changes.values() for path in change.removed])
+        for change in changes.values():
+            self._heavy_videos.difference_update(change.removed)
+        self.schedule_media_marks(1000, [path for change in changes.values()
+                                         for path in change.added + change.changed])
+    
+    def _create_search_box(self, parent, kind):
+        """Suchfeld über einer Dateiliste - filtert bei jedem Tastendruck"""
+        var = tk.StringVar()
+        self.search_vars[kind] = var
+        entry = tk.Entry(parent, textvariable=var, bg='gray20', fg='white', insertbackground='white',
+                         font=('Arial', 9))
+        entry.pack(fill='x', pady=2)
+        entry.bind('<Escape>', lambda e: var.set(""))
+        var.trace_add('write', lambda *args: self.apply_search([kind], keep_position=False))
+    
+    def apply_search(self, kinds=None, keep_position=True):
+        """Suchbegriffe auf die Dateilisten anwenden (siehe media_search: Name, ordner:, 1080p, dauer>30)"""
+        lists = {'video': self.video_list, 'image': self.image_list, 'audio': self.audio_list}
+        for kind in (kinds if kinds is not None else lists):
+            var = self.search_vars.get(kind)
+            if var is None:
+                continue
+            media_list = lists[kind]
+            start = time.perf_counter()
+            media_list.set_filter(self.search_index.search(var.get(), media_list.model.items), keep_position)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms > 16:
+                print(f"[VLC-GUI] Suche '{var.get()}' ({kind}) dauerte {elapsed_ms:.1f}ms")
+    
+    def _create_selection_buttons(self, parent, selection, media_list):
+        """Sammel-Auswahl unter einer Dateiliste: Alle, Keine, Umkehren, Muster
+
+        Bei aktiver Suche wirken Alle/Keine/Umkehren nur auf die angezeigten Treffer.
+        """
+        buttons = tk.Frame(parent, bg='black')
+        buttons.pack(fill='x', pady=2)
+        for text, command in (("Alle", lambda: selection.select_all(media_list.visible_items())),
+                              ("Keine", lambda: selection.select_none(media_list.visible_items())),
+                              ("Umkehren", lambda: selection.invert(media_list.visible_items())),
+                              ("Muster…", lambda: self.select_by_pattern(selection))):
+            tk.Button(buttons, text=text, bg='gray30', fg='white', font=('Arial', 8),
+                     command=command).pack(side='left', expand=True, fill='x', padx=1)
+    
+    def select_by_pattern(self, selection):
+        """Dateien per Muster auswählen (z.B. *.mp4, intro*) - mit vorangestelltem '-' abwählen"""
+        pattern = simpledialog.askstring("Auswahl per Muster",
+                                         "Dateimuster (z.B. *.mp4, *intro*; '-' davor zum Abwählen):")
+        if not pattern:
+            return
+        deselect = pattern.startswith('-')
+        matches = selection.select_matching(pattern.lstrip('-').strip(), selected=not deselect)
+        print(f"[VLC-GUI] Muster '{pattern}': {matches} Dateien {'abgewählt' if deselect else 'ausgewählt'}")
+    
+    def _schedule_selection_update(self, kind):
+        """Auswahländerung verzögert anwenden - schnelles Klicken ergibt eine Aktualisierung"""
+        pending = self._selection_after.pop(kind, None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+        self._selection_after[kind] = self.root.after(SELECTION_DEBOUNCE_MS,
+                                                      lambda: self._apply_selection_update(kind))
+    
+    def _apply_selection_update(self, kind):
+        self._selection_after.pop(kind, None)
+        if kind == 'image':
+            self.on_image_selection_changed()
+        else:
+            self.update_prefetch()
     
-    # Speichern-Methoden für alle Parameter
     def save_min_dist(self):
         """Min-Abstand speichern"""
         try:
@@ -466,6 +633,7 @@ class VLCMediaStationGUI:
             new_interval = float(self.image_interval_var.get())
             self.current_image_display_time = max(1.0, new_interval)
             self.media_player.set_min_display_time(self.current_image_display_time)
+            self.slideshow.set_display_time(self.current_image_display_time)
             print(f"[VLC-GUI] Bildwechselzeit gespeichert: {self.current_image_display_time}s")
         except ValueError:
             print("[VLC-GUI] Ungültige Bildwechselzeit")
@@ -475,6 +643,8 @@ class VLCMediaStationGUI:
         try:
             new_fade_ms = float(self.audio_fade_var.get())
             self.current_audio_fade_time = max(10, new_fade_ms) / 1000.0
+            self.media_player.set_fade_time(self.current_audio_fade_time)
+            self.audio_player.set_fade_time(self.current_audio_fade_time)
             print(f"[VLC-GUI] Audio-Fade-Zeit gespeichert: {new_fade_ms}ms ({self.current_audio_fade_time}s)")
         except ValueError:
             print("[VLC-GUI] Ungültige Audio-Fade-Zeit")
@@ -508,138 +678,103 @@ class VLCMediaStationGUI:
     
     # Playlist-Methoden
     def refresh_playlists(self):
-        """Verfügbare Playlists laden"""
-        try:
-            playlist_dir = "playlists"
-            if not os.path.exists(playlist_dir):
-                os.makedirs(playlist_dir)
-            
-            self.playlist_listbox.delete(0, tk.END)
-            playlist_files = [f for f in os.listdir(playlist_dir) if f.endswith('.json')]
+        """Verfügbare Playlists laden - der Ordner wird im Scanner-Thread gelesen"""
+        self.scanner.submit(self._run_playlist_job, playlist_store.list_playlists, (),
+                            on_done=self._on_playlists_listed)
+    
+    def _on_playlists_listed(self, result):
+        playlist_names, error = result
+        self.playlist_listbox.delete(0, tk.END)
+        if error:
+            self.playlist_status_label.config(text=f"Fehler beim Laden: {error}", fg='red')
+            return
+        
+        if playlist_names:
+            for display_name in playlist_names:
+                self.playlist_listbox.insert(tk.END, display_name)
             
-            if playlist_files:
-                for playlist_file in sorted(playlist_files):
-                    display_name = playlist_file[:-5]
-                    self.playlist_listbox.insert(tk.END, display_name)
-                
-                self.playlist_status_label.config(text=f"Verfügbare Playlists: {len(playlist_files)}", fg='lime')
-            else:
-                self.playlist_listbox.insert(tk.END, "Keine Playlists vorhanden")
-                self.playlist_status_label.config(text="Keine Playlists gefunden", fg='orange')
-                
-        except Exception as e:
-            self.playlist_status_label.config(text=f"Fehler beim Laden: {e}", fg='red')
+            self.playlist_status_label.config(text=f"Verfügbare Playlists: {len(playlist_names)}", fg='lime')
+        else:
+            self.playlist_listbox.insert(tk.END, "Keine Playlists vorhanden")
+            self.playlist_status_label.config(text="Keine Playlists gefunden", fg='orange')
     
     def save_current_playlist(self):
-        """Aktuelle Auswahl als Playlist speichern"""
-        try:
-            playlist_name = simpledialog.askstring("Playlist speichern", "Name für die Playlist:")
-            if not playlist_name:
-                return
-            
-            safe_name = "".join(c for c in playlist_name if c.isalnum() or c in (' ', '-', '_')).strip()
-            if not safe_name:
-                safe_name = "neue_playlist"
-            
-            selected_videos = self.get_selected_videos()
-            selected_images = self.get_selected_images()
-            selected_audios = self.get_selected_audios()
-            
-            if not (selected_videos or selected_images or selected_audios):
-                self.playlist_status_label.config(text="Keine Dateien ausgewählt!", fg='red')
-                return
-            
-            playlist_data = {
-                "name": safe_name,
-                "created": str(datetime.datetime.now()),
-                "videos": [os.path.basename(v) for v in selected_videos],
-                "images": [os.path.basename(i) for i in selected_images],  
-                "audios": [os.path.basename(a) for a in selected_audios],
-                "video_count": len(selected_videos),
-                "image_count": len(selected_images),
-                "audio_count": len(selected_audios)
-            }
-            
-            playlist_dir = "playlists"
-            if not os.path.exists(playlist_dir):
-                os.makedirs(playlist_dir)
-            
-            file_path = os.path.join(playlist_dir, f"{safe_name}.json")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(playlist_data, f, indent=2, ensure_ascii=False)
-            
-            self.playlist_status_label.config(
-                text=f"Playlist '{safe_name}' gespeichert! ({playlist_data['video_count']}V, {playlist_data['image_count']}B, {playlist_data['audio_count']}A)", 
-                fg='lime')
-            
-            self.refresh_playlists()
-            
-        except Exception as e:
-            self.playlist_status_label.config(text=f"Speichern fehlgeschlagen: {e}", fg='red')
+        """Aktuelle Auswahl als Playlist speichern - Fingerabdrücke werden im Scanner-Thread gelesen"""
+        playlist_name = simpledialog.askstring("Playlist speichern", "Name für die Playlist:")
+        if not playlist_name:
+            return
+        
+        safe_name = "".join(c for c in playlist_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        if not safe_name:
+            safe_name = "neue_playlist"
+        
+        selections = {'video': self.get_selected_videos(), 'image': self.get_selected_images(),
+                      'audio': self.get_selected_audios()}
+        if not any(selections.values()):
+            self.playlist_status_label.config(text="Keine Dateien ausgewählt!", fg='red')
+            return
+        
+        self.playlist_status_label.config(text=f"Speichere Playlist '{safe_name}'...", fg='yellow')
+        self.scanner.submit(self._run_playlist_job, playlist_store.save_playlist, (safe_name, selections, self.catalog),
+                            on_done=lambda result: self._on_playlist_saved(safe_name, selections, result))
+    
+    def _on_playlist_saved(self, name, selections, result):
+        _, error = result
+        if error:
+            self.playlist_status_label.config(text=f"Speichern fehlgeschlagen: {error}", fg='red')
+            return
+        counts = (len(selections[kind]) for kind in ('video', 'image', 'audio'))
+        self.playlist_status_label.config(text="Playlist '{}' gespeichert! ({}V, {}B, {}A)".format(name, *counts),
+                                          fg='lime')
+        self.refresh_playlists()
     
     def load_playlist(self):
-        """Ausgewählte Playlist laden"""
+        """Ausgewählte Playlist laden - aufgelöst wird im Scanner-Thread"""
+        selection = self.playlist_listbox.curselection()
+        if not selection:
+            self.playlist_status_label.config(text="Bitte eine Playlist auswählen!", fg='orange')
+            return
+        
+        playlist_name = self.playlist_listbox.get(selection[0])
+        if playlist_name == "Keine Playlists vorhanden":
+            return
+        
+        self.playlist_status_label.config(text=f"Lade Playlist '{playlist_name}'...", fg='yellow')
+        self.scanner.submit(self._run_playlist_job, playlist_store.load_playlist, (playlist_name, self.catalog),
+                            on_done=lambda result: self._on_playlist_loaded(playlist_name, result))
+    
+    def _on_playlist_loaded(self, name, result):
+        loaded, error = result
+        if isinstance(error, FileNotFoundError):
+            self.playlist_status_label.config(text=f"Playlist-Datei nicht gefunden: {name}", fg='red')
+            return
+        if error:
+            self.playlist_status_label.config(text=f"Laden fehlgeschlagen: {error}", fg='red')
+            return
+        
+        # Playlist-Dateien aktivieren (alle anderen abwählen) - Reihenfolge und Optionen gelten beim Start
+        entries, missing = loaded
+        paths = playlist_store.paths_by_kind(entries)
+        self.loaded_playlist = paths
+        self.playlist_options = {entry.path: entry.options for entry in entries if entry.options}
+        self.video_selection.set_selection(paths['video'])
+        self.image_selection.set_selection(paths['image'])
+        self.audio_selection.set_selection(paths['audio'])
+        loaded_videos, loaded_images, loaded_audios = (len(paths[kind]) for kind in ('video', 'image', 'audio'))
+        
+        total_files = loaded_videos + loaded_images + loaded_audios
+        text = f"Playlist '{name}' geladen: {loaded_videos}V, {loaded_images}B, {loaded_audios}A ({total_files} Dateien)"
+        if missing:
+            text += f", {missing} nicht gefunden"
+        self.playlist_status_label.config(text=text, fg='orange' if missing else 'lime')
+    
+    @staticmethod
+    def _run_playlist_job(func, args):
+        """Im Scanner-Thread: Playlist speichern/laden - (ergebnis, fehler) für den tk-Thread"""
         try:
-            selection = self.playlist_listbox.curselection()
-            if not selection:
-                self.playlist_status_label.config(text="Bitte eine Playlist auswählen!", fg='orange')
-                return
-            
-            playlist_name = self.playlist_listbox.get(selection[0])
-            if playlist_name == "Keine Playlists vorhanden":
-                return
-            
-            file_path = os.path.join("playlists", f"{playlist_name}.json")
-            if not os.path.exists(file_path):
-                self.playlist_status_label.config(text=f"Playlist-Datei nicht gefunden: {playlist_name}", fg='red')
-                return
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                playlist_data = json.load(f)
-            
-            # Alle Checkboxen zurücksetzen
-            for checkbox in self.video_checkboxes.values():
-                checkbox.set(False)
-            for checkbox in self.image_checkboxes.values():
-                checkbox.set(False)
-            for checkbox in self.audio_checkboxes.values():
-                checkbox.set(False)
-            
-            # Playlist-Dateien aktivieren
-            loaded_videos = loaded_images = loaded_audios = 0
-            
-            for video_filename in playlist_data.get('videos', []):
-                for file_path, checkbox in self.video_checkboxes.items():
-                    if os.path.basename(file_path) == video_filename:
-                        checkbox.set(True)
-                        loaded_videos += 1
-                        break
-            
-            for image_filename in playlist_data.get('images', []):
-                for file_path, checkbox in self.image_checkboxes.items():
-                    if os.path.basename(file_path) == image_filename:
-                        checkbox.set(True)
-                        loaded_images += 1
-                        break
-            
-            for audio_filename in playlist_data.get('audios', []):
-                for file_path, checkbox in self.audio_checkboxes.items():
-                    if os.path.basename(file_path) == audio_filename:
-                        checkbox.set(True)
-                        loaded_audios += 1
-                        break
-            
-            total_files = loaded_videos + loaded_images + loaded_audios
-            self.playlist_status_label.config(
-                text=f"Playlist '{playlist_name}' geladen: {loaded_videos}V, {loaded_images}B, {loaded_audios}A ({total_files} Dateien)", 
-                fg='lime')
-            
-            # Bildvorschau aktualisieren falls Bilder geladen wurden
-            if loaded_images > 0:
-                self.on_image_selection_changed()
-            
-        except Exception as e:
-            self.playlist_status_label.config(text=f"Laden fehlgeschlagen: {e}", fg='red')
+            return func(*args), None
+        except (OSError, ValueError, KeyError) as e:
+            return None, e
     
     # Media-Vollbild-Methoden (nicht GUI-Vollbild!)
     def toggle_media_fullscreen(self):
@@ -730,16 +865,28 @@ class VLCMediaStationGUI:
         if self.sensor_mode == "video":
             print("[VLC-GUI] → Bei Sensor-Auslösung werden Videos abgespielt")
         elif self.sensor_mode == "audio":
-            print("[VLC-GUI] → Bei Sensor-Auslösung werden Audio + Bilder abgespielt")
+            print("[VLC-GUI] → Bei Sensor-Auslösung läuft Audio unter der Bild-Slideshow")
         else:
             print(f"[VLC-GUI] → Unbekannter Modus: {self.sensor_mode}")
+        self.update_prefetch()
+    
+    def update_prefetch(self):
+        """Medien, die der Sensor als nächstes startet, vorab in den Page-Cache lesen"""
+        candidates = self.get_selected_videos() if self.sensor_mode == "video" else self.get_selected_audios()
+        # Bei Rückkehr wird das zuletzt gespielte Medium fortgesetzt - dieses zuerst
+        last_file = self.media_player.current_file
+        if last_file in candidates:
+            candidates.remove(last_file)
+            candidates.insert(0, last_file)
+        get_media_prefetcher().set_trigger(candidates)
     
     def vlc_pause(self):
         """VLC Pause/Play"""
         self.media_player.pause()
     
     def vlc_stop(self):
-        """VLC Stop"""
+        """VLC Stop (Video und Audio gemeinsam)"""
+        self.audio_player.stop()
         self.media_player.stop()
     
     def vlc_next(self):
@@ -752,52 +899,52 @@ class VLCMediaStationGUI:
     
     def get_selected_videos(self):
         """Ausgewählte Videos zurückgeben"""
-        return [path for path, var in self.video_checkboxes.items() if var.get()]
+        return self._ordered_selection('video', self.video_selection)
     
     def get_selected_images(self):
         """Ausgewählte Bilder zurückgeben"""
-        return [path for path, var in self.image_checkboxes.items() if var.get()]
+        return self._ordered_selection('image', self.image_selection)
     
     def get_selected_audios(self):
         """Ausgewählte Audio-Dateien zurückgeben"""
-        return [path for path, var in self.audio_checkboxes.items() if var.get()]
+        return self._ordered_selection('audio', self.audio_selection)
+    
+    def _ordered_selection(self, kind, selection):
+        """Auswahl in Listen-Reihenfolge - oder in Playlist-Reihenfolge, solange sie der geladenen Playlist entspricht"""
+        selected = selection.selected()
+        order = self.loaded_playlist.get(kind)
+        if order and len(order) == len(selected) and set(order) == set(selected):
+            return list(order)
+        return selected
+    
+    def _playback_options(self, kind, files):
+        """(mischen, Optionen pro Datei) für den Start - eine geladene Playlist läuft in ihrer Reihenfolge"""
+        if files and files == self.loaded_playlist.get(kind):
+            return False, {path: self.playlist_options[path] for path in files if path in self.playlist_options}
+        return True, None
     
     def on_image_selection_changed(self):
-        """Wird aufgerufen wenn Bild-Auswahl geändert wird - zeigt Bilder sofort an"""
+        """Wird aufgerufen wenn Bild-Auswahl geändert wird - aktualisiert die Slideshow"""
         try:
-            # Nur reagieren wenn nicht gerade ein Video/Audio über Sensor läuft
-            if self.media_player.is_playing:
-                # Prüfen ob gerade Video/Audio läuft (nicht nur Bild-Anzeige)
-                if hasattr(self.media_player, 'current_playlist') and self.media_player.current_playlist:
-                    current_file = self.media_player.current_playlist[self.media_player.current_index] if self.media_player.current_index < len(self.media_player.current_playlist) else None
-                    if current_file and not current_file.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.gif')):
-                        # Video oder Audio läuft - nicht unterbrechen
-                        print("[VLC-GUI] Bild-Auswahl geändert, aber Video/Audio läuft - keine Unterbrechung")
-                        return
-            
             selected_images = self.get_selected_images()
             
+            # Während Sensor-Wiedergabe nur die Bildliste tauschen, nicht unterbrechen
+            if self.sensor_playback_active:
+                print("[VLC-GUI] Bild-Auswahl geändert, aber Video/Audio läuft - keine Unterbrechung")
+                self.slideshow.set_images(selected_images)
+                return
+            
             if selected_images:
-                # Erstes ausgewähltes Bild anzeigen
-                first_image = selected_images[0]
-                print(f"[VLC-GUI] Zeige Bild-Vorschau: {os.path.basename(first_image)}")
-                
-                # Stoppe aktuelle Wiedergabe falls es nur ein Bild ist
-                if self.media_player.is_playing:
-                    self.media_player.stop()
-                
-                # Einzelnes Bild anzeigen
-                success = self.media_player.play_single_media(first_image)
-                if success:
+                print(f"[VLC-GUI] Starte Bild-Slideshow: {len(selected_images)} Bilder")
+                if self.slideshow.start(selected_images):
                     self.media_status_label.config(
-                        text=f"Bild-Vorschau: {os.path.basename(first_image)}", 
+                        text=f"Bild-Vorschau: {self.slideshow.current_name()}", 
                         fg='cyan'
                     )
-                else:
-                    print(f"[VLC-GUI] FEHLER: Konnte Bild nicht anzeigen: {os.path.basename(first_image)}")
             else:
                 # Keine Bilder ausgewählt - schwarzes Bild
                 print("[VLC-GUI] Keine Bilder ausgewählt - zeige schwarzes Bild")
+                self.slideshow.stop()
                 self.media_player.show_black()
                 self.media_status_label.config(text="Keine Bilder ausgewählt", fg='gray')
                 
@@ -807,33 +954,7 @@ class VLCMediaStationGUI:
     def scan_files(self):
         """Alle Mediendateien erneut scannen"""
         print("[VLC-GUI] Scanne Mediendateien...")
-        self.all_video_files = []
-        self.all_image_files = []
-        self.all_audio_files = []
-        
-        # Videos scannen
-        video_dir = os.path.join(os.path.dirname(__file__), 'videos')
-        if os.path.exists(video_dir):
-            for file in os.listdir(video_dir):
-                if file.lower().endswith(('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.m4v')):
-                    self.all_video_files.append(os.path.join(video_dir, file))
-        
-        # Bilder scannen
-        image_dir = os.path.join(os.path.dirname(__file__), 'images')
-        if os.path.exists(image_dir):
-            for file in os.listdir(image_dir):
-                if file.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')):
-                    self.all_image_files.append(os.path.join(image_dir, file))
-        
-        # Audio scannen
-        audio_dir = os.path.join(os.path.dirname(__file__), 'audio')
-        if os.path.exists(audio_dir):
-            for file in os.listdir(audio_dir):
-                if file.lower().endswith(('.mp3', '.wav', '.ogg', '.flac', '.aac', '.m4a', '.wma')):
-                    self.all_audio_files.append(os.path.join(audio_dir, file))
-        
-        print(f"[VLC-GUI] Scan abgeschlossen: {len(self.all_video_files)} Videos, {len(self.all_image_files)} Bilder, {len(self.all_audio_files)} Audio")
-        self.create_checkboxes()
+        self.scanner.scan(on_done=lambda changes: changes or print("[VLC-GUI] Scan abgeschlossen: keine Änderungen"))
     
     def start_playback(self):
         """Wiedergabe manuell starten (unabhängig vom Sensor)"""
@@ -851,12 +972,16 @@ class VLCMediaStationGUI:
                 print(f"[VLC-GUI] Videos: {[os.path.basename(v) for v in selected_videos]}")
                 
                 # Stoppen falls etwas läuft
+                self.slideshow.pause()
                 if self.media_player.is_playing:
                     self.media_player.stop()
                 
-                success = self.media_player.play_media_list(selected_videos, shuffle=True)
+                shuffle, options = self._playback_options('video', selected_videos)
+                success = self.media_player.play_media_list(selected_videos, shuffle=shuffle, options=options)
+                self.schedule_media_marks()
                 
                 if success:
+                    self.sensor_playback_active = True
                     self.media_status_label.config(text=f"Video-Wiedergabe: {len(selected_videos)} Videos", fg='lime')
                     print("[VLC-GUI] Video-Wiedergabe erfolgreich gestartet")
                 else:
@@ -864,26 +989,19 @@ class VLCMediaStationGUI:
                     print("[VLC-GUI] FEHLER: Video-Wiedergabe fehlgeschlagen")
                     
             elif self.sensor_mode == "audio":
-                # Audio-Modus (Audio + Bilder)
+                # Audio-Modus (Audio unter Bild-Slideshow)
                 selected_audios = self.get_selected_audios()
                 selected_images = self.get_selected_images()
-                mixed_playlist = selected_audios + selected_images
                 
-                if not mixed_playlist:
+                if not (selected_audios or selected_images):
                     self.media_status_label.config(text="Keine Audio/Bild-Dateien ausgewählt!", fg='red')
                     print("[VLC-GUI] Manueller Start: Keine Audio/Bild-Dateien ausgewählt")
                     return
                 
                 print(f"[VLC-GUI] Manueller Audio+Bild-Start: {len(selected_audios)} Audio + {len(selected_images)} Bilder")
-                print(f"[VLC-GUI] Dateien: {[os.path.basename(f) for f in mixed_playlist]}")
-                
-                # Stoppen falls etwas läuft
-                if self.media_player.is_playing:
-                    self.media_player.stop()
-                
-                success = self.media_player.play_media_list(mixed_playlist, shuffle=True)
                 
-                if success:
+                if self.start_audio_mode(selected_audios, selected_images):
+                    self.sensor_playback_active = True
                     self.media_status_label.config(
                         text=f"Audio+Bild-Wiedergabe: {len(selected_audios)}A + {len(selected_images)}B", fg='lime')
                     print("[VLC-GUI] Audio+Bild-Wiedergabe erfolgreich gestartet")
@@ -902,10 +1020,30 @@ class VLCMediaStationGUI:
                 self.sensor_thread.stop()
                 self.sensor_thread = None
             
+            if hasattr(self, 'slideshow') and self.slideshow:
+                self.slideshow.shutdown()
+            
+            if hasattr(self, 'audio_player') and self.audio_player:
+                self.audio_player.cleanup()
+                self.audio_player = None
+            
             if hasattr(self, 'media_player') and self.media_player:
                 self.media_player.stop()
                 self.media_player = None
             
+            if hasattr(self, 'status_view'):
+                print(f"[VLC-GUI] Status-Labels: {self.status_view.summary()}")
+            
+            if hasattr(self, 'folder_watcher'):
+                self.folder_watcher.stop()
+                self.scanner.shutdown()
+                self.catalog.close()
+            
+            get_playback_telemetry().shutdown()
+            get_media_prefetcher().shutdown()
+            get_hot_media_cache().shutdown()
+            get_probe_index().close()
+            
             self.root.quit()
             self.root.destroy()
             print("[VLC-GUI] GUI erfolgreich geschlossen")
@@ -920,63 +1058,37 @@ class VLCMediaStationGUI:
     # Ordner-öffnen-Funktionen
     def open_video_folder(self):
         """Video-Ordner im Datei-Explorer öffnen"""
-        try:
-            video_path = os.path.abspath(VIDEO_FOLDER)
-            if not os.path.exists(video_path):
-                os.makedirs(video_path)
-                print(f"[VLC-GUI] Video-Ordner erstellt: {video_path}")
-            
-            if platform.system() == "Windows":
-                subprocess.run(['explorer', video_path])
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(['open', video_path])
-            else:  # Linux
-                subprocess.run(['xdg-open', video_path])
-            
-            print(f"[VLC-GUI] Video-Ordner geöffnet: {video_path}")
-            
-        except Exception as e:
-            print(f"[VLC-GUI] Fehler beim Öffnen des Video-Ordners: {e}")
+        self.scanner.submit(self._open_folder, VIDEO_FOLDER, "Video")
     
     def open_image_folder(self):
         """Bild-Ordner im Datei-Explorer öffnen"""
-        try:
-            image_path = os.path.abspath(IMAGE_FOLDER)
-            if not os.path.exists(image_path):
-                os.makedirs(image_path)
-                print(f"[VLC-GUI] Bild-Ordner erstellt: {image_path}")
-            
-            if platform.system() == "Windows":
-                subprocess.run(['explorer', image_path])
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(['open', image_path])
-            else:  # Linux
-                subprocess.run(['xdg-open', image_path])
-            
-            print(f"[VLC-GUI] Bild-Ordner geöffnet: {image_path}")
-            
-        except Exception as e:
-            print(f"[VLC-GUI] Fehler beim Öffnen des Bild-Ordners: {e}")
+        self.scanner.submit(self._open_folder, IMAGE_FOLDER, "Bild")
     
     def open_audio_folder(self):
         """Audio-Ordner im Datei-Explorer öffnen"""
+        self.scanner.submit(self._open_folder, AUDIO_FOLDER, "Audio")
+    
+    @staticmethod
+    def _open_folder(folder, label):
+        """Ordner anlegen falls nötig und im Dateimanager öffnen (läuft im Scanner-Thread)"""
         try:
-            audio_path = os.path.abspath(AUDIO_FOLDER)
-            if not os.path.exists(audio_path):
-                os.makedirs(audio_path)
-                print(f"[VLC-GUI] Audio-Ordner erstellt: {audio_path}")
+            path = os.path.abspath(folder)
+            if not os.path.exists(path):
+                os.makedirs(path)
+                print(f"[VLC-GUI] {label}-Ordner erstellt: {path}")
             
+            # Popen statt run: nicht auf den Dateimanager warten, der Scanner-Thread bleibt frei
             if platform.system() == "Windows":
-                subprocess.run(['explorer', audio_path])
+                subprocess.Popen(['explorer', path])
             elif platform.system() == "Darwin":  # macOS
-                subprocess.run(['open', audio_path])
+                subprocess.Popen(['open', path])
             else:  # Linux
-                subprocess.run(['xdg-open', audio_path])
+                subprocess.Popen(['xdg-open', path])
             
-            print(f"[VLC-GUI] Audio-Ordner geöffnet: {audio_path}")
+            print(f"[VLC-GUI] {label}-Ordner geöffnet: {path}")
             
         except Exception as e:
-            print(f"[VLC-GUI] Fehler beim Öffnen des Audio-Ordners: {e}")
+            print(f"[VLC-GUI] Fehler beim Öffnen des {label}-Ordners: {e}")
     
     def update_status(self):
         """Status-Update-Schleife"""
@@ -984,6 +1096,10 @@ class VLCMediaStationGUI:
         
         if distance == 0.0:
             self.status_label.config(text="Sensor: Nicht verbunden", fg='red')
+            if self.sensor_playback_active:
+                self.stop_sensor_playback()
+            if self.slideshow.running:
+                self.slideshow.stop()
             self.media_player.show_black()
             self.media_status_label.config(text="Status: Kein Sensor", fg='red')
         else:
@@ -995,25 +1111,26 @@ class VLCMediaStationGUI:
                 max_dist = float(self.max_dist_var.get())
                 
                 if min_dist <= distance <= max_dist:
-                    # Sensor ausgelöst
-                    self.handle_sensor_trigger()
+                    # Sensor ausgelöst - nur beim Betreten des Bereichs starten
+                    if not self.sensor_playback_active:
+                        self.handle_sensor_trigger()
+                    else:
+                        # Playlist-Ende / Einzelvideo-Schleife überwachen
+                        self.media_player.check_playback()
                 else:
                     # Außerhalb Bereich - Sensor-Wiedergabe beenden
-                    if self.media_player.is_playing:
-                        # Prüfen ob gerade Sensor-Wiedergabe läuft (Video/Audio-Playlist)
-                        if hasattr(self.media_player, 'current_playlist') and self.media_player.current_playlist and len(self.media_player.current_playlist) > 1:
-                            # Multi-Media-Playlist läuft - das ist Sensor-Wiedergabe, beenden
-                            print("[VLC-GUI] Außerhalb Sensor-Bereich - beende Sensor-Wiedergabe")
-                            self.media_player.stop()
-                            # Zurück zur Bildvorschau
-                            self.restore_image_preview()
-                        else:
-                            # Einzelbild-Vorschau läuft - weiterlaufen lassen
-                            media_info = self.media_player.get_current_media_info()
-                            if media_info:
-                                self.media_status_label.config(
-                                    text=f"Bild-Vorschau: {media_info['name']}", fg='cyan'
-                                )
+                    if self.sensor_playback_active:
+                        print("[VLC-GUI] Außerhalb Sensor-Bereich - beende Sensor-Wiedergabe")
+                        self.stop_sensor_playback()
+                        # Zurück zur Bildvorschau
+                        self.restore_image_preview()
+                    elif self.slideshow.running:
+                        # Slideshow läuft - weiterlaufen lassen
+                        current_name = self.slideshow.current_name()
+                        if current_name:
+                            self.media_status_label.config(
+                                text=f"Bild-Vorschau: {current_name}", fg='cyan'
+                            )
                     else:
                         # Nichts läuft - Bildvorschau starten falls Bilder ausgewählt
                         self.restore_image_preview()
@@ -1033,13 +1150,17 @@ class VLCMediaStationGUI:
                 print(f"[VLC-GUI] Sensor ausgelöst - Video-Modus: {len(selected_videos)} Videos gefunden")
                 
                 if selected_videos:
-                    # Stoppe alles was läuft (auch Bildvorschau)
+                    # Stoppe alles was läuft (Slideshow pausiert)
+                    self.slideshow.pause()
                     if self.media_player.is_playing:
                         self.media_player.stop()
                     
                     print(f"[VLC-GUI] Starte Video-Wiedergabe (überschreibt Bildvorschau): {[os.path.basename(v) for v in selected_videos]}")
-                    success = self.media_player.play_media_list(selected_videos, shuffle=True)
+                    shuffle, options = self._playback_options('video', selected_videos)
+                    success = self.media_player.play_media_list(selected_videos, shuffle=shuffle, options=options)
+                    self.schedule_media_marks()
                     if success:
+                        self.sensor_playback_active = True
                         self.media_status_label.config(
                             text=f"Sensor → Video-Playlist: {len(selected_videos)} Videos", fg='lime'
                         )
@@ -1057,21 +1178,16 @@ class VLCMediaStationGUI:
                     self.media_status_label.config(text="Keine Videos ausgewählt!", fg='orange')
             
             elif self.sensor_mode == "audio":
-                # Audio + Bilder gemischt
+                # Audio unter Bild-Slideshow (zwei unabhängige Pipelines)
                 selected_audios = self.get_selected_audios()
                 selected_images = self.get_selected_images()
-                mixed_playlist = selected_audios + selected_images
                 
                 print(f"[VLC-GUI] Sensor ausgelöst - Audio-Modus: {len(selected_audios)} Audio + {len(selected_images)} Bilder")
                 
-                if mixed_playlist:
-                    # Stoppe alles was läuft (auch Bildvorschau)
-                    if self.media_player.is_playing:
-                        self.media_player.stop()
-                    
-                    print(f"[VLC-GUI] Starte Audio+Bild-Wiedergabe (überschreibt Bildvorschau): {[os.path.basename(f) for f in mixed_playlist]}")
-                    success = self.media_player.play_media_list(mixed_playlist, shuffle=True)
+                if selected_audios or selected_images:
+                    success = self.start_audio_mode(selected_audios, selected_images)
                     if success:
+                        self.sensor_playback_active = True
                         self.media_status_label.config(
                             text=f"Sensor → Audio+Bild: {len(selected_audios)}A + {len(selected_images)}B", fg='lime'
                         )
@@ -1092,21 +1208,57 @@ class VLCMediaStationGUI:
             print(f"[VLC-GUI] FEHLER in handle_sensor_trigger: {e}")
             self.media_status_label.config(text=f"Sensor-Trigger-Fehler: {e}", fg='red')
     
+    def start_audio_mode(self, selected_audios, selected_images):
+        """Audio-Modus starten: Soundtrack im Audio-Player, Bilder über die Slideshow"""
+        # Video-Wiedergabe beenden, Slideshow behält die Anzeige
+        if self.media_player.is_playing and self.media_player.current_mode != "image":
+            self.media_player.stop()
+        
+        audio_started = False
+        if selected_audios:
+            shuffle, _ = self._playback_options('audio', selected_audios)
+            audio_started = self.audio_player.play_playlist(selected_audios, shuffle=shuffle)
+        
+        if selected_images:
+            if not self.slideshow.running:
+                self.slideshow.start(selected_images)
+            else:
+                self.slideshow.set_images(selected_images)
+                self.slideshow.resume()
+        
+        return audio_started or bool(selected_images)
+    
+    def stop_sensor_playback(self):
+        """Sensor-Wiedergabe beenden - Audio und Video gemeinsam ausblenden"""
+        self.sensor_playback_active = False
+        self.audio_player.stop(fade=True)
+        
+        # Video nur beenden wenn die Slideshow nicht die Anzeige hat
+        if not self.slideshow.running or self.slideshow.paused:
+            self.media_player.fade_out()
+        self.update_prefetch()
+    
     def restore_image_preview(self):
         """Stellt die Bildvorschau wieder her wenn Sensor-Wiedergabe beendet ist"""
         try:
             selected_images = self.get_selected_images()
             if selected_images:
-                first_image = selected_images[0]
-                print(f"[VLC-GUI] Stelle Bildvorschau wieder her: {os.path.basename(first_image)}")
-                success = self.media_player.play_single_media(first_image)
-                if success:
+                if self.slideshow.running:
+                    # Laufende/pausierte Slideshow an der alten Stelle fortsetzen
+                    self.slideshow.set_images(selected_images)
+                    self.slideshow.resume()
+                else:
+                    print(f"[VLC-GUI] Stelle Bildvorschau wieder her: {len(selected_images)} Bilder")
+                    self.slideshow.start(selected_images)
+                
+                if self.slideshow.running:
                     self.media_status_label.config(
-                        text=f"Bild-Vorschau: {os.path.basename(first_image)}", 
+                        text=f"Bild-Vorschau: {self.slideshow.current_name()}", 
                         fg='cyan'
                     )
             else:
                 print("[VLC-GUI] Keine Bilder für Vorschau - zeige schwarzes Bild")
+                self.slideshow.stop()
                 self.media_player.show_black()
                 self.media_status_label.config(text="Bereit - außerhalb Sensor-Bereich", fg='yellow')
         except Exception as e:
@@ -1118,7 +1270,16 @@ class VLCMediaStationGUI:
             self.root.mainloop()
         finally:
             self.sensor_thread.stop()
+            self.slideshow.shutdown()
+            self.audio_player.cleanup()
             self.media_player.cleanup()
+            self.folder_watcher.stop()
+            self.scanner.shutdown()
+            self.catalog.close()
+            get_playback_telemetry().shutdown()
+            get_media_prefetcher().shutdown()
+            get_hot_media_cache().shutdown()
+            get_probe_index().close()
 
 # Kompatibilitäts-Alias
 MediaStationGUI = VLCMediaStationGUI
@@ -0,0 +1,261 @@
+"""
+RAM-Cache (tmpfs) für häufig ausgelöste Medien
+Oft gestartete Dateien werden im Hintergrund kopiert, geprüft und danach aus dem RAM abgespielt
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from config import (HOT_CACHE_ENABLED, HOT_CACHE_DIR, HOT_CACHE_MAX_BYTES, HOT_CACHE_MIN_PLAYS,
+                    HOT_CACHE_STATS_FILE)
+
+INDEX_NAME = "index.json"
+COPY_CHUNK = 1024 * 1024
+
+_hot_cache_singleton = None
+
+
+def _digest_file(path):
+    """BLAKE2-Prüfsumme einer Datei"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HotMediaCache:
+    def __init__(self, cache_dir=HOT_CACHE_DIR, max_bytes=HOT_CACHE_MAX_BYTES, min_plays=HOT_CACHE_MIN_PLAYS,
+                 stats_file=HOT_CACHE_STATS_FILE, enabled=HOT_CACHE_ENABLED):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.min_plays = max(1, min_plays)
+        self.stats_file = stats_file
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._running = True
+        # {quellpfad: {'cached', 'size', 'mtime', 'digest'}} - Reihenfolge = LRU (zuletzt benutzt am Ende)
+        self._entries = OrderedDict()
+        self._plays = {}  # {quellpfad: anzahl starts}
+        self._queue = []  # Quellpfade, die kopiert werden sollen
+        self.used_bytes = 0
+        self.hits = 0
+
+        self._thread = None
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"[HotCache] Verzeichnis {self.cache_dir} nicht nutzbar: {e} - Cache deaktiviert")
+            self.enabled = False
+            return
+
+        self._load()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"[HotCache] Bereit: {len(self._entries)} Dateien, {self.used_bytes / (1024 * 1024):.0f} "
+              f"von {self.max_bytes / (1024 * 1024):.0f} MB")
+
+    # Laden/Speichern
+    def _load(self):
+        """Start-Zähler und noch vorhandene Kopien (Neustart ohne Reboot) übernehmen"""
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                self._plays = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[HotCache] Zähler nicht lesbar: {e}")
+
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_NAME), 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+
+        for source, entry in entries.items():
+            if self._is_valid(source, entry):
+                self._entries[source] = entry
+                self.used_bytes += entry['size']
+
+        # Kopien ohne gültigen Eintrag aufräumen
+        known = {os.path.basename(entry['cached']) for entry in self._entries.values()}
+        for name in os.listdir(self.cache_dir):
+            if name != INDEX_NAME and name not in known:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def _save(self):
+        """Index (auf tmpfs) und Zähler atomar speichern (Aufrufer hält den Lock)"""
+        for path, data in ((os.path.join(self.cache_dir, INDEX_NAME), dict(self._entries)),
+                           (self.stats_file, self._plays)):
+            try:
+                tmp_file = f"{path}.tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, path)
+            except Exception as e:
+                print(f"[HotCache] Fehler beim Speichern von {path}: {e}")
+
+    @staticmethod
+    def _is_valid(source, entry):
+        """Quelle unverändert und Kopie vollständig vorhanden"""
+        try:
+            stat = os.stat(source)
+            return (stat.st_mtime == entry['mtime'] and stat.st_size == entry['size']
+                    and os.path.getsize(entry['cached']) == entry['size'])
+        except OSError:
+            return False
+
+    # Abfrage durch den Player
+    def resolve(self, path):
+        """Pfad zum Abspielen: Kopie im RAM falls gültig, sonst die Originaldatei"""
+        if not self.enabled:
+            return path
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return path
+            if not self._is_valid(path, entry):
+                # Quelle geändert oder Kopie weg - verwerfen, wird bei Bedarf neu kopiert
+                print(f"[HotCache] Ungültig: {os.path.basename(path)} - spiele Original")
+                self._drop(path)
+                self._save()
+                return path
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry['cached']
+
+    def contains(self, path):
+        """Prüft ohne LRU-Aktualisierung ob eine Kopie existiert"""
+        return self.enabled and path in self._entries
+
+    def record_play(self, path):
+        """Start zählen - häufig gestartete Dateien werden zum Kopieren vorgemerkt"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._plays[path] = self._plays.get(path, 0) + 1
+            if self._plays[path] >= self.min_plays and path not in self._entries and path not in self._queue:
+                self._queue.append(path)
+                self._wakeup.notify()
+
+    def get_stats(self):
+        with self._lock:
+            return {'files': len(self._entries), 'used_bytes': self.used_bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'queued': len(self._queue)}
+
+    def shutdown(self):
+        """Worker beenden - Kopien bleiben bis zum Reboot im tmpfs"""
+        with self._lock:
+            self._running = False
+            self._wakeup.notify_all()
+            if self.enabled:
+                self._save()
+
+    # Worker
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._running and not self._queue:
+                    self._wakeup.wait()
+                if not self._running:
+                    return
+                # Häufigste zuerst
+                self._queue.sort(key=lambda p: self._plays.get(p, 0), reverse=True)
+                source = self._queue.pop(0)
+            self._copy(source)
+
+    def _copy(self, source):
+        """Datei kopieren, Kopie gegen die Quelle prüfen und aufnehmen"""
+        name = os.path.basename(source)
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return
+        if stat.st_size > self.max_bytes:
+            print(f"[HotCache] {name} ist größer als der Cache - bleibt auf dem Datenträger")
+            return
+
+        with self._lock:
+            if not self._make_room(stat.st_size, self._plays.get(source, 0)):
+                return
+
+        cached = os.path.join(self.cache_dir, f"{hashlib.sha1(source.encode()).hexdigest()[:12]}_{name}")
+        tmp_file = f"{cached}.tmp"
+        start = time.monotonic()
+        try:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(source, 'rb') as src, open(tmp_file, 'wb') as dst:
+                for chunk in iter(lambda: src.read(COPY_CHUNK), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+            # Prüfen: Quelle während des Kopierens unverändert, Kopie bitgleich
+            after = os.stat(source)
+            if (after.st_mtime, after.st_size) != (stat.st_mtime, stat.st_size) \
+                    or _digest_file(tmp_file) != digest.hexdigest():
+                raise IOError("Kopie stimmt nicht mit der Quelle überein")
+            os.replace(tmp_file, cached)
+        except Exception as e:
+            print(f"[HotCache] Kopieren von {name} fehlgeschlagen: {e}")
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._entries[source] = {'cached': cached, 'size': stat.st_size, 'mtime': stat.st_mtime,
+                                     'digest': digest.hexdigest()}
+            self.used_bytes += stat.st_size
+            self._save()
+        print(f"[HotCache] Im RAM: {name} ({stat.st_size / (1024 * 1024):.0f} MB in "
+              f"{time.monotonic() - start:.1f}s, belegt {self.used_bytes / (1024 * 1024):.0f} MB)")
+
+    def _make_room(self, size, plays):
+        """LRU-Einträge verdrängen bis size passt (Aufrufer hält den Lock)
+
+        Häufiger gestartete Dateien werden nicht für eine seltenere verdrängt.
+        """
+        victims = []
+        free = self.max_bytes - self.used_bytes
+        for source in self._entries:
+            if free >= size:
+                break
+            if self._plays.get(source, 0) > plays:
+                continue
+            victims.append(source)
+            free += self._entries[source]['size']
+        if free < size:
+            return False
+        for source in victims:
+            print(f"[HotCache] Verdränge {os.path.basename(source)}")
+            self._drop(source)
+        return True
+
+    def _drop(self, source):
+        """Eintrag und Kopie entfernen (Aufrufer hält den Lock)"""
+        entry = self._entries.pop(source, None)
+        if entry is None:
+            return
+        self.used_bytes -= entry['size']
+        try:
+            os.remove(entry['cached'])
+        except OSError:
+            pass
+
+
+def get_hot_media_cache():
+    """Gemeinsamen RAM-Cache holen (Singleton)"""
+    global _hot_cache_singleton
+    if _hot_cache_singleton is None:
+        _hot_cache_singleton = HotMediaCache()
+    return _hot_cache_singleton
@@ -0,0 +1,347 @@
+"""
+Katalog der Mediendateien pro Typ
+Enthält die einzige Liste der unterstützten Dateiendungen. Ein Rescan wird mit dem bekannten Stand
+verglichen - Beobachter erhalten nur die Unterschiede.
+"""
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+from config import VIDEO_FOLDER, IMAGE_FOLDER, AUDIO_FOLDER, CATALOG_SNAPSHOT_ENABLED, CATALOG_DB_PATH
+from media_scanner import scan_tree
+
+# Typ-Registry: unterstützte Endungen pro Medientyp
+MEDIA_TYPES = {
+    'video': ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.m4v'),
+    'image': ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'),
+    'audio': ('.mp3', '.wav', '.ogg', '.flac', '.aac', '.m4a', '.wma'),
+}
+MEDIA_FOLDERS = {'video': VIDEO_FOLDER, 'image': IMAGE_FOLDER, 'audio': AUDIO_FOLDER}
+
+_EXTENSION_TYPES = {ext: kind for kind, extensions in MEDIA_TYPES.items() for ext in extensions}
+
+# Unterschiede eines Medientyps (Listen von Pfaden)
+CatalogChange = namedtuple('CatalogChange', ['added', 'removed', 'changed'])
+
+_catalog_singleton = None
+
+
+def sort_key(path):
+    """Anzeige-Reihenfolge der Dateilisten: nach Pfad ohne Groß-/Kleinschreibung (Unterordner gruppiert)"""
+    return path.lower(), path
+
+
+def media_type(path):
+    """'video', 'image', 'audio' oder None anhand der Dateiendung"""
+    return _EXTENSION_TYPES.get(os.path.splitext(path)[1].lower())
+
+
+def extensions(kind=None):
+    """Endungen eines Typs bzw. aller Typen (als Tupel für str.endswith)"""
+    if kind is None:
+        return tuple(_EXTENSION_TYPES)
+    return MEDIA_TYPES[kind]
+
+
+class MediaRecord:
+    """Eine Mediendatei im Katalog"""
+    __slots__ = ('path', 'kind', 'name', 'folder', 'size', 'mtime', 'probe', 'fingerprint')
+
+    def __init__(self, path, kind, mtime, size):
+        self.path = path
+        self.kind = kind
+        self.name = os.path.basename(path)
+        self.folder = os.path.dirname(path)
+        self.mtime = mtime
+        self.size = size
+        self.probe = None  # Probe-Daten (Dauer, Codecs, ...) sobald analysiert
+        self.fingerprint = None  # Inhalts-Fingerabdruck für Playlists (bei Bedarf berechnet)
+
+    def stat(self):
+        return (self.mtime, self.size)
+
+    def __repr__(self):
+        return f"MediaRecord({self.path!r}, {self.kind!r}, {self.size})"
+
+
+class MediaCatalog:
+    def __init__(self, folders=None, db_path=CATALOG_DB_PATH if CATALOG_SNAPSHOT_ENABLED else None):
+        self.folders = dict(folders or MEDIA_FOLDERS)
+        self._dirs = {kind: {} for kind in self.folders}  # {typ: {ordner: mtime}} vom letzten Scan
+        self._records = {}  # {pfad: MediaRecord}
+        self._by_kind = {kind: {} for kind in self.folders}  # {typ: {pfad: MediaRecord}}
+        self._by_folder = {}  # {ordner: {pfad: MediaRecord}}
+        self._by_name = {}  # {dateiname: {pfad: MediaRecord}}
+        self._sorted = {}  # {typ: [pfade]} - verworfen bei Änderungen
+        self._listeners = []
+
+        self._db = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path)
+                self._db.execute("CREATE TABLE IF NOT EXISTS catalog_files "
+                                 "(path TEXT PRIMARY KEY, kind TEXT, mtime REAL, size INTEGER)")
+                self._db.execute("CREATE TABLE IF NOT EXISTS catalog_dirs "
+                                 "(path TEXT PRIMARY KEY, kind TEXT, mtime REAL)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"[Catalog] Snapshot nicht nutzbar: {e}")
+                self._db = None
+
+    def add_listener(self, callback):
+        """callback({typ: CatalogChange}) - einmal pro Abgleich, nur Typen mit Änderungen"""
+        self._listeners.append(callback)
+
+    # Abfragen (O(1) bis auf files())
+    def get(self, path):
+        """MediaRecord eines Pfades oder None"""
+        return self._records.get(path)
+
+    def __contains__(self, path):
+        return path in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def find_by_name(self, name):
+        """Alle Records mit diesem Dateinamen (ohne Ordner)"""
+        return list(self._by_name.get(name, {}).values())
+
+    def in_folder(self, folder):
+        """Records direkt in einem Ordner"""
+        return list(self._by_folder.get(folder, {}).values())
+
+    def records(self, kind):
+        """Alle Records eines Typs (ungeordnet)"""
+        return list(self._by_kind[kind].values())
+
+    def count(self, kind):
+        return len(self._by_kind[kind])
+
+    def files(self, kind):
+        """Bekannte Dateien eines Typs, nach Pfad sortiert (Unterordner gruppiert)"""
+        if kind not in self._sorted:
+            self._sorted[kind] = sorted(self._by_kind[kind], key=sort_key)
+        return list(self._sorted[kind])
+
+    def kind_of(self, path):
+        """Medientyp eines Pfades anhand des (Ober-)Ordners oder None"""
+        path = os.path.abspath(path)
+        for kind, folder in self.folders.items():
+            folder = os.path.abspath(folder)
+            if path.startswith(folder + os.sep):
+                return kind
+        return None
+
+    def _canonical(self, kind, path):
+        """Pfad in der Schreibweise des Scans (relativ zum konfigurierten Ordner)"""
+        folder = self.folders[kind]
+        return os.path.join(folder, os.path.relpath(os.path.abspath(path), os.path.abspath(folder)))
+
+    def refresh_probe(self, probe_index, paths=None):
+        """Probe-Daten aus dem Medien-Index übernehmen (alle oder nur paths) - gibt die neu versorgten Pfade zurück"""
+        updated = []
+        for path in (self._records if paths is None else paths):
+            record = self._records.get(path)
+            if record is not None and record.probe is None:
+                record.probe = probe_index.get(path)
+                if record.probe is not None:
+                    updated.append(path)
+        return updated
+
+    # Snapshot
+    def load_snapshot(self):
+        """Stand des letzten Laufs übernehmen - Beobachter sehen die Dateien sofort"""
+        if self._db is None:
+            return {}
+        start = time.monotonic()
+        updates = {kind: {} for kind in self.folders}
+        try:
+            for path, kind, mtime, size in self._db.execute("SELECT path, kind, mtime, size FROM catalog_files"):
+                if kind in updates:
+                    updates[kind][path] = (mtime, size)
+            for path, kind, mtime in self._db.execute("SELECT path, kind, mtime FROM catalog_dirs"):
+                if kind in self._dirs:
+                    self._dirs[kind][path] = mtime
+        except sqlite3.Error as e:
+            print(f"[Catalog] Snapshot nicht lesbar: {e}")
+            return {}
+        changes = self.apply_updates(updates, save=False)
+        print(f"[Catalog] Snapshot geladen: {len(self)} Dateien in {(time.monotonic() - start) * 1000:.0f}ms")
+        return changes
+
+    def _save_changes(self, changes):
+        """Unterschiede in den Snapshot schreiben"""
+        if self._db is None or not changes:
+            return
+        try:
+            rows = [(path, kind, *self._records[path].stat()) for kind, change in changes.items()
+                    for path in change.added + change.changed]
+            self._db.executemany("INSERT OR REPLACE INTO catalog_files VALUES (?, ?, ?, ?)", rows)
+            self._db.executemany("DELETE FROM catalog_files WHERE path = ?",
+                                 [(path,) for change in changes.values() for path in change.removed])
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"[Catalog] Snapshot konnte nicht gespeichert werden: {e}")
+
+    def _save_dirs(self, kind):
+        if self._db is None:
+            return
+        try:
+            self._db.execute("DELETE FROM catalog_dirs WHERE kind = ?", (kind,))
+            self._db.executemany("INSERT OR REPLACE INTO catalog_dirs VALUES (?, ?, ?)",
+                                 [(path, kind, mtime) for path, mtime in self._dirs[kind].items()])
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"[Catalog] Snapshot konnte nicht gespeichert werden: {e}")
+
+    def close(self):
+        """Snapshot-Datenbank schließen"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # Einlesen (scan_kind/validate_kind dürfen im Scanner-Thread laufen)
+    def scan_kind(self, kind):
+        """Medienordner (mit Unterordnern) einlesen - Ergebnis für apply_scan"""
+        dirs = {}
+        listing = scan_tree(self.folders[kind], MEDIA_TYPES[kind], dirs)
+        return kind, listing, dirs
+
+    def validate_kind(self, kind):
+        """Snapshot prüfen: unveränderte Ordner-mtimes = keine Dateien hinzugekommen oder entfernt
+
+        Gibt None zurück falls der Snapshot stimmt, sonst einen vollständigen Scan.
+        """
+        known = dict(self._dirs[kind])
+        if known:
+            try:
+                if all(os.stat(path).st_mtime == mtime for path, mtime in known.items()):
+                    return None
+            except OSError:
+                pass  # Ordner entfernt
+        return self.scan_kind(kind)
+
+    def apply_scan(self, result):
+        """Ergebnis von scan_kind/validate_kind übernehmen - gibt die Unterschiede zurück"""
+        if result is None:
+            return {}
+        kind, listing, dirs = result
+        changes = self.apply({kind: listing})
+        self._dirs[kind] = dirs
+        self._save_dirs(kind)
+        return changes
+
+    def rescan(self, kinds=None):
+        """Ordner neu einlesen und Unterschiede anwenden (blockierend)"""
+        changes = {}
+        for kind in kinds or list(self.folders):
+            changes.update(self.apply_scan(self.scan_kind(kind)))
+        return changes
+
+    # Abgleich
+    def apply(self, listings):
+        """Neue Ordnerinhalte {typ: {pfad: (mtime, size)}} übernehmen - gibt die Unterschiede zurück"""
+        updates = {}
+        for kind, listing in listings.items():
+            kind_updates = dict(listing)
+            kind_updates.update((path, None) for path in self._by_kind[kind] if path not in listing)
+            updates[kind] = kind_updates
+        return self.apply_updates(updates)
+
+    def update_paths(self, paths):
+        """Nur diese Pfade neu prüfen (z.B. nach Dateisystem-Ereignissen) - gibt die Unterschiede zurück"""
+        return self.apply_updates(self.stat_paths(paths))
+
+    def stat_paths(self, paths):
+        """Aktuellen Stand einzelner Pfade ermitteln (darf im Scanner-Thread laufen)
+
+        Ein Verzeichnis wird mit allen enthaltenen Dateien abgeglichen (neu, verschoben, gelöscht).
+        Ergebnis: {typ: {pfad: (mtime, size) oder None für gelöscht}}
+        """
+        updates = {}
+        for path in paths:
+            kind = self.kind_of(path)
+            if kind is None:
+                continue
+            path = self._canonical(kind, path)
+            kind_updates = updates.setdefault(kind, {})
+            if os.path.isdir(path):
+                kind_updates.update(scan_tree(path, MEDIA_TYPES[kind]))
+                continue
+            if media_type(path) == kind:
+                try:
+                    stat = os.stat(path)
+                    kind_updates[path] = (stat.st_mtime, stat.st_size)
+                except OSError:
+                    kind_updates[path] = None
+            if not os.path.exists(path):
+                # Gelöschtes/verschobenes Verzeichnis: alle bekannten Dateien darunter entfernen
+                prefix = path + os.sep
+                kind_updates.update((known, None) for known in list(self._by_kind[kind])
+                                    if known.startswith(prefix))
+        return updates
+
+    def apply_updates(self, updates, save=True):
+        """Ergebnis von stat_paths übernehmen - gibt die Unterschiede zurück"""
+        changes = {}
+        for kind, kind_updates in updates.items():
+            change = CatalogChange([], [], [])
+            for path, current in kind_updates.items():
+                record = self._records.get(path)
+                if current == (record.stat() if record else None):
+                    continue
+                if current is None:
+                    self._remove(record)
+                    change.removed.append(path)
+                elif record is None:
+                    self._add(MediaRecord(path, kind, *current))
+                    change.added.append(path)
+                else:
+                    record.mtime, record.size = current
+                    record.probe = None  # Datei geändert - neu analysieren lassen
+                    record.fingerprint = None
+                    change.changed.append(path)
+            if change.added or change.removed or change.changed:
+                self._sorted.pop(kind, None)
+                changes[kind] = change
+        if save:
+            self._save_changes(changes)
+        self._notify(changes)
+        return changes
+
+    def _add(self, record):
+        self._records[record.path] = record
+        self._by_kind[record.kind][record.path] = record
+        self._by_folder.setdefault(record.folder, {})[record.path] = record
+        self._by_name.setdefault(record.name, {})[record.path] = record
+
+    def _remove(self, record):
+        del self._records[record.path]
+        del self._by_kind[record.kind][record.path]
+        for index, key in ((self._by_folder, record.folder), (self._by_name, record.name)):
+            bucket = index[key]
+            del bucket[record.path]
+            if not bucket:
+                del index[key]
+
+    def _notify(self, changes):
+        if not changes:
+            return
+        summary = ", ".join(f"{kind} +{len(c.added)} -{len(c.removed)} ~{len(c.changed)}"
+                            for kind, c in changes.items())
+        print(f"[Catalog] Änderungen: {summary}")
+        for callback in list(self._listeners):
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"[Catalog] Fehler im Beobachter: {e}")
+
+
+def get_media_catalog():
+    """Gemeinsamen Medienkatalog holen (Singleton)"""
+    global _catalog_singleton
+    if _catalog_singleton is None:
+        _catalog_singleton = MediaCatalog()
+    return _catalog_singleton
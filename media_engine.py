@@ -0,0 +1,174 @@
+"""
+Gemeinsame Engine-Schnittstelle und Backend-Auswahl pro Medientyp
+Standbilder, kurze Signaltöne und Videos laufen jeweils über das günstigste verfügbare Backend
+"""
+import abc
+import shutil
+import time
+import wave
+
+from config import MEDIA_BACKENDS, AUDIO_CUE_MAX_SECONDS
+from media_catalog import media_type
+from media_probe import get_probe_index
+
+# PIL für Standbilder
+try:
+    from PIL import Image, ImageTk
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# pygame für kurze Signaltöne
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+# VLC (nur für die Anzeige der Fähigkeiten)
+try:
+    import vlc  # noqa: F401
+    VLC_AVAILABLE = True
+except ImportError:
+    VLC_AVAILABLE = False
+
+_capabilities = None
+
+
+def get_capabilities():
+    """Verfügbare Backends einmalig beim Start ermitteln"""
+    global _capabilities
+    if _capabilities is not None:
+        return _capabilities
+
+    mixer = False
+    if PYGAME_AVAILABLE:
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            mixer = bool(pygame.mixer.get_init())
+        except Exception as e:
+            print(f"[MediaRouter] pygame-Mixer nicht nutzbar: {e}")
+
+    _capabilities = {
+        'pil': PIL_AVAILABLE,
+        'pygame': mixer,
+        'vlc': VLC_AVAILABLE,
+        'mpv': shutil.which('mpv') is not None,
+    }
+    print(f"[MediaRouter] Verfügbar: {', '.join(name for name, ok in _capabilities.items() if ok) or 'nichts'}")
+    return _capabilities
+
+
+class MediaEngine(abc.ABC):
+    """Gemeinsame Basis aller Wiedergabe-Engines
+
+    Gemeinsamer Zustand: current_mode ("black", "playing", "paused", "image", "video"),
+    current_file, is_playing, media_start_time (time.time() beim Start des Mediums)
+    und active_backend (welches Backend das aktuelle Medium wiedergibt).
+    """
+    engine_name = "engine"
+
+    @abc.abstractmethod
+    def play(self, media_files, shuffle=False, options=None):
+        """Medienliste starten - options: {pfad: {option: wert}} aus der Playlist; True bei Erfolg"""
+
+    @abc.abstractmethod
+    def stop(self):
+        """Aktuelles Medium stoppen"""
+
+    @abc.abstractmethod
+    def show_black(self):
+        """Schwarzbild anzeigen"""
+
+    @abc.abstractmethod
+    def cleanup(self):
+        """Backend und Fenster freigeben"""
+
+    def _mark_started(self, mode, backend="engine"):
+        """Gemeinsame Zeit- und Zustandsfelder beim Start eines Mediums setzen"""
+        self.current_mode = mode
+        self.media_start_time = time.time()
+        self.active_backend = backend
+
+    def elapsed(self):
+        """Sekunden seit Start des aktuellen Mediums"""
+        if self.current_mode == "black" or not self.media_start_time:
+            return 0.0
+        return time.time() - self.media_start_time
+
+    def can_switch(self, min_runtime):
+        """Prüft ob die Mindestlaufzeit des aktuellen Mediums erreicht ist"""
+        return self.current_mode == "black" or self.elapsed() >= min_runtime
+
+
+class MediaRouter:
+    """Wählt pro Medientyp das günstigste verfügbare Backend
+
+    Die Reihenfolge kommt aus MEDIA_BACKENDS, "engine" ist immer verfügbar.
+    supported: zusätzliche Backends, die die Engine bedienen kann (z.B. 'pil'
+    nur mit eigenem Media-Label).
+    """
+    def __init__(self, engine_name, supported=(), preferences=None):
+        capabilities = get_capabilities()
+        self.routes = {}
+        for kind, candidates in (preferences or MEDIA_BACKENDS).items():
+            self.routes[kind] = next((backend for backend in candidates
+                                      if backend == 'engine' or (backend in supported and capabilities.get(backend))),
+                                     'engine')
+        print(f"[MediaRouter] {engine_name}: " + ", ".join(f"{kind} → {backend}" for kind, backend in self.routes.items()))
+
+    def classify(self, path):
+        """Medientyp inkl. 'cue' für kurze WAV-Dateien"""
+        kind = media_type(path)
+        if kind == 'audio' and self.routes.get('cue', 'engine') != self.routes.get('audio', 'engine') \
+                and path.lower().endswith('.wav'):
+            duration = get_probe_index().get_duration(path) or _wav_duration(path)
+            if duration is not None and duration <= AUDIO_CUE_MAX_SECONDS:
+                return 'cue'
+        return kind
+
+    def route(self, path):
+        """Backend-Name für eine Datei ('engine', 'pil', 'pygame')"""
+        return self.routes.get(self.classify(path), 'engine')
+
+
+def _wav_duration(path):
+    """Dauer einer WAV-Datei aus dem Header (ohne Decoder) oder None"""
+    try:
+        with wave.open(path, 'rb') as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except (OSError, wave.Error, ZeroDivisionError):
+        return None
+
+
+def load_still(path, max_size):
+    """Standbild auf max_size skaliert als PhotoImage (nur im tk-Thread aufrufen)"""
+    image = Image.open(path)
+    image.draft('RGB', max_size)  # JPEG: verkleinert direkt beim Dekodieren
+    image = image.convert('RGB')
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    return ImageTk.PhotoImage(image)
+
+
+class PygameCue:
+    """Kurzer Signalton über den pygame-Mixer
+
+    Bietet audio_set_volume()/stop(), damit der AudioCrossfader ihn wie einen
+    VLC-Player ausblenden kann.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.sound = pygame.mixer.Sound(path)
+        self.channel = self.sound.play()
+        if self.channel is None:
+            raise RuntimeError("Kein freier Mixer-Kanal")
+
+    def audio_set_volume(self, volume):
+        self.sound.set_volume(max(0, min(100, volume)) / 100.0)
+
+    def stop(self):
+        self.sound.stop()
+
+    def is_busy(self):
+        return self.channel.get_busy() and self.channel.get_sound() is self.sound
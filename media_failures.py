@@ -0,0 +1,164 @@
+"""
+Fehler-Register für Mediendateien, die nicht abspielbar sind
+Nach mehreren Fehlschlägen wird eine Datei mit exponentiell wachsender Wartezeit gesperrt (Quarantäne)
+"""
+import json
+import os
+import threading
+import time
+
+from config import FAILURE_REGISTRY_FILE, FAILURE_QUARANTINE_AFTER, FAILURE_BACKOFF_BASE, FAILURE_BACKOFF_MAX
+
+_failure_registry_singleton = None
+
+
+class FailureRegistry:
+    def __init__(self, registry_file=FAILURE_REGISTRY_FILE, quarantine_after=FAILURE_QUARANTINE_AFTER,
+                 backoff_base=FAILURE_BACKOFF_BASE, backoff_max=FAILURE_BACKOFF_MAX):
+        self.registry_file = registry_file
+        self.quarantine_after = max(1, quarantine_after)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        # {pfad: {'mtime', 'failures', 'last_error', 'last_failure', 'quarantined_until'}}
+        self._entries = {}
+        self._file_state = None  # (mtime_ns, Größe) der zuletzt gelesenen/geschriebenen Datei
+        with self._lock:
+            self._load()
+
+    @staticmethod
+    def _stat_key(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, quiet=False):
+        """Register aus JSON-Datei laden (Aufrufer hält den Lock)"""
+        if not os.path.exists(self.registry_file):
+            return
+        try:
+            self._file_state = self._stat_key(self.registry_file)
+            with open(self.registry_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            if not quiet:
+                now = time.time()
+                quarantined = sum(1 for entry in self._entries.values() if entry['quarantined_until'] > now)
+                print(f"[MediaFailures] Register geladen: {len(self._entries)} Einträge, {quarantined} in Quarantäne")
+        except Exception as e:
+            print(f"[MediaFailures] Fehler beim Laden von {self.registry_file}: {e}")
+            self._entries = {}
+
+    def _save(self):
+        """Register atomar speichern (Aufrufer hält den Lock)"""
+        try:
+            tmp_file = f"{self.registry_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.registry_file)
+            self._file_state = self._stat_key(self.registry_file)
+        except Exception as e:
+            print(f"[MediaFailures] Fehler beim Speichern: {e}")
+
+    def _refresh(self):
+        """Neu laden falls ein anderer Prozess (GUI bzw. Player-Prozess) die Datei geändert hat
+
+        Aufrufer hält den Lock - jeder Zugriff liest so den Stand beider Prozesse und ein
+        Speichern überschreibt keine fremden Einträge mit einem veralteten Stand.
+        """
+        try:
+            if self._stat_key(self.registry_file) != self._file_state:
+                self._load(quiet=True)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def record_failure(self, path, reason=""):
+        """Fehlgeschlagene Wiedergabe vermerken - ggf. Quarantäne mit Backoff"""
+        mtime = self._mtime(path)
+        now = time.time()
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(path)
+            if entry is None or entry['mtime'] != mtime:
+                # Neue oder inzwischen ersetzte Datei - Zählung neu beginnen
+                entry = {'mtime': mtime, 'failures': 0, 'last_error': "", 'last_failure': 0, 'quarantined_until': 0}
+                self._entries[path] = entry
+
+            entry['failures'] += 1
+            entry['last_error'] = reason
+            entry['last_failure'] = now
+
+            if entry['failures'] >= self.quarantine_after:
+                exponent = entry['failures'] - self.quarantine_after
+                backoff = min(self.backoff_max, self.backoff_base * (2 ** exponent))
+                entry['quarantined_until'] = now + backoff
+                print(f"[MediaFailures] Quarantäne für {os.path.basename(path)}: {backoff:.0f}s "
+                      f"({entry['failures']} Fehler, zuletzt: {reason})")
+            else:
+                print(f"[MediaFailures] Fehler {entry['failures']}/{self.quarantine_after} für "
+                      f"{os.path.basename(path)}: {reason}")
+            self._save()
+
+    def record_success(self, path):
+        """Erfolgreiche Wiedergabe - Eintrag verwerfen"""
+        with self._lock:
+            self._refresh()
+            if self._entries.pop(path, None) is not None:
+                print(f"[MediaFailures] {os.path.basename(path)} wieder abspielbar")
+                self._save()
+
+    def is_quarantined(self, path):
+        """Prüfung ob eine Datei übersprungen werden soll (ein stat auf das Register)"""
+        with self._lock:
+            self._refresh()
+            return self._check_quarantined(path, time.time())
+
+    def _check_quarantined(self, path, now):
+        """Aufrufer hält den Lock und hat _refresh() aufgerufen"""
+        entry = self._entries.get(path)
+        if entry is None or entry['quarantined_until'] <= now:
+            return False
+        if entry['mtime'] != self._mtime(path):
+            # Datei wurde ersetzt - neue Chance
+            del self._entries[path]
+            self._save()
+            return False
+        return True
+
+    def filter_playable(self, media_files):
+        """Liste ohne Dateien in Quarantäne"""
+        with self._lock:
+            self._refresh()
+            now = time.time()
+            return [path for path in media_files if not self._check_quarantined(path, now)]
+
+    def get_quarantined(self):
+        """{pfad: eintrag} aller Dateien, die aktuell in Quarantäne sind"""
+        with self._lock:
+            self._refresh()
+            now = time.time()
+            return {path: dict(entry) for path, entry in self._entries.items()
+                    if entry['quarantined_until'] > now}
+
+    def release(self, path=None):
+        """Quarantäne aufheben - für eine Datei oder (ohne Pfad) für alle"""
+        with self._lock:
+            self._refresh()
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+            self._save()
+
+
+def get_failure_registry():
+    """Gemeinsames Fehler-Register holen (Singleton)"""
+    global _failure_registry_singleton
+    if _failure_registry_singleton is None:
+        _failure_registry_singleton = FailureRegistry()
+    return _failure_registry_singleton
@@ -0,0 +1,166 @@
+"""
+Virtualisierte Checkbox-Liste für große Medienbibliotheken
+Zeichnet nur die sichtbaren Zeilen auf einem Canvas - Kosten unabhängig von der Anzahl der Dateien
+"""
+import os
+import tkinter as tk
+
+
+class VirtualCheckList(tk.Frame):
+    """Scrollbare Liste mit Checkboxen über einem SelectionModel
+
+    Es existieren nur so viele Canvas-Elemente wie Zeilen sichtbar sind; beim
+    Scrollen werden sie mit den Daten der neuen Zeilen beschriftet.
+    command(pfad, ausgewählt) wird nach einem Klick aufgerufen.
+    set_filter() zeigt nur einen Teil der Einträge - die Auswahl ausgeblendeter Einträge bleibt erhalten.
+    """
+    def __init__(self, parent, model, command=None, height=200, row_height=20,
+                 font=('Arial', 9), bg='gray10', fg='white', selectcolor='darkgray'):
+        super().__init__(parent, bg=bg)
+        self.model = model
+        self.command = command
+        self.row_height = row_height
+        self.font = font
+        self.fg = fg
+        self.bg = bg
+        self.selectcolor = selectcolor
+
+        self.first = 0  # Index der obersten sichtbaren Zeile
+        self.marks = {}  # {pfad: (text, farbe)} - abweichende Beschriftung (Quarantäne, Decode-Warnung)
+        self._rows = []  # Pool: [(box_id, check_id, text_id)]
+        self._filtered = None  # Angezeigte Pfade bei aktivem Filter (sonst alle Einträge des Modells)
+        self._filtered_index = {}
+        self._drawn_revision = None  # model.revision beim letzten redraw()
+
+        self.canvas = tk.Canvas(self, bg=bg, height=height, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))  # Windows/macOS
+        self.canvas.bind("<Button-4>", lambda e: self.scroll(-1))  # Linux/X11
+        self.canvas.bind("<Button-5>", lambda e: self.scroll(1))
+
+        model.add_listener(self._on_model_change)
+
+    # Beschriftung
+    def set_mark(self, path, text=None, color=None):
+        """Zeile abweichend beschriften - ohne Text/Farbe wird die Markierung entfernt"""
+        if text is None and color is None:
+            if self.marks.pop(path, None) is None:
+                return
+        elif self.marks.get(path) == (text, color):
+            return
+        else:
+            self.marks[path] = (text, color)
+        self._redraw_if_visible(path)
+
+    def forget(self, paths):
+        """Markierungen entfernter Dateien verwerfen"""
+        for path in paths:
+            self.marks.pop(path, None)
+
+    def clear_marks(self):
+        self.marks.clear()
+        self.redraw()
+
+    # Filter
+    def set_filter(self, paths, keep_position=False):
+        """Nur diese Pfade anzeigen (Reihenfolge wie übergeben) - None zeigt wieder alle"""
+        if paths is None and self._filtered is None:
+            return
+        self._filtered = None if paths is None else list(paths)
+        self._filtered_index = {} if paths is None else {path: i for i, path in enumerate(self._filtered)}
+        if not keep_position:
+            self.first = 0
+        self.redraw()
+
+    def visible_items(self):
+        """Angezeigte Pfade bei aktivem Filter, sonst None"""
+        return None if self._filtered is None else list(self._filtered)
+
+    @property
+    def items(self):
+        return self.model.items if self._filtered is None else self._filtered
+
+    def _index(self, path):
+        return self.model.index(path) if self._filtered is None else self._filtered_index.get(path)
+
+    # Zeichnen
+    def _visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height + 1)
+
+    def redraw(self):
+        """Sichtbare Zeilen neu beschriften und Scrollbar aktualisieren"""
+        rows = self._visible_rows()
+        items = self.items
+        total = len(items)
+        self._drawn_revision = self.model.revision
+        self.first = max(0, min(self.first, total - rows + 1))
+
+        while len(self._rows) < rows:
+            y = len(self._rows) * self.row_height
+            box = self.canvas.create_rectangle(4, y + 4, 4 + self.row_height - 8, y + self.row_height - 4,
+                                               outline=self.fg)
+            check = self.canvas.create_text(self.row_height / 2, y + self.row_height / 2, text="✓",
+                                            fill=self.fg, font=self.font)
+            text = self.canvas.create_text(self.row_height + 2, y + self.row_height / 2, anchor='w',
+                                           fill=self.fg, font=self.font)
+            self._rows.append((box, check, text))
+
+        for slot, (box, check, text) in enumerate(self._rows):
+            index = self.first + slot
+            if slot >= rows or index >= total:
+                for item in (box, check, text):
+                    self.canvas.itemconfigure(item, state='hidden')
+                continue
+            self._draw_row(slot, items[index])
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _draw_row(self, slot, path):
+        box, check, text = self._rows[slot]
+        selected = self.model.is_selected(path)
+        label, color = self.marks.get(path, (None, None))
+        self.canvas.itemconfigure(box, state='normal', fill=self.selectcolor if selected else self.bg)
+        self.canvas.itemconfigure(check, state='normal' if selected else 'hidden')
+        self.canvas.itemconfigure(text, state='normal', text=label or os.path.basename(path), fill=color or self.fg)
+
+    def _redraw_if_visible(self, path):
+        index = self._index(path)
+        if index is not None and self.first <= index < self.first + min(len(self._rows), self._visible_rows()):
+            self._draw_row(index - self.first, path)
+
+    def _on_model_change(self, changed, selection_changed):
+        if changed is None or self.model.revision != self._drawn_revision:
+            self.redraw()  # Einträge verschoben - sichtbare Zeilen neu beschriften
+        else:
+            for path in changed:
+                self._redraw_if_visible(path)
+
+    # Bedienung
+    def scroll(self, rows):
+        self.first += rows
+        self.redraw()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.first = int(float(amount) * len(self.items))
+        elif action == 'scroll':
+            step = self._visible_rows() - 1 if unit == 'pages' else 1
+            self.first += int(amount) * max(1, step)
+        self.redraw()
+
+    def _on_click(self, event):
+        index = self.first + int(event.y // self.row_height)
+        items = self.items
+        if 0 <= index < len(items):
+            path = items[index]
+            selected = self.model.toggle(path)
+            if self.command:
+                self.command(path, selected)
@@ -3,6 +3,7 @@ Media-Player mit separatem Vollbild-Fenster für Video/Bild-Anzeige
 Unterstützt VLC, externe Player und tkinter Fallback
 """
 import os
+import random
 import threading
 import time
 import tkinter as tk
@@ -11,6 +12,10 @@ import subprocess
 import platform
 import sys
 
+from media_probe import get_probe_index
+from media_catalog import media_type
+from media_engine import MediaEngine, MediaRouter
+
 # VLC-Integration versuchen
 try:
     import vlc
@@ -36,12 +41,15 @@ except ImportError:
     PYGAME_AVAILABLE = False
     print("[MediaPlayer] pygame nicht verfügbar - Audio-Funktionen limitiert")
 
-class MediaPlayer:
+class MediaPlayer(MediaEngine):
+    engine_name = "legacy"
+    
     def __init__(self):
         global VLC_AVAILABLE
         
         self.current_mode = "black"  # "black", "video", "image"
         self.current_file = None
+        self.active_backend = "engine"
         self.vlc_instance = None
         self.vlc_player = None
         self.is_playing = False
@@ -50,7 +58,7 @@ class MediaPlayer:
         self.media_window = None
         self.media_label = None
         self.video_process = None
-        self.video_start_time = 0
+        self.media_start_time = 0  # Start des aktuellen Videos/Bildes (Mindestlaufzeit, Zeit-Fallback)
         self.video_duration = 0
         
         # Audio-System
@@ -63,10 +71,6 @@ class MediaPlayer:
         self.audio_stop_event = threading.Event()
         self.audio_start_time = 0  # Start-Zeit für Mindestlaufzeit
         
-        # Mindestlaufzeiten für Stabilität
-        self.image_start_time = 0
-        self.video_forced_start_time = 0  # Für Mindest-Video-Laufzeit
-        
         # Immer tkinter-Fenster erstellen
         print("[MediaPlayer] Initialisiere separates Media-Fenster...")
         self._init_fallback_window()
@@ -85,6 +89,9 @@ class MediaPlayer:
                 print(f"[MediaPlayer] VLC-Initialisierung fehlgeschlagen: {e}")
                 VLC_AVAILABLE = False
         
+        # Bilder per PIL statt VLC (siehe MEDIA_BACKENDS)
+        self.router = MediaRouter(self.engine_name, supported=('pil',))
+        
         print(f"[MediaPlayer] Bereit - VLC verfügbar: {VLC_AVAILABLE}")
         
     def _init_fallback_window(self):
@@ -260,10 +267,12 @@ class MediaPlayer:
             if self.video_process.poll() is not None:
                 return True  # Prozess beendet
         
-        # Fallback: Zeit-basierte Schätzung (sehr grob)
-        if self.video_start_time > 0:
-            elapsed = time.time() - self.video_start_time
-            # Annahme: Video ist nach 5 Minuten "wahrscheinlich" beendet
+        # Fallback: Zeit-basierte Prüfung mit Dauer aus dem Medien-Index
+        if self.media_start_time > 0:
+            elapsed = time.time() - self.media_start_time
+            if self.video_duration > 0:
+                return elapsed > self.video_duration + 1.0
+            # Dauer unbekannt: Video ist nach 5 Minuten "wahrscheinlich" beendet
             if elapsed > 300:  # 5 Minuten
                 return True
         
@@ -279,10 +288,9 @@ class MediaPlayer:
         if self.current_mode == "video" and self.current_file == path:
             return  # Bereits das richtige Video am Laufen
             
-        self.current_mode = "video"
         self.current_file = path
-        self.video_start_time = time.time()  # Startzeit speichern
-        self.video_forced_start_time = time.time()  # Mindestlaufzeit-Timer
+        self._mark_started("video")  # Startzeit für Mindestlaufzeit und Zeit-Fallback
+        self.video_duration = get_probe_index().get_duration(path) or 0
         
         print(f"[MediaPlayer] Starte Video: {os.path.basename(path)}")
         
@@ -440,9 +448,9 @@ class MediaPlayer:
         if self.current_mode == "image" and self.current_file == path:
             return  # Bereits das richtige Bild angezeigt
             
-        self.current_mode = "image"
         self.current_file = path
-        self.image_start_time = time.time()  # Mindestlaufzeit-Timer
+        backend = self.router.route(path)
+        self._mark_started("image", backend)  # Mindestlaufzeit-Timer
         
         # Video stoppen falls läuft
         self._stop_video()
@@ -454,8 +462,8 @@ class MediaPlayer:
             except:
                 pass
         
-        if VLC_AVAILABLE and self.vlc_player:
-            # VLC für Bild-Anzeige
+        if backend == "engine" and VLC_AVAILABLE and self.vlc_player:
+            # VLC für Bild-Anzeige (nur ohne PIL)
             try:
                 media = self.vlc_instance.media_new(path)
                 self.vlc_player.set_media(media)
@@ -466,7 +474,8 @@ class MediaPlayer:
             except Exception as e:
                 print(f"[MediaPlayer] VLC Bild-Fehler: {e}")
         
-        # Fallback: tkinter für Bilder
+        # PIL/tkinter für Bilder
+        self.active_backend = "pil"
         self._fallback_image(path)
     
     def _fallback_image(self, path):
@@ -569,6 +578,24 @@ class MediaPlayer:
         
         self.is_playing = False
 
+    # MediaEngine-Schnittstelle
+    def play(self, media_files, shuffle=False, options=None):
+        """Erstes Medium der Liste zeigen - die Legacy-Engine kennt keine Playlists und Optionen"""
+        media_files = list(media_files or [])
+        if not media_files:
+            self.show_black()
+            return False
+        path = random.choice(media_files) if shuffle else media_files[0]
+        if media_type(path) == 'image':
+            self.show_image(path)
+        else:
+            self.play_video(path)
+        return self.current_file == path and self.current_mode != "black"
+
+    def stop(self):
+        """Video stoppen - die Anzeige bleibt stehen"""
+        self._stop_video()
+
     def cleanup(self):
         """Ressourcen freigeben"""
         print("[MediaPlayer] Cleanup...")
@@ -797,22 +824,14 @@ class MediaPlayer:
         if self.current_mode != "video":
             return True
         
-        if self.video_forced_start_time == 0:
-            return True  # Kein erzwungener Start
-        
-        elapsed = time.time() - self.video_forced_start_time
-        return elapsed >= min_runtime
+        return self.can_switch(min_runtime)
     
     def can_switch_from_image(self, min_runtime=2.0):
         """Prüft ob genug Zeit vergangen ist um vom Bild zu wechseln"""
         if self.current_mode != "image":
             return True
         
-        if self.image_start_time == 0:
-            return True  # Kein Start-Zeit gesetzt
-        
-        elapsed = time.time() - self.image_start_time
-        return elapsed >= min_runtime
+        return self.can_switch(min_runtime)
     
     def can_switch_audio(self, min_runtime=5.0):
         """Prüft ob Audio-Track genug Zeit hatte zum Abspielen"""
@@ -0,0 +1,554 @@
+"""
+mpv-Backend für die Media Station
+Ein langlebiger mpv-Prozess (--idle) wird über seinen JSON-IPC-Socket gesteuert - kein Prozessstart pro Video
+"""
+import json
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import threading
+import time
+
+from config import MPV_SOCKET_PATH, MPV_EXTRA_ARGS, MPV_START_TIMEOUT
+from media_catalog import media_type
+from media_player_vlc import VLCMediaPlayer
+
+# Eigenschaften, deren Änderungen als Ereignis an den tk-Thread gehen
+EVENT_PROPERTIES = {'playlist-pos', 'idle-active'}
+OBSERVED_PROPERTIES = ('time-pos', 'duration', 'playlist-pos', 'idle-active', 'pause')
+
+POLL_INTERVAL_MS = 200
+LOAD_TIMEOUT = 3.0  # Sekunden bis eine Datei ohne file-loaded als defekt gilt
+
+
+class MPVError(Exception):
+    """Fehlerantwort von mpv auf ein IPC-Kommando"""
+
+
+class MPVProcess:
+    """Ein mpv-Prozess im Leerlauf-Modus plus JSON-IPC-Verbindung
+
+    Ein Lese-Thread verteilt Antworten an wartende Kommandos, merkt sich
+    beobachtete Eigenschaften (time-pos, duration, ...) und reicht Ereignisse
+    (end-file, file-loaded, ...) über eine Queue an den tk-Thread weiter.
+    Fehler-Antworten auf Kommandos ohne wait kommen als 'command-failed' in dieselbe Queue.
+    Bietet audio_set_volume()/stop(), damit der AudioCrossfader mpv wie einen
+    VLC-Player ausblenden kann.
+    """
+    def __init__(self, window_id, socket_path=MPV_SOCKET_PATH, extra_args=MPV_EXTRA_ARGS):
+        self.window_id = window_id
+        self.socket_path = socket_path
+        self.extra_args = list(extra_args)
+        self.process = None
+        self.properties = {}
+        self.events = queue.Queue()
+
+        self._sock = None
+        self._lock = threading.Lock()
+        self._pending = {}  # {request_id: {'event', 'reply'}}
+        self._unawaited = {}  # {request_id: kommando} - Antwort wird nur bei Fehler gemeldet
+        self._request_id = 0
+        self._reader = None
+
+    # Prozess
+    def start(self):
+        """mpv starten und mit dem IPC-Socket verbinden"""
+        binary = shutil.which('mpv')
+        if binary is None:
+            print("[MPV-Player] mpv nicht gefunden - sudo apt install mpv")
+            return False
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)  # Übrig von einem abgestürzten Lauf
+
+        args = [
+            binary, '--idle=yes', f'--input-ipc-server={self.socket_path}',
+            '--no-terminal', '--really-quiet', '--no-osc', '--osd-level=0',
+            '--no-input-default-bindings', '--force-window=yes', '--keep-open=no',
+            '--prefetch-playlist=yes',
+        ]
+        if self.window_id:
+            args.append(f'--wid={self.window_id}')
+        args.extend(self.extra_args)
+
+        start = time.monotonic()
+        self.process = subprocess.Popen(args, stdin=subprocess.DEVNULL)
+
+        # Auf den Socket warten
+        while time.monotonic() - start < MPV_START_TIMEOUT:
+            if self.process.poll() is not None:
+                print(f"[MPV-Player] mpv beim Start beendet (Exit-Code {self.process.returncode})")
+                return False
+            try:
+                self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._sock.connect(self.socket_path)
+                break
+            except OSError:
+                self._sock.close()
+                self._sock = None
+                time.sleep(0.05)
+
+        if self._sock is None:
+            print("[MPV-Player] IPC-Socket nicht erreichbar - beende mpv")
+            self.quit()
+            return False
+
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+        for index, name in enumerate(OBSERVED_PROPERTIES, start=1):
+            self.command('observe_property', index, name)
+
+        print(f"[MPV-Player] mpv bereit (PID {self.process.pid}, {(time.monotonic() - start) * 1000:.0f}ms)")
+        return True
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None and self._sock is not None
+
+    def quit(self):
+        """mpv beenden"""
+        try:
+            if self._sock:
+                self.command('quit', wait=False)
+        except OSError:
+            pass
+        if self.process:
+            try:
+                self.process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    # IPC
+    def command(self, *args, wait=True, timeout=2.0):
+        """Kommando senden - mit wait=True auf die Antwort warten und data zurückgeben
+
+        Ohne wait wird die request_id zurückgegeben (für 'command-failed'-Ereignisse).
+        Ein einzelnes dict-Argument wird als Kommando mit benannten Argumenten gesendet.
+        """
+        named = len(args) == 1 and isinstance(args[0], dict)
+        name = args[0]['name'] if named else args[0]
+        with self._lock:
+            if self._sock is None:
+                raise MPVError("keine Verbindung zu mpv")
+            self._request_id += 1
+            request_id = self._request_id
+            waiter = {'event': threading.Event(), 'reply': None} if wait else None
+            if waiter:
+                self._pending[request_id] = waiter
+            else:
+                self._unawaited[request_id] = name
+            payload = json.dumps({'command': args[0] if named else list(args), 'request_id': request_id}) + '\n'
+            self._sock.sendall(payload.encode('utf-8'))
+
+        if not wait:
+            return request_id
+        if not waiter['event'].wait(timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise MPVError(f"Zeitüberschreitung bei {name}")
+
+        reply = waiter['reply']
+        if reply.get('error') != 'success':
+            raise MPVError(f"{name}: {reply.get('error')}")
+        return reply.get('data')
+
+    def set_property(self, name, value, wait=True):
+        return self.command('set_property', name, value, wait=wait)
+
+    def loadfile(self, path, mode='replace', options=None, wait=True):
+        """Datei laden - options (z.B. start, end) gelten nur für diese Datei"""
+        if not options:
+            return self.command('loadfile', path, mode, wait=wait)
+        # Benannt, da sich die Position des options-Arguments zwischen mpv-Versionen unterscheidet
+        return self.command({'name': 'loadfile', 'url': path, 'flags': mode,
+                             'options': ','.join(f'{key}={value}' for key, value in options.items())}, wait=wait)
+
+    def _read_loop(self):
+        """Lese-Thread: JSON-Zeilen von mpv verteilen"""
+        buffer = b''
+        while True:
+            try:
+                chunk = self._sock.recv(65536) if self._sock else b''
+            except OSError:
+                chunk = b''
+            if not chunk:
+                break
+            buffer += chunk
+            while b'\n' in buffer:
+                line, buffer = buffer.split(b'\n', 1)
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                self._dispatch(message)
+
+        self.events.put({'event': 'connection-lost'})
+
+    def _dispatch(self, message):
+        event = message.get('event')
+        if event is None:
+            request_id = message.get('request_id')
+            with self._lock:
+                waiter = self._pending.pop(request_id, None)
+                name = self._unawaited.pop(request_id, None)
+            if waiter:
+                waiter['reply'] = message
+                waiter['event'].set()
+            elif name is not None and message.get('error') != 'success':
+                self.events.put({'event': 'command-failed', 'request_id': request_id,
+                                 'command': name, 'error': message.get('error')})
+            return
+
+        if event == 'property-change':
+            self.properties[message['name']] = message.get('data')
+            if message['name'] not in EVENT_PROPERTIES:
+                return  # time-pos etc. nur merken, nicht melden
+        self.events.put(message)
+
+    # Schnittstelle wie VLC-Player (für AudioCrossfader und Resume)
+    def audio_set_volume(self, volume):
+        try:
+            self.set_property('volume', int(volume), wait=False)
+        except (MPVError, OSError):
+            pass
+
+    def stop(self):
+        try:
+            self.command('stop', wait=False)
+        except (MPVError, OSError):
+            pass
+
+    def get_time(self):
+        position = self.properties.get('time-pos')
+        return int(position * 1000) if position is not None else -1
+
+    def get_length(self):
+        duration = self.properties.get('duration')
+        return int(duration * 1000) if duration else 0
+
+
+class MPVMediaPlayer(VLCMediaPlayer):
+    """VLCMediaPlayer-API mit mpv als Wiedergabe-Backend
+
+    Fenster, Bildanzeige (Slideshow), Resume und Fehler-Register kommen aus
+    VLCMediaPlayer. Die Playlist bleibt in Python, mpv bekommt aber immer
+    den nächsten Eintrag angehängt (loadfile append) und öffnet ihn vorab -
+    der Wechsel passiert ohne Neu-Start und fast lückenlos in mpv selbst.
+    """
+    engine_name = "mpv"
+
+    def __init__(self):
+        self.mpv = None
+        self._poll_scheduled = False
+        self._next_index = 0  # Playlist-Index des in mpv angehängten Eintrags
+        self._loading = None  # (datei, frist, start_ms) bis file-loaded oder end-file eintrifft
+        self._load_request = None  # request_id des laufenden loadfile - Fehler-Antwort beendet das Laden
+        self._failed_loads = 0  # Fehlgeschlagene Ladeversuche in Folge
+        super().__init__()
+
+    # Backend
+    def _init_backend(self):
+        """mpv-Prozess starten und an das video_frame binden"""
+        self.media_window.update()  # GUI aktualisieren für korrekte IDs
+        self.video_window_id = self.video_frame.winfo_id()
+        self._start_mpv()
+
+    def _start_mpv(self):
+        self.mpv = MPVProcess(self.video_window_id)
+        if not self.mpv.start():
+            self.mpv = None
+            return False
+        if not self._poll_scheduled:
+            self._poll_scheduled = True
+            self.media_window.after(POLL_INTERVAL_MS, self._poll)
+        return True
+
+    def _backend_available(self):
+        if self.mpv is not None and not self.mpv.is_alive():
+            print("[MPV-Player] mpv-Prozess beendet - starte neu")
+            self.mpv.quit()
+            self._start_mpv()
+        return self.mpv is not None
+
+    def _can_reuse_loop(self, media_files):
+        return False  # mpv öffnet Dateien ohnehin ohne Prozessstart
+
+    def _get_position(self):
+        return self.mpv.get_time(), self.mpv.get_length()
+
+    # Wiedergabe
+    def _play_current_media(self):
+        """Aktuelles Media laden, nächstes für lückenlosen Wechsel anhängen"""
+        if not self.current_playlist or self.current_index >= len(self.current_playlist):
+            self.show_black()
+            return False
+        if not self._backend_available():
+            return False
+
+        self._media_failed = False
+        self._success_recorded = False
+        self._progress_start_ms = self._pending_start_ms
+        self._stop_routed()
+        self._loading = None
+        self.crossfader.cancel(self.mpv)
+        media_file = self.current_playlist[self.current_index]
+
+        # Bilder/Signaltöne über ein leichteres Backend - mpv dann anhalten
+        if self.router.route(media_file) != "engine":
+            if self.is_playing:
+                self.mpv.stop()
+            routed = self._play_routed(media_file)
+            if routed is not None:
+                return routed
+        media_name = os.path.basename(media_file)
+        start_ms = self._pending_start_ms
+        self._pending_start_ms = 0
+
+        try:
+            self._drain_events()  # Alte Ereignisse verwerfen
+            self.loop_mode = self.loop_single_video and len(self.current_playlist) == 1
+            # Ohne Warten auf Antworten - Fehler kommen als 'command-failed' in check_playback()
+            self.mpv.set_property('volume', 100, wait=False)
+            self.mpv.set_property('loop-file', 'inf' if self.loop_mode else 'no', wait=False)
+            self.mpv.set_property('image-display-duration', int(self.min_display_time), wait=False)
+            options, start_ms = self._file_options(media_file, start_ms)
+            self._progress_start_ms = start_ms
+            play_path = self.hot_cache.resolve(media_file)
+            self.prefetcher.report_start(media_file, cached=play_path != media_file)
+            self._load_request = self.mpv.loadfile(play_path, 'replace', options, wait=False)
+            if len(self.current_playlist) > 1:
+                self._append_next()
+        except MPVError as e:
+            print(f"[MPV-Player] Fehler beim Abspielen von {media_name}: {e}")
+            self._record_failure(media_file, str(e))
+            return False
+
+        # Ergebnis (file-loaded / end-file) kommt über die Ereignis-Queue in check_playback()
+        self._loading = (media_file, time.monotonic() + LOAD_TIMEOUT, start_ms)
+        self.is_playing = True
+        self.active_backend = "engine"
+        return True
+
+    def _on_loaded(self):
+        """file-loaded: Datei läuft - Wiedergabe melden"""
+        media_file, _, start_ms = self._loading
+        self._loading = None
+        self._failed_loads = 0
+
+        if self.media_label:
+            self.media_label.pack_forget()  # mpv zeichnet Videos und Bilder selbst
+
+        self._mark_started("playing")
+        self.prefetcher.prefetch_playlist(self.current_playlist, self.current_index)
+        self.hot_cache.record_play(media_file)
+        print(f"[MPV-Player] ✓ Spiele: {os.path.basename(media_file)}{' (Schleife)' if self.loop_mode else ''}"
+              f"{f' ab {start_ms / 1000.0:.1f}s' if start_ms > 0 else ''}")
+
+    def _on_load_failed(self, reason):
+        """Datei nicht geladen: Fehler merken und mit dem nächsten Eintrag weitermachen"""
+        media_file = self._loading[0]
+        self._loading = None
+        self._media_failed = True
+        self._failed_loads += 1
+        self._record_failure(media_file, reason)
+        if len(self.current_playlist) > 1 and self._failed_loads < len(self.current_playlist):
+            self.next_media()
+            return
+        print("[MPV-Player] Keine ladbare Datei in der Playlist")
+        self._failed_loads = 0
+        self.mpv.stop()
+        self.is_playing = False
+        self.current_mode = "black"
+
+    def _append_next(self):
+        """Nächsten Playlist-Eintrag in mpv anhängen (wird vorab geöffnet)"""
+        next_index = (self.current_index + 1) % len(self.current_playlist)
+        for _ in range(len(self.current_playlist)):
+            if not self.failures.is_quarantined(self.current_playlist[next_index]):
+                break
+            next_index = (next_index + 1) % len(self.current_playlist)
+        if self.router.route(self.current_playlist[next_index]) != "engine":
+            return  # Läuft nicht über mpv - Wechsel nach idle-active per next_media()
+        next_file = self.current_playlist[next_index]
+        self.mpv.loadfile(self.hot_cache.resolve(next_file), 'append', self._file_options(next_file)[0], wait=False)
+        self._next_index = next_index
+
+    def _file_options(self, media_file, start_ms=0):
+        """Datei-Optionen für loadfile aus Resume-Position und Playlist-Optionen - (options, start_ms)"""
+        start, stop, duration = self._entry_times(media_file)
+        start_ms = start_ms or int((start or 0) * 1000)
+        options = {}
+        if start_ms > 0:
+            options['start'] = f'{start_ms / 1000.0:.3f}'
+        if stop:
+            options['end'] = f'{stop:.3f}'
+        if duration and media_type(media_file) == 'image':
+            options['image-display-duration'] = f'{duration:g}'
+        return options, start_ms
+
+    def _drain_events(self):
+        try:
+            while True:
+                self.mpv.events.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _poll(self):
+        """Zyklisch im tk-Loop: mpv-Ereignisse verarbeiten"""
+        try:
+            if self.mpv is not None:
+                self.check_playback()
+        except Exception as e:
+            print(f"[MPV-Player] Fehler bei Ereignis-Verarbeitung: {e}")
+        if self.media_window is not None:
+            self.media_window.after(POLL_INTERVAL_MS, self._poll)
+
+    def check_playback(self):
+        """Playlist-Stand mit mpv abgleichen (Wechsel macht mpv selbst)"""
+        if self.mpv is None:
+            return
+        if self.is_playing and self.active_backend != "engine":
+            if self._routed_finished():
+                self._confirm_progress(finished=True)
+                if len(self.current_playlist) > 1:
+                    self.next_media()
+        elif self._loading and time.monotonic() > self._loading[1]:
+            self._on_load_failed("mpv: Datei nicht geladen (Zeitüberschreitung)")
+        elif self.is_playing and not self._loading:
+            self._confirm_progress()
+        while True:
+            try:
+                event = self.mpv.events.get_nowait()
+            except queue.Empty:
+                return
+
+            kind = event.get('event')
+            if kind == 'connection-lost':
+                if not self._backend_available():
+                    return
+                if self.is_playing:
+                    self._play_current_media()
+                return
+
+            if kind == 'command-failed':
+                if self._loading and event['request_id'] == self._load_request:
+                    self._on_load_failed(f"mpv: {event['command']}: {event['error']}")
+                    return  # next_media() hat neue Ereignisse angestoßen
+                print(f"[MPV-Player] {event['command']} fehlgeschlagen: {event['error']}")
+                continue
+
+            if not self.is_playing or self.active_backend != "engine":
+                continue
+
+            if self._loading:
+                if kind == 'file-loaded':
+                    self._on_loaded()
+                elif kind == 'end-file' and event.get('reason') == 'error':
+                    self._on_load_failed(f"mpv: {event.get('file_error', 'Fehler beim Öffnen')}")
+                    return  # next_media() hat neue Ereignisse angestoßen
+                continue
+
+            if kind == 'end-file' and event.get('reason') == 'error':
+                self._record_failure(self.current_playlist[self.current_index], "mpv: Fehler während Wiedergabe")
+            elif kind == 'property-change' and event['name'] == 'playlist-pos' and event.get('data') == 1:
+                # mpv ist zum angehängten Eintrag gewechselt - alten entfernen, nächsten anhängen
+                self._confirm_progress(finished=True)  # Vorheriger Eintrag lief bis zum Ende
+                self._success_recorded = False
+                self.current_index = self._next_index
+                self._progress_start_ms = self._file_options(self.current_playlist[self.current_index])[1]
+                self.media_start_time = time.time()
+                self.prefetcher.prefetch_playlist(self.current_playlist, self.current_index)
+                self.hot_cache.record_play(self.current_playlist[self.current_index])
+                try:
+                    self.mpv.command('playlist-remove', 0, wait=False)
+                    self._append_next()
+                except MPVError as e:
+                    print(f"[MPV-Player] Fehler beim Anhängen: {e}")
+                print(f"[MPV-Player] Nächstes: {os.path.basename(self.current_playlist[self.current_index])}")
+            elif kind == 'property-change' and event['name'] == 'idle-active' and event.get('data'):
+                # Playlist in mpv leer gelaufen (z.B. Fehler beim nächsten Eintrag)
+                if len(self.current_playlist) > 1:
+                    self.next_media()
+                else:
+                    self.is_playing = False
+
+    def stop(self):
+        """Wiedergabe stoppen - mpv-Prozess läuft im Leerlauf weiter"""
+        self._loading = None
+        if self._end_routed():
+            return
+        if self.mpv is not None and self.is_playing:
+            self._remember_position()
+            self.crossfader.cancel(self.mpv)
+            self.mpv.stop()
+            print("[MPV-Player] Wiedergabe gestoppt")
+        self.is_playing = False
+        self.current_mode = "black"
+
+    def fade_out(self):
+        """Ausblenden über den AudioCrossfader, danach stoppen"""
+        self._loading = None
+        if self._end_routed(fade=True):
+            return
+        if self.mpv is None or not self.is_playing or self.fade_time <= 0:
+            self.stop()
+            return
+
+        self._remember_position()
+        player = self.mpv
+        self.is_playing = False
+        self.current_mode = "black"
+
+        def finish():
+            if not self.is_playing:
+                player.stop()
+                player.audio_set_volume(100)
+
+        self.crossfader.fade_out(player, self.fade_time, on_done=finish)
+        print(f"[MPV-Player] Wiedergabe wird ausgeblendet ({self.fade_time}s)")
+
+    def show_black(self):
+        if self.is_playing:
+            self.stop()
+        super().show_black()
+
+    def show_image_frame(self, photo, name, position=""):
+        if self.is_playing:
+            self.stop()
+        super().show_image_frame(photo, name, position)
+
+    def pause(self):
+        if self.mpv is None or not self.is_playing:
+            return
+        try:
+            self.mpv.command('cycle', 'pause')
+            paused = bool(self.mpv.command('get_property', 'pause'))
+            self.current_mode = "paused" if paused else "playing"
+            print(f"[MPV-Player] {'Pausiert' if paused else 'Fortgesetzt'}")
+        except MPVError as e:
+            print(f"[MPV-Player] Fehler beim Pausieren: {e}")
+
+    def is_media_finished(self):
+        if self.mpv is None or not self.is_playing:
+            return True
+        if self.active_backend != "engine":
+            return self._routed_finished()
+        return bool(self.mpv.properties.get('idle-active'))
+
+    def cleanup(self):
+        """mpv beenden und Media-Fenster schließen"""
+        self.stop()
+        if self.mpv is not None:
+            self.mpv.quit()
+            self.mpv = None
+        if self.media_window:
+            self.media_window.destroy()
+            self.media_window = None
+        print("[MPV-Player] Cleanup abgeschlossen")
@@ -2,6 +2,7 @@
 VLC-basierter Media Player für alle Medientypen (Video, Audio, Bilder)
 Vereinfachte und robuste Lösung mit einer einheitlichen Engine
 """
+import functools
 import os
 import threading
 import time
@@ -9,6 +10,17 @@ import tkinter as tk
 from tkinter import Label
 import platform
 import random
+import math
+from config import AUDIO_FADE_TIME, AUDIO_FADE_TICK_RATE, RESUME_TIMEOUT, VIDEO_LOOP_SINGLE, VIDEO_LOOP_CHECK_TIME
+from config import WATCHDOG_ENABLED, WATCHDOG_INTERVAL, WATCHDOG_OPEN_TIMEOUT, WATCHDOG_STALL_TIMEOUT
+from config import FAILURE_SUCCESS_AFTER
+from media_probe import get_probe_index
+from media_failures import get_failure_registry
+from playback_telemetry import get_playback_telemetry
+from media_engine import MediaEngine, MediaRouter, PygameCue, load_still
+from media_catalog import media_type
+from media_prefetch import get_media_prefetcher
+from media_cache import get_hot_media_cache
 
 # VLC-Integration
 try:
@@ -21,17 +33,32 @@ except ImportError:
 # Singleton-Pattern für VLC-Instanz um mehrfache Initialisierung zu vermeiden
 _vlc_instance_singleton = None
 _vlc_player_singleton = None
+_crossfader_singleton = None
 
-class VLCMediaPlayer:
-    def __init__(self):
+
+def _with_playback_lock(method):
+    """Methode unter dem Wiedergabe-Lock ausführen - tk-Thread und Watchdog-Thread teilen sich den Player"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._playback_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class VLCMediaPlayer(MediaEngine):
+    engine_name = "vlc"
+    
+    def __init__(self, window_id=None):
         self.current_mode = "black"  # "black", "playing", "paused"
         self.current_playlist = []
         self.current_index = 0
         self.is_playing = False
         self.vlc_instance = None
         self.vlc_player = None
+        # Playlist-Index und Player-Wechsel nur unter diesem Lock (Watchdog baut den Player im eigenen Thread neu auf)
+        self._playback_lock = threading.RLock()
         self.media_window = None
         self.media_label = None
+        self.video_window_id = window_id  # Fenster-ID des video_frame (für Neuaufbau ohne tk)
         
         # Instanz-Kontrolle
         self.is_initializing = False
@@ -41,19 +68,62 @@ class VLCMediaPlayer:
         self.media_start_time = 0
         self.min_display_time = 3.0  # Standard: 3 Sekunden
         
+        # Leichtere Backends für Bilder/Signaltöne (PIL, pygame) - siehe MEDIA_BACKENDS
+        self.router = None
+        self.active_backend = "engine"
+        self._cue = None
+        
+        # Audio-Ausblendung beim Verlassen des Sensor-Bereichs
+        self.fade_time = AUDIO_FADE_TIME
+        self.crossfader = get_crossfader()
+        
+        # Fortsetzen nach Rückkehr eines Besuchers (nur im Speicher)
+        self.resume_timeout = RESUME_TIMEOUT
+        self.resume_positions = {}  # {pfad: (position_ms, gespeichert_um)}
+        self.resume_playlist = None  # {'files', 'order', 'index', 'saved_at'}
+        self._pending_start_ms = 0
+        self.media_options = {}  # {pfad: {'duration', 'start', 'stop'}} aus der geladenen Playlist (Sekunden)
+        
+        # Nahtlose Schleife für Einzelvideos (Decoder bleibt aktiv)
+        self.loop_single_video = VIDEO_LOOP_SINGLE
+        self.loop_check_time = VIDEO_LOOP_CHECK_TIME
+        self.loop_mode = False
+        self._last_loop_check = 0.0
+        
+        # Nicht abspielbare Dateien (Quarantäne, dateibasiert)
+        self.failures = get_failure_registry()
+        self._media_failed = False
+        self._success_recorded = False  # Aktuelles Medium lief lange genug - Fehler-Eintrag verworfen
+        self._progress_start_ms = 0  # Startposition des aktuellen Mediums (Fortsetzen)
+        
+        # Wiedergabe-Qualität (verlorene Frames etc.) pro Datei und Stunde
+        self.telemetry = get_playback_telemetry()
+        
+        # Nächste Playlist-Einträge vorab in den Page-Cache lesen (langsame SD-Karte)
+        self.prefetcher = get_media_prefetcher()
+        self.hot_cache = get_hot_media_cache()  # Optional: häufige Medien aus dem RAM abspielen
+        
+        # Hängt libvlc (Opening/Buffering, Zeit steht), wird die Instanz neu aufgebaut
+        self.watchdog = None
+        
         # Media-Fenster erstellen
         if not self.is_initializing:
             self.is_initializing = True
-            self._init_media_window()
-            
-            # VLC initialisieren
-            if VLC_AVAILABLE:
-                self._init_vlc()
+            if window_id is None:
+                self._init_media_window()
             else:
-                print("[VLC-MediaPlayer] VLC fehlt - nur schwarzes Bild möglich")
+                # Ohne eigenes Fenster (Player-Prozess) - rendert in das Fenster des Elternprozesses
+                print(f"[VLC-MediaPlayer] Ohne eigenes Fenster, Ausgabe in Fenster-ID {window_id}")
+            self.router = MediaRouter(self.engine_name, supported=self._router_backends())
+            
+            # Wiedergabe-Backend initialisieren (hier: libvlc im eigenen Prozess)
+            self._init_backend()
             
             self.initialization_complete = True
             self.is_initializing = False
+            
+            if VLC_AVAILABLE and self.vlc_player and WATCHDOG_ENABLED:
+                self.watchdog = VLCStallWatchdog(self)
         else:
             print("[VLC-MediaPlayer] Initialisierung bereits im Gange - überspringe")
     
@@ -93,6 +163,21 @@ class VLCMediaPlayer:
         except Exception as e:
             print(f"[VLC-MediaPlayer] Fehler beim Media-Fenster: {e}")
     
+    def _init_backend(self):
+        """Wiedergabe-Backend starten - von anderen Engines überschrieben"""
+        if VLC_AVAILABLE:
+            self._init_vlc()
+        else:
+            print("[VLC-MediaPlayer] VLC fehlt - nur schwarzes Bild möglich")
+    
+    def _router_backends(self):
+        """Zusätzliche Backends, die diese Engine bedienen kann (PIL nur mit eigenem Media-Label)"""
+        return ('pil', 'pygame') if self.media_label else ('pygame',)
+    
+    def _backend_available(self):
+        """Prüft ob das Wiedergabe-Backend benutzbar ist"""
+        return VLC_AVAILABLE and self.vlc_player is not None
+    
     def _init_vlc(self):
         """VLC-Instanz initialisieren mit Singleton-Pattern"""
         global _vlc_instance_singleton, _vlc_player_singleton
@@ -104,42 +189,21 @@ class VLCMediaPlayer:
                 self.vlc_instance = _vlc_instance_singleton
                 self.vlc_player = _vlc_player_singleton
             else:
-                # VLC-Optionen wie in der funktionierenden media_player.py
                 print("[VLC-MediaPlayer] Erstelle neue VLC-Instanz mit bewährten Parametern...")
-                
-                # Exakt die gleichen Parameter wie in der funktionierenden Version
-                self.vlc_instance = vlc.Instance(
-                    '--no-video-title-show',
-                    '--no-osd', 
-                    '--quiet'
-                )
-                
-                if self.vlc_instance is None:
-                    print("[VLC-MediaPlayer] VLC-Instance mit Parametern fehlgeschlagen - versuche ohne Parameter")
-                    self.vlc_instance = vlc.Instance()
-                
-                if self.vlc_instance is None:
-                    raise Exception("VLC-Instance konnte nicht erstellt werden")
-                
-                print("[VLC-MediaPlayer] VLC-Instance erfolgreich erstellt")
-                self.vlc_player = self.vlc_instance.media_player_new()
-                
-                if self.vlc_player is None:
-                    raise Exception("VLC Media Player konnte nicht erstellt werden")
+                self.vlc_instance, self.vlc_player = self._create_vlc_pair()
                 
                 # Als Singleton speichern
                 _vlc_instance_singleton = self.vlc_instance
                 _vlc_player_singleton = self.vlc_player
                 print("[VLC-MediaPlayer] VLC-Instanz als Singleton gespeichert")
             
-            # VLC an unser video_frame binden
-            self.media_window.update()  # GUI aktualisieren für korrekte IDs
-            if platform.system() == "Windows":
-                self.vlc_player.set_hwnd(self.video_frame.winfo_id())
-            else:
-                self.vlc_player.set_xwindow(self.video_frame.winfo_id())
+            # VLC an unser video_frame binden - Fenster-ID für den Watchdog merken
+            if self.media_window is not None:
+                self.media_window.update()  # GUI aktualisieren für korrekte IDs
+                self.video_window_id = self.video_frame.winfo_id()
+            self._bind_video_output(self.vlc_player)
             
-            print(f"[VLC-MediaPlayer] VLC erfolgreich initialisiert und an Frame gebunden (ID: {self.video_frame.winfo_id()})")
+            print(f"[VLC-MediaPlayer] VLC erfolgreich initialisiert und an Frame gebunden (ID: {self.video_window_id})")
             
             # Test-Ausgabe für VLC-Funktionalität
             try:
@@ -159,10 +223,45 @@ class VLCMediaPlayer:
             global VLC_AVAILABLE
             VLC_AVAILABLE = False
     
+    @staticmethod
+    def _create_vlc_pair():
+        """Neue VLC-Instanz mit Player erstellen (Parameter wie in der funktionierenden media_player.py)"""
+        instance = vlc.Instance(
+            '--no-video-title-show',
+            '--no-osd', 
+            '--quiet'
+        )
+        
+        if instance is None:
+            print("[VLC-MediaPlayer] VLC-Instance mit Parametern fehlgeschlagen - versuche ohne Parameter")
+            instance = vlc.Instance()
+        
+        if instance is None:
+            raise Exception("VLC-Instance konnte nicht erstellt werden")
+        
+        print("[VLC-MediaPlayer] VLC-Instance erfolgreich erstellt")
+        player = instance.media_player_new()
+        
+        if player is None:
+            raise Exception("VLC Media Player konnte nicht erstellt werden")
+        return instance, player
+    
+    def _bind_video_output(self, player):
+        """Player an das video_frame binden (nur libvlc, kein tk-Aufruf)"""
+        if not self.video_window_id:
+            return
+        if platform.system() == "Windows":
+            player.set_hwnd(self.video_window_id)
+        else:
+            player.set_xwindow(self.video_window_id)
+    
+    @_with_playback_lock
     def show_black(self):
         """Schwarzes Bild anzeigen"""
         try:
+            self._stop_routed()
             if self.vlc_player and self.is_playing:
+                self.telemetry.untrack()
                 self.vlc_player.stop()
                 self.is_playing = False
             
@@ -170,30 +269,70 @@ class VLCMediaPlayer:
             if self.media_label:
                 self.media_label.pack(fill='both', expand=True)  # Label wieder sichtbar machen
                 self.media_label.config(
+                    image='',
                     text="Media Player bereit\n\nSchwarzens Bild\nKein Media aktiv",
                     bg='black',
                     fg='gray'
                 )
+                self.media_label.image = None
             
             print("[VLC-MediaPlayer] Schwarzes Bild angezeigt")
             
         except Exception as e:
             print(f"[VLC-MediaPlayer] Fehler bei schwarzem Bild: {e}")
     
-    def play_media_list(self, media_files, shuffle=False):
-        """Medienliste abspielen (Videos, Bilder, Audio gemischt)"""
+    @_with_playback_lock
+    def show_image_frame(self, photo, name, position=""):
+        """Vorab dekodiertes Bild (PhotoImage) direkt im Media-Fenster anzeigen"""
+        try:
+            self._stop_routed()
+            if self.vlc_player and self.is_playing:
+                self.vlc_player.stop()
+                self.is_playing = False
+            
+            self.current_mode = "image"
+            self.active_backend = "pil"
+            if self.media_label:
+                self.media_label.config(image=photo, text="", bg='black')
+                self.media_label.image = photo  # Referenz behalten
+                self.media_label.pack(fill='both', expand=True)
+            
+            print(f"[VLC-MediaPlayer] Zeige Bild: {name} {f'({position})' if position else ''}")
+            
+        except Exception as e:
+            print(f"[VLC-MediaPlayer] Fehler bei Bildanzeige: {e}")
+    
+    @_with_playback_lock
+    def play_media_list(self, media_files, shuffle=False, options=None):
+        """Medienliste abspielen (Videos, Bilder, Audio gemischt)
+
+        options: {pfad: {'duration', 'start', 'stop'}} pro Eintrag, z.B. aus einer Playlist.
+        """
         print(f"[VLC-MediaPlayer] play_media_list aufgerufen mit {len(media_files) if media_files else 0} Dateien")
-        print(f"[VLC-MediaPlayer] VLC verfügbar: {VLC_AVAILABLE}")
+        print(f"[VLC-MediaPlayer] Backend verfügbar: {self._backend_available()}")
         print(f"[VLC-MediaPlayer] Aktueller Status - is_playing: {self.is_playing}")
         
+        self.media_options = dict(options or {})
+        
+        # Dateien in Quarantäne überspringen
+        if media_files:
+            playable = self.failures.filter_playable(media_files)
+            if len(playable) < len(media_files):
+                print(f"[VLC-MediaPlayer] {len(media_files) - len(playable)} Datei(en) in Quarantäne übersprungen")
+            media_files = playable
+        
+        # Gleiches Einzelvideo noch geladen - ohne Neu-Öffnen weiterspielen
+        if self._can_reuse_loop(media_files):
+            return self._resume_loop()
+        
         # Instanz-Kontrolle: Stoppe laufende Wiedergabe zuerst
         if self.is_playing:
             print("[VLC-MediaPlayer] Stoppe aktuelle Wiedergabe vor Start einer neuen")
             self.stop()
             time.sleep(0.2)  # Kurz warten bis VLC gestoppt ist
         
-        if not VLC_AVAILABLE:
-            print("[VLC-MediaPlayer] VLC nicht verfügbar - zeige schwarzes Bild")
+        if not self._backend_available():
+            print("[VLC-MediaPlayer] Backend nicht verfügbar - zeige schwarzes Bild")
             self.show_black()
             return False
         
@@ -210,16 +349,31 @@ class VLCMediaPlayer:
             return False
         
         try:
-            # Playlist erstellen
-            self.current_playlist = media_files.copy()
-            if shuffle:
-                random.shuffle(self.current_playlist)
-                print(f"[VLC-MediaPlayer] Playlist gemischt")
+            # Playlist erstellen - bei Rückkehr gespeicherte Reihenfolge fortsetzen
+            resume = self._get_resume_state(media_files)
+            if resume:
+                self.current_playlist = list(resume['order'])
+                self.current_index = resume['index']
+                print(f"[VLC-MediaPlayer] Setze Playlist fort bei Position {self.current_index + 1}/{len(self.current_playlist)}")
+            else:
+                self.current_playlist = media_files.copy()
+                if shuffle:
+                    random.shuffle(self.current_playlist)
+                    print(f"[VLC-MediaPlayer] Playlist gemischt")
+                self.current_index = 0
             
             print(f"[VLC-MediaPlayer] Aktuelle Playlist: {[os.path.basename(f) for f in self.current_playlist]}")
             
-            self.current_index = 0
+            self._pending_start_ms = self._get_resume_position(self.current_playlist[self.current_index])
             result = self._play_current_media()
+            
+            # Defekte Datei: einmal durch die restliche Playlist weiterversuchen
+            attempts = 1
+            while not result and self._media_failed and attempts < len(self.current_playlist):
+                self.current_index = (self.current_index + 1) % len(self.current_playlist)
+                result = self._play_current_media()
+                attempts += 1
+            
             print(f"[VLC-MediaPlayer] _play_current_media Resultat: {result}")
             return result
             
@@ -229,6 +383,7 @@ class VLCMediaPlayer:
             traceback.print_exc()
             return False
     
+    @_with_playback_lock
     def play_single_media(self, media_file):
         """Einzelne Mediendatei abspielen"""
         print(f"[VLC-MediaPlayer] play_single_media aufgerufen: {os.path.basename(media_file) if media_file else 'None'}")
@@ -239,8 +394,8 @@ class VLCMediaPlayer:
             self.stop()
             time.sleep(0.1)
         
-        if not VLC_AVAILABLE or not os.path.exists(media_file):
-            print(f"[VLC-MediaPlayer] VLC nicht verfügbar oder Datei nicht gefunden: {media_file}")
+        if not self._backend_available() or not os.path.exists(media_file):
+            print(f"[VLC-MediaPlayer] Backend nicht verfügbar oder Datei nicht gefunden: {media_file}")
             self.show_black()
             return False
         
@@ -251,12 +406,14 @@ class VLCMediaPlayer:
         try:
             self.current_playlist = [media_file]
             self.current_index = 0
+            self.media_options = {}
             return self._play_current_media()
             
         except Exception as e:
             print(f"[VLC-MediaPlayer] Fehler beim Abspielen von {media_file}: {e}")
             return False
     
+    @_with_playback_lock
     def _play_current_media(self):
         """Aktuelles Media aus Playlist abspielen"""
         if not self.current_playlist or self.current_index >= len(self.current_playlist):
@@ -270,48 +427,77 @@ class VLCMediaPlayer:
             return False
         
         # Stoppe aktuelle Wiedergabe sicher
+        self._stop_routed()
         if self.is_playing:
             try:
                 print("[VLC-MediaPlayer] Stoppe aktuelle Wiedergabe vor neuem Medium")
+                self.telemetry.untrack()
                 self.vlc_player.stop()
                 time.sleep(0.1)  # Kurz warten
                 self.is_playing = False
             except Exception as e:
                 print(f"[VLC-MediaPlayer] Fehler beim Stoppen: {e}")
         
+        self._media_failed = False
+        self._success_recorded = False
+        self._progress_start_ms = self._pending_start_ms
+        
+        # Bilder/Signaltöne über ein leichteres Backend, falls konfiguriert und verfügbar
+        routed = self._play_routed(self.current_playlist[self.current_index])
+        if routed is not None:
+            return routed
+        
+        # Evtl. laufendes Ausblenden abbrechen - der Player wird neu benutzt
+        self.crossfader.cancel(self.vlc_player)
+        self.vlc_player.audio_set_volume(100)
+        
         try:
             media_file = self.current_playlist[self.current_index]
             media_name = os.path.basename(media_file)
-            media_ext = os.path.splitext(media_file)[1].lower()
             
             print(f"[VLC-MediaPlayer] Versuche abzuspielen: {media_name}")
             
             # VLC-Media erstellen und abspielen
-            media = self.vlc_instance.media_new(media_file)
+            play_path = self.hot_cache.resolve(media_file)
+            self.prefetcher.report_start(media_file, cached=play_path != media_file)
+            media = self.vlc_instance.media_new(play_path)
             if media is None:
                 print(f"[VLC-MediaPlayer] Media-Objekt konnte nicht erstellt werden für: {media_name}")
+                self._record_failure(media_file, "Media-Objekt konnte nicht erstellt werden")
                 return False
             
             self.vlc_player.set_media(media)
             
+            # Gespeicherte Position (sonst Startzeit der Playlist) direkt beim Öffnen anfahren
+            start, stop, duration = self._entry_times(media_file)
+            start_ms = self._pending_start_ms or int((start or 0) * 1000)
+            self._pending_start_ms = 0
+            self._progress_start_ms = start_ms
+            if start_ms > 0:
+                media.add_option(f'start-time={start_ms / 1000.0:.3f}')
+                print(f"[VLC-MediaPlayer] Starte bei {start_ms / 1000.0:.1f}s: {media_name}")
+            if stop:
+                media.add_option(f'stop-time={stop:.3f}')
+            
             # Spezielle Optionen für Bildtypen
-            if media_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.gif']:
+            self.loop_mode = False
+            if media_type(media_file) == 'image':
                 # Bilder länger anzeigen
-                media.add_option(f'image-duration={int(self.min_display_time)}')
+                media.add_option(f'image-duration={int(duration or self.min_display_time)}')
                 if self.media_label:
                     self.media_label.config(
                         text=f"Zeigt Bild:\n{media_name}\n\n({self.current_index + 1}/{len(self.current_playlist)})",
-                        bg='black', fg='cyan'
+                        image='', bg='black', fg='cyan'
                     )
                     self.media_label.pack(fill='both', expand=True)  # Label sichtbar
-                print(f"[VLC-MediaPlayer] Zeige Bild: {media_name} ({self.min_display_time}s)")
+                print(f"[VLC-MediaPlayer] Zeige Bild: {media_name} ({duration or self.min_display_time}s)")
                 
-            elif media_ext in ['.mp3', '.wav', '.ogg', '.m4a']:
+            elif media_type(media_file) == 'audio':
                 # Audio-Datei mit Label-Info
                 if self.media_label:
                     self.media_label.config(
                         text=f"Spielt Audio:\n{media_name}\n\n({self.current_index + 1}/{len(self.current_playlist)})",
-                        bg='black', fg='yellow'
+                        image='', bg='black', fg='yellow'
                     )
                     self.media_label.pack(fill='both', expand=True)  # Label sichtbar
                 print(f"[VLC-MediaPlayer] Spiele Audio: {media_name}")
@@ -320,7 +506,13 @@ class VLCMediaPlayer:
                 # Video-Datei - Label verstecken damit VLC das Video zeigen kann
                 if self.media_label:
                     self.media_label.pack_forget()  # Label verstecken für Video
-                print(f"[VLC-MediaPlayer] Spiele Video: {media_name}")
+                
+                # Einzelvideo: VLC wiederholt intern, ohne Media neu zu öffnen
+                if self.loop_single_video and len(self.current_playlist) == 1:
+                    media.add_option('input-repeat=65535')
+                    self.loop_mode = True
+                    self._last_loop_check = time.monotonic()
+                print(f"[VLC-MediaPlayer] Spiele Video: {media_name}{' (Schleife)' if self.loop_mode else ''}")
             
             # Abspielen starten
             print(f"[VLC-MediaPlayer] Versuche VLC-Play für: {media_name}")
@@ -329,8 +521,8 @@ class VLCMediaPlayer:
             
             if result == 0:  # VLC-Erfolg
                 self.is_playing = True
-                self.current_mode = "playing"
-                self.media_start_time = time.time()
+                self._mark_started("playing")
+                self.prefetcher.prefetch_playlist(self.current_playlist, self.current_index)
                 print(f"[VLC-MediaPlayer] ✓ Wiedergabe erfolgreich gestartet: {media_name}")
                 
                 # Kurz warten und Status prüfen
@@ -338,26 +530,275 @@ class VLCMediaPlayer:
                 state = self.vlc_player.get_state()
                 print(f"[VLC-MediaPlayer] VLC-Player-Status nach Start: {state}")
                 
+                if state == vlc.State.Error:
+                    print(f"[VLC-MediaPlayer] ✗ Media nicht abspielbar: {media_name}")
+                    self.is_playing = False
+                    self._record_failure(media_file, "VLC-Status Error nach Start")
+                    return False
+                self.hot_cache.record_play(media_file)
+                self.telemetry.track(media_file, media)
+                
+                # Falls start-time ignoriert wurde: Position nachträglich setzen
+                if start_ms > 0 and 0 <= self.vlc_player.get_time() < start_ms - 1000:
+                    self.vlc_player.set_time(int(start_ms))
+                
                 return True
             else:
                 print(f"[VLC-MediaPlayer] ✗ VLC-Play fehlgeschlagen für: {media_name} (Resultat: {result})")
                 # Zusätzliche Diagnostik
                 state = self.vlc_player.get_state()
                 print(f"[VLC-MediaPlayer] VLC-Player-Status bei Fehler: {state}")
+                self._record_failure(media_file, f"VLC-Play-Resultat {result}, Status {state}")
                 return False
                 
         except Exception as e:
             print(f"[VLC-MediaPlayer] Fehler beim Abspielen: {e}")
+            if self.current_index < len(self.current_playlist):
+                self._record_failure(self.current_playlist[self.current_index], str(e))
             return False
     
+    def _play_routed(self, media_file):
+        """Medium über PIL/pygame wiedergeben - None falls das Haupt-Backend zuständig ist"""
+        backend = self.router.route(media_file)
+        if backend == "engine":
+            return None
+        
+        media_name = os.path.basename(media_file)
+        position = f"{self.current_index + 1}/{len(self.current_playlist)}"
+        try:
+            if backend == "pil":
+                window = self.media_window
+                photo = load_still(media_file, (window.winfo_screenwidth(), window.winfo_screenheight()))
+                self.media_label.config(image=photo, text="", bg='black')
+                self.media_label.image = photo  # Referenz behalten
+                self.media_label.pack(fill='both', expand=True)
+                print(f"[VLC-MediaPlayer] Zeige Bild (PIL): {media_name} ({position}, {self._display_time(media_file)}s)")
+            else:
+                self._cue = PygameCue(media_file)
+                if self.media_label:
+                    self.media_label.config(text=f"Spielt Signal:\n{media_name}\n\n({position})",
+                                            image='', bg='black', fg='yellow')
+                    self.media_label.pack(fill='both', expand=True)
+                print(f"[VLC-MediaPlayer] Spiele Signal (pygame): {media_name}")
+        except Exception as e:
+            print(f"[VLC-MediaPlayer] {backend} kann {media_name} nicht wiedergeben ({e}) - nutze Haupt-Backend")
+            self._cue = None
+            return None
+        
+        self.is_playing = True
+        self._mark_started("playing", backend)
+        self.prefetcher.prefetch_playlist(self.current_playlist, self.current_index)
+        return True
+    
+    def _routed_finished(self):
+        """Ende eines Mediums, das über PIL/pygame läuft"""
+        if self.active_backend == "pil":
+            return self.elapsed() >= self._display_time(self.current_file)
+        if self.active_backend == "pygame":
+            return self._cue is None or not self._cue.is_busy()
+        return False
+    
+    def _entry_times(self, media_file):
+        """(Start, Ende, Anzeigedauer) in Sekunden aus den Playlist-Optionen - None falls nicht gesetzt"""
+        options = self.media_options.get(media_file) or {}
+        start, stop, duration = options.get('start'), options.get('stop'), options.get('duration')
+        if duration and stop is None and media_type(media_file) != 'image':
+            stop = (start or 0) + duration  # Dauer bei Videos/Audio: nach so vielen Sekunden weiter
+        return start, stop, duration
+    
+    def _display_time(self, media_file):
+        """Anzeigedauer eines Bildes: Playlist-Option oder Mindest-Anzeigezeit"""
+        return self._entry_times(media_file)[2] or self.min_display_time
+    
+    def _stop_routed(self, fade=False):
+        """Signalton beenden und auf das Haupt-Backend zurückschalten"""
+        cue, self._cue = self._cue, None
+        self.active_backend = "engine"
+        if cue is None:
+            return
+        self.crossfader.cancel(cue)
+        if fade and self.fade_time > 0:
+            self.crossfader.fade_out(cue, self.fade_time, on_done=cue.stop)
+        else:
+            cue.stop()
+    
+    def _end_routed(self, fade=False):
+        """Wiedergabe über PIL/pygame beenden - False falls das Haupt-Backend spielt"""
+        if not self.is_playing or self.active_backend == "engine":
+            return False
+        self._remember_position()
+        self._stop_routed(fade)
+        self.is_playing = False
+        self.current_mode = "black"
+        return True
+    
+    @_with_playback_lock
+    def _confirm_progress(self, finished=False):
+        """Fehler-Eintrag verwerfen, sobald das Medium wirklich läuft oder normal zu Ende ist
+
+        Nicht schon beim Öffnen: eine Datei, die startet und dann abbricht, soll weiter
+        Fehlschläge sammeln und in Quarantäne kommen.
+        """
+        if self._success_recorded or not self.is_playing:
+            return
+        media_file = self.current_file
+        if media_file is None:
+            return
+        if not finished:
+            if self.elapsed() < FAILURE_SUCCESS_AFTER:
+                return
+            if self.active_backend == "engine" and media_type(media_file) != 'image':
+                position, length = self._get_position()
+                required = FAILURE_SUCCESS_AFTER * 1000
+                if length > 0:
+                    required = min(required, (length - self._progress_start_ms) * 0.9)  # Kurze Clips (Schleife)
+                if position < 0 or position - self._progress_start_ms < required:
+                    return
+        self._success_recorded = True
+        self.failures.record_success(media_file)
+    
+    def _record_failure(self, media_file, reason):
+        """Fehlschlag im Register vermerken (führt ggf. zur Quarantäne)"""
+        self._media_failed = True
+        self.failures.record_failure(media_file, reason)
+    
+    @_with_playback_lock
+    def restore_playback(self, playlist, index, position_ms=0, options=None):
+        """Playlist in fester Reihenfolge ab Eintrag/Position starten (z.B. nach Neustart des Player-Prozesses)"""
+        if options is not None:
+            self.media_options = dict(options)
+        target = playlist[index] if 0 <= index < len(playlist) else None
+        playable = self.failures.filter_playable(playlist)
+        if not playable or not self._backend_available():
+            return False
+        
+        self.current_playlist = playable
+        if target in playable:
+            self.current_index = playable.index(target)
+            self._pending_start_ms = max(0, int(position_ms))
+        else:
+            # Eintrag inzwischen gesperrt - mit dem nächsten von vorn beginnen
+            self.current_index = min(max(0, index), len(playable) - 1)
+            self._pending_start_ms = 0
+        print(f"[VLC-MediaPlayer] Stelle Wiedergabe wieder her: {os.path.basename(self.current_playlist[self.current_index])} "
+              f"bei {self._pending_start_ms / 1000.0:.1f}s")
+        return self._play_current_media()
+    
+    def _can_reuse_loop(self, media_files):
+        """Prüft ob das Einzelvideo der Schleife noch im Player geladen ist"""
+        if not self.loop_mode or not self.loop_single_video or not self.vlc_player or not media_files:
+            return False
+        if len(media_files) != 1 or self.current_playlist != list(media_files):
+            return False
+        
+        try:
+            state = self.vlc_player.get_state()
+            return state in (vlc.State.Playing, vlc.State.Paused, vlc.State.Stopped)
+        except Exception:
+            return False
+    
+    @_with_playback_lock
+    def _resume_loop(self):
+        """Geladenes Einzelvideo fortsetzen statt media_new/set_media/play"""
+        try:
+            media_file = self.current_playlist[0]
+            self.crossfader.cancel(self.vlc_player)
+            self.vlc_player.audio_set_volume(100)
+            
+            state = self.vlc_player.get_state()
+            if state == vlc.State.Paused:
+                self.vlc_player.set_pause(0)
+            elif state == vlc.State.Stopped:
+                # Media ist noch gesetzt - Position als Option mitgeben (gilt beim nächsten play,
+                # ohne im tk-Thread auf Playing zu warten); 0 überschreibt eine frühere Position
+                start_ms = self._get_resume_position(media_file)
+                media = self.vlc_player.get_media()
+                if media is not None:
+                    media.add_option(f'start-time={start_ms / 1000.0:.3f}')
+                if self.vlc_player.play() != 0:
+                    return False
+            
+            if self.media_label:
+                self.media_label.pack_forget()
+            
+            self.is_playing = True
+            self._mark_started("playing")
+            self._last_loop_check = time.monotonic()
+            self.hot_cache.record_play(media_file)
+            self.telemetry.track(media_file, self.vlc_player.get_media())
+            print(f"[VLC-MediaPlayer] Schleife fortgesetzt ohne Neu-Öffnen: {os.path.basename(media_file)}")
+            return True
+            
+        except Exception as e:
+            print(f"[VLC-MediaPlayer] Fehler beim Fortsetzen der Schleife: {e}")
+            return False
+    
+    @_with_playback_lock
+    def check_playback(self):
+        """Zyklisch aus dem tk-Loop: Playlist weiterschalten und Schleife überwachen"""
+        if not self.vlc_player or not self.is_playing:
+            return
+        
+        if self.active_backend != "engine":
+            if self._routed_finished():
+                self._confirm_progress(finished=True)
+                if len(self.current_playlist) > 1:
+                    self.next_media()
+            return
+        
+        try:
+            state = self.vlc_player.get_state()
+            self._confirm_progress(finished=state == vlc.State.Ended)
+            
+            if self.loop_mode:
+                # Sicherheitsnetz falls input-repeat doch endet: zurück auf Anfang
+                now = time.monotonic()
+                if state == vlc.State.Ended or (state == vlc.State.Stopped and now - self._last_loop_check >= self.loop_check_time):
+                    print("[VLC-MediaPlayer] Schleife beendet - springe an den Anfang")
+                    self.vlc_player.stop()
+                    self.vlc_player.play()
+                    self._last_loop_check = now
+                return
+            
+            if state == vlc.State.Error:
+                # Datei bricht während der Wiedergabe ab (z.B. defekter Stream)
+                media_file = self.current_playlist[self.current_index]
+                self._record_failure(media_file, "VLC-Status Error während Wiedergabe")
+                if len(self.current_playlist) > 1:
+                    self.next_media()
+                else:
+                    self.show_black()
+                return
+            
+            if state == vlc.State.Ended and len(self.current_playlist) > 1:
+                print("[VLC-MediaPlayer] Media beendet - nächstes wird geladen")
+                self.next_media()
+                
+        except Exception as e:
+            print(f"[VLC-MediaPlayer] Fehler bei Wiedergabe-Prüfung: {e}")
+    
+    def set_loop_single_video(self, enabled):
+        """Nahtlose Schleife für Einzelvideos ein-/ausschalten"""
+        self.loop_single_video = bool(enabled)
+        print(f"[VLC-MediaPlayer] Einzelvideo-Schleife: {self.loop_single_video}")
+    
+    @_with_playback_lock
     def next_media(self):
         """Nächstes Media in der Playlist"""
         if not self.current_playlist:
             return False
         
-        self.current_index = (self.current_index + 1) % len(self.current_playlist)
-        return self._play_current_media()
+        # Inzwischen gesperrte Dateien überspringen
+        for _ in range(len(self.current_playlist)):
+            self.current_index = (self.current_index + 1) % len(self.current_playlist)
+            if not self.failures.is_quarantined(self.current_playlist[self.current_index]):
+                return self._play_current_media()
+        
+        print("[VLC-MediaPlayer] Alle Medien der Playlist in Quarantäne")
+        self.show_black()
+        return False
     
+    @_with_playback_lock
     def previous_media(self):
         """Vorheriges Media in der Playlist"""
         if not self.current_playlist:
@@ -366,12 +807,18 @@ class VLCMediaPlayer:
         self.current_index = (self.current_index - 1) % len(self.current_playlist)
         return self._play_current_media()
     
+    @_with_playback_lock
     def stop(self):
         """Wiedergabe stoppen"""
         try:
             print("[VLC-MediaPlayer] Stoppe Wiedergabe...")
             
-            if self.vlc_player and self.is_playing:
+            if self._end_routed():
+                print("[VLC-MediaPlayer] Wiedergabe erfolgreich gestoppt")
+            elif self.vlc_player and self.is_playing:
+                self._remember_position()
+                self.telemetry.untrack()
+                
                 # VLC-Player stoppen
                 self.vlc_player.stop()
                 
@@ -393,6 +840,107 @@ class VLCMediaPlayer:
             self.is_playing = False
             self.current_mode = "black"
     
+    @_with_playback_lock
+    def fade_out(self):
+        """Audio ausblenden und danach stoppen, ohne den tk-Loop zu blockieren"""
+        if self._end_routed(fade=True):
+            return
+        if not self.vlc_player or not self.is_playing or self.fade_time <= 0:
+            self.stop()
+            return
+        
+        try:
+            self._remember_position()
+            self.telemetry.untrack()
+            player = self.vlc_player
+            self.is_playing = False
+            self.current_mode = "black"
+            
+            def finish():
+                # Nur stoppen wenn nicht inzwischen neu gestartet wurde
+                if not self.is_playing:
+                    player.stop()
+                    player.audio_set_volume(100)
+            
+            self.crossfader.fade_out(player, self.fade_time, on_done=finish)
+            print(f"[VLC-MediaPlayer] Wiedergabe wird ausgeblendet ({self.fade_time}s)")
+            
+        except Exception as e:
+            print(f"[VLC-MediaPlayer] Fehler beim Ausblenden: {e}")
+            self.stop()
+    
+    def _remember_position(self):
+        """Position und Playlist-Reihenfolge für eine spätere Rückkehr merken"""
+        if not self.current_playlist or self.current_index >= len(self.current_playlist):
+            return
+        
+        try:
+            now = time.monotonic()
+            current_file = self.current_playlist[self.current_index]
+            if media_type(current_file) == 'image':
+                return  # Bildvorschau ist keine Sensor-Wiedergabe
+            
+            position, length = self._get_position() if self.active_backend == "engine" else (0, 0)
+            
+            if length > 0 and 0 < position < length - 1000:
+                self.resume_positions[current_file] = (position, now)
+            else:
+                # Bild, Stream oder (fast) zu Ende gespielt - von vorn beginnen
+                self.resume_positions.pop(current_file, None)
+            
+            self.resume_playlist = {
+                'files': frozenset(self.current_playlist),
+                'order': list(self.current_playlist),
+                'index': self.current_index,
+                'saved_at': now,
+            }
+        except Exception as e:
+            print(f"[VLC-MediaPlayer] Fehler beim Merken der Position: {e}")
+    
+    def _get_position(self):
+        """(Position, Länge) des aktuellen Mediums in ms"""
+        return self.vlc_player.get_time(), self.vlc_player.get_length()
+    
+    def _get_resume_state(self, media_files):
+        """Gespeicherte Playlist zurückgeben falls gleiche Auswahl und nicht abgelaufen"""
+        resume = self.resume_playlist
+        if not resume:
+            return None
+        
+        if time.monotonic() - resume['saved_at'] > self.resume_timeout:
+            self.resume_playlist = None
+            return None
+        
+        if resume['files'] != frozenset(media_files) or resume['index'] >= len(resume['order']):
+            return None
+        return resume
+    
+    def _get_resume_position(self, media_file):
+        """Gespeicherte Position (ms) einer Datei - abgelaufene Einträge werden entfernt"""
+        now = time.monotonic()
+        for path, (_, saved_at) in list(self.resume_positions.items()):
+            if now - saved_at > self.resume_timeout:
+                del self.resume_positions[path]
+        
+        entry = self.resume_positions.get(media_file)
+        return entry[0] if entry else 0
+    
+    def clear_resume_positions(self):
+        """Alle gespeicherten Positionen verwerfen"""
+        self.resume_positions.clear()
+        self.resume_playlist = None
+    
+    def set_resume_timeout(self, seconds):
+        """Zeitfenster für das Fortsetzen nach Rückkehr setzen"""
+        self.resume_timeout = max(0.0, float(seconds))
+        print(f"[VLC-MediaPlayer] Fortsetzen innerhalb von {self.resume_timeout}s")
+    
+    def set_fade_time(self, seconds):
+        """Ausblendzeit beim Beenden der Sensor-Wiedergabe setzen"""
+        self.fade_time = max(0.0, float(seconds))
+        print(f"[VLC-MediaPlayer] Fade-Zeit: {self.fade_time}s")
+    
+    @_with_playback_lock
     def pause(self):
         """Wiedergabe pausieren/fortsetzen"""
         try:
@@ -409,6 +957,8 @@ class VLCMediaPlayer:
         """Prüft, ob aktuelles Media beendet ist"""
         if not self.vlc_player or not self.is_playing:
             return True
+        if self.active_backend != "engine":
+            return self._routed_finished()
         
         try:
             state = self.vlc_player.get_state()
@@ -445,19 +995,49 @@ class VLCMediaPlayer:
         
         try:
             current_file = self.current_playlist[self.current_index]
-            return {
+            info = {
                 'file': current_file,
                 'name': os.path.basename(current_file),
                 'index': self.current_index + 1,
                 'total': len(self.current_playlist),
                 'playing': self.is_playing,
-                'mode': self.current_mode
+                'mode': self.current_mode,
+                'backend': self.active_backend
             }
+
+            # Metadaten aus dem Medien-Index (falls bereits analysiert)
+            probe = get_probe_index().get(current_file)
+            if probe and not probe['error']:
+                info.update({
+                    'duration': probe['duration_ms'] / 1000.0,
+                    'video_codec': probe['video_codec'],
+                    'audio_codec': probe['audio_codec'],
+                    'resolution': (probe['width'], probe['height']),
+                    'frame_rate': probe['frame_rate'],
+                    'bitrate': probe['bitrate'],
+                })
+            
+            # Wiedergabe-Qualität: letztes Messintervall und Summen der Datei
+            info['telemetry'] = self.telemetry.get_current()
+            info['telemetry_totals'] = self.telemetry.get_file_totals(current_file)
+            info['prefetch'] = self.prefetcher.get_stats()
+            return info
             
         except Exception as e:
             print(f"[VLC-MediaPlayer] Fehler bei Media-Info: {e}")
             return None
     
+    # MediaEngine-Schnittstelle
+    @property
+    def current_file(self):
+        if self.current_playlist and self.current_index < len(self.current_playlist):
+            return self.current_playlist[self.current_index]
+        return None
+    
+    def play(self, media_files, shuffle=False, options=None):
+        """Medienliste als Endlosschleife starten (siehe play_media_list)"""
+        return self.play_media_list(media_files, shuffle=shuffle, options=options)
+    
     def set_min_display_time(self, seconds):
         """Mindest-Anzeigezeit für Bilder setzen"""
         self.min_display_time = max(1.0, seconds)
@@ -474,10 +1054,106 @@ class VLCMediaPlayer:
         except Exception as e:
             print(f"[VLC-MediaPlayer] Fehler beim Vollbild-Wechsel: {e}")
     
+    def recover_from_stall(self, position_ms, reason):
+        """VLC-Instanz und Player neu aufbauen und Wiedergabe fortsetzen
+        
+        Läuft im Watchdog-Thread und benutzt nur libvlc-Aufrufe. Das neue Paar wird
+        ohne Lock aufgebaut; umgeschaltet wird unter dem Wiedergabe-Lock und nur, wenn
+        der tk-Thread inzwischen nichts anderes gestartet oder gestoppt hat. Die hängende
+        Instanz wird in einem eigenen Thread abgebaut, damit ein blockierendes
+        stop()/release() den Neustart nicht aufhält.
+        """
+        global _vlc_instance_singleton, _vlc_player_singleton
+        
+        with self._playback_lock:
+            if not self.is_playing or not self.current_playlist:
+                return False
+            
+            start = time.monotonic()
+            playlist = self.current_playlist
+            index = self.current_index
+            media_file = playlist[index]
+            print(f"[VLC-MediaPlayer] Watchdog: {reason} bei {os.path.basename(media_file)} - baue VLC neu auf")
+            self.failures.record_failure(media_file, reason)
+            
+            # Datei inzwischen gesperrt: mit dem nächsten abspielbaren Medium weitermachen
+            target_index = index
+            if self.failures.is_quarantined(media_file):
+                for _ in range(len(playlist) - 1):
+                    target_index = (target_index + 1) % len(playlist)
+                    if not self.failures.is_quarantined(playlist[target_index]):
+                        break
+                if playlist[target_index] != media_file:
+                    media_file = playlist[target_index]
+                    position_ms = 0
+            
+            old_instance, old_player = self.vlc_instance, self.vlc_player
+            started_at = self.media_start_time
+            loop_mode = self.loop_mode
+        
+        try:
+            new_instance, new_player = self._create_vlc_pair()
+            self._bind_video_output(new_player)
+            
+            media = new_instance.media_new(media_file)
+            if position_ms > 0:
+                media.add_option(f'start-time={position_ms / 1000.0:.3f}')
+            stop = self._entry_times(media_file)[1]
+            if stop:
+                media.add_option(f'stop-time={stop:.3f}')
+            if loop_mode:
+                media.add_option('input-repeat=65535')
+            new_player.set_media(media)
+            new_player.audio_set_volume(100)
+            if new_player.play() != 0:
+                raise Exception("VLC-Play nach Neuaufbau fehlgeschlagen")
+        except Exception as e:
+            print(f"[VLC-MediaPlayer] Watchdog: Neuaufbau fehlgeschlagen: {e}")
+            return False
+        
+        with self._playback_lock:
+            unchanged = (self.is_playing and self.vlc_player is old_player and self.current_playlist is playlist
+                         and self.current_index == index and self.media_start_time == started_at)
+            if unchanged:
+                # Umschalten - ab hier benutzen alle Aufrufer den neuen Player
+                self.telemetry.untrack()
+                self.crossfader.cancel(old_player)
+                self.current_index = target_index
+                self.vlc_instance, self.vlc_player = new_instance, new_player
+                _vlc_instance_singleton, _vlc_player_singleton = new_instance, new_player
+                self.media_start_time = time.time()
+                self._progress_start_ms = position_ms
+                self._last_loop_check = time.monotonic()
+                self.telemetry.track(media_file, media)
+                released = (old_instance, old_player)
+            else:
+                # Während des Aufbaus umgeschaltet oder gestoppt - neues Paar verwerfen
+                released = (new_instance, new_player)
+        
+        def teardown(instance, player):
+            try:
+                player.stop()
+                player.release()
+                instance.release()
+                print("[VLC-MediaPlayer] Watchdog: VLC-Instanz freigegeben")
+            except Exception as e:
+                print(f"[VLC-MediaPlayer] Watchdog: Fehler beim Freigeben der VLC-Instanz: {e}")
+        
+        threading.Thread(target=teardown, args=released, daemon=True).start()
+        if not unchanged:
+            print("[VLC-MediaPlayer] Watchdog: Wiedergabe inzwischen gewechselt - Neuaufbau verworfen")
+            return False
+        print(f"[VLC-MediaPlayer] Watchdog: Wiedergabe nach {(time.monotonic() - start) * 1000:.0f}ms "
+              f"fortgesetzt bei {position_ms / 1000.0:.1f}s")
+        return True
+    
     def cleanup(self):
         """Ressourcen freigeben - aber Singleton beibehalten"""
         try:
             print("[VLC-MediaPlayer] Cleanup - stoppe nur Wiedergabe, behalte VLC-Instanz")
+            if self.watchdog:
+                self.watchdog.shutdown()
+                self.watchdog = None
             self.stop()
             
             # Media-Window schließen, aber VLC-Player behalten für andere Instanzen
@@ -494,11 +1170,17 @@ class VLCMediaPlayer:
     @staticmethod
     def cleanup_singleton():
         """Komplett-Cleanup der Singleton-Instanz - nur beim Programm-Ende aufrufen"""
-        global _vlc_instance_singleton, _vlc_player_singleton
+        global _vlc_instance_singleton, _vlc_player_singleton, _crossfader_singleton
         
         try:
             print("[VLC-MediaPlayer] Singleton Cleanup...")
             
+            if _crossfader_singleton:
+                _crossfader_singleton.shutdown()
+                _crossfader_singleton = None
+            
+            get_playback_telemetry().shutdown()
+            
             if _vlc_player_singleton:
                 _vlc_player_singleton.stop()
                 _vlc_player_singleton.release()
@@ -513,5 +1195,464 @@ class VLCMediaPlayer:
         except Exception as e:
             print(f"[VLC-MediaPlayer] Fehler beim Singleton Cleanup: {e}")
 
+class VLCStallWatchdog:
+    """Überwacht den Video-Player in einem eigenen Thread
+    
+    Erkennt zwei Hänger: Opening/Buffering länger als WATCHDOG_OPEN_TIMEOUT
+    und Playing ohne Zeitfortschritt länger als WATCHDOG_STALL_TIMEOUT.
+    Dann wird VLCMediaPlayer.recover_from_stall() an der letzten bekannten
+    Position aufgerufen - statt auf einen Absturz und den systemd-Neustart
+    zu warten.
+    """
+    def __init__(self, media_player, interval=WATCHDOG_INTERVAL,
+                 open_timeout=WATCHDOG_OPEN_TIMEOUT, stall_timeout=WATCHDOG_STALL_TIMEOUT):
+        self.media_player = media_player
+        self.interval = interval
+        self.open_timeout = open_timeout
+        self.stall_timeout = stall_timeout
+        self.recoveries = 0
+        
+        self._running = True
+        self._wakeup = threading.Event()
+        self._reset(None)
+        
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"[VLC-Watchdog] Aktiv (Opening > {open_timeout}s, Stillstand > {stall_timeout}s)")
+    
+    def _reset(self, player):
+        """Beobachtung für einen (neuen) Player/Medium neu beginnen"""
+        now = time.monotonic()
+        self._player = player
+        self._file = None
+        self._state = None
+        self._state_since = now
+        self._last_time = -1
+        self._last_progress = now
+    
+    def _run(self):
+        while self._running:
+            self._wakeup.wait(self.interval)
+            if not self._running:
+                break
+            try:
+                self._check()
+            except Exception as e:
+                print(f"[VLC-Watchdog] Fehler bei Prüfung: {e}")
+    
+    def _check(self):
+        """Einmal Zustand und Zeitfortschritt prüfen"""
+        mp = self.media_player
+        player = mp.vlc_player
+        if not mp.is_playing or player is None or not mp.current_playlist or mp.active_backend != "engine":
+            self._reset(player)
+            return
+        
+        media_file = mp.current_playlist[mp.current_index % len(mp.current_playlist)]
+        now = time.monotonic()
+        if player is not self._player or media_file != self._file:
+            # Neues Medium oder nach Neuaufbau - Timer neu starten
+            self._reset(player)
+            self._file = media_file
+        
+        if media_type(media_file) == 'image':
+            return  # Standbilder haben keinen Zeitfortschritt
+        
+        state = player.get_state()
+        if state != self._state:
+            self._state = state
+            self._state_since = now
+            self._last_progress = now
+        
+        if state in (vlc.State.Opening, vlc.State.Buffering):
+            if now - self._state_since > self.open_timeout:
+                self._recover(f"hängt in {state} seit {now - self._state_since:.1f}s")
+            return
+        
+        if state != vlc.State.Playing:
+            return  # Paused/Ended/Error behandelt der Player selbst
+        
+        position = player.get_time()
+        if position != self._last_time:
+            self._last_time = position
+            self._last_progress = now
+            mp._confirm_progress()  # Auch ohne check_playback (manueller Start außerhalb des Sensors)
+        elif now - self._last_progress > self.stall_timeout:
+            self._recover(f"kein Zeitfortschritt seit {now - self._last_progress:.1f}s")
+    
+    def _recover(self, reason):
+        """Neuaufbau anstoßen und danach neu beobachten"""
+        position = max(0, self._last_time)
+        if self.media_player.recover_from_stall(position, reason):
+            self.recoveries += 1
+        self._reset(None)
+    
+    def shutdown(self):
+        """Watchdog-Thread beenden"""
+        self._running = False
+        self._wakeup.set()
+
+class AudioCrossfader:
+    """Timer-Thread für Lautstärke-Rampen mit gleichleistungs-Kurve (Equal-Power)
+    
+    Alle Rampen laufen in einem eigenen Thread mit begrenzter Tick-Rate statt
+    im tk-Loop. Zusätzlich können Watcher registriert werden, die pro Tick
+    aufgerufen werden (z.B. Track-Ende erkennen und Überblendung starten).
+    """
+    def __init__(self, tick_rate=AUDIO_FADE_TICK_RATE):
+        self.tick_interval = 1.0 / max(1, tick_rate)
+        self.lock = threading.RLock()
+        self._wakeup = threading.Condition(self.lock)
+        self._ramps = {}  # {id(player): ramp}
+        self._watchers = []
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def fade_in(self, player, duration, target_volume=100, on_done=None):
+        """Player von 0 auf Ziel-Lautstärke einblenden (sin-Kurve)"""
+        self._add_ramp(player, 0, target_volume, "in", duration, on_done)
+    
+    def fade_out(self, player, duration, on_done=None):
+        """Player von aktueller Lautstärke auf 0 ausblenden (cos-Kurve)"""
+        try:
+            start_volume = max(0, player.audio_get_volume())
+        except Exception:
+            start_volume = 100
+        self._add_ramp(player, 0, start_volume, "out", duration, on_done)
+    
+    def crossfade(self, player_out, player_in, duration, target_volume=100, on_done=None):
+        """Gleichzeitig aus- und einblenden - Gesamtleistung bleibt konstant"""
+        with self.lock:
+            self.fade_in(player_in, duration, target_volume)
+            self.fade_out(player_out, duration, on_done)
+    
+    def cancel(self, player):
+        """Laufende Rampe eines Players abbrechen (on_done wird nicht aufgerufen)"""
+        with self.lock:
+            self._ramps.pop(id(player), None)
+    
+    def is_fading(self, player):
+        """Prüft ob für den Player eine Rampe läuft"""
+        with self.lock:
+            return id(player) in self._ramps
+    
+    def add_watcher(self, callback):
+        """Callback registrieren, der pro Tick im Timer-Thread aufgerufen wird"""
+        with self.lock:
+            if callback not in self._watchers:
+                self._watchers.append(callback)
+            self._wakeup.notify()
+    
+    def remove_watcher(self, callback):
+        """Registrierten Tick-Callback entfernen"""
+        with self.lock:
+            if callback in self._watchers:
+                self._watchers.remove(callback)
+    
+    def shutdown(self):
+        """Timer-Thread beenden"""
+        with self.lock:
+            self._running = False
+            self._ramps.clear()
+            self._watchers = []
+            self._wakeup.notify()
+    
+    def _add_ramp(self, player, low_volume, high_volume, curve, duration, on_done):
+        """Rampe eintragen und Timer-Thread wecken"""
+        with self.lock:
+            self._ramps[id(player)] = {
+                'player': player,
+                'low': low_volume,
+                'high': high_volume,
+                'curve': curve,
+                'start': time.monotonic(),
+                'duration': max(0.001, duration),
+                'last_volume': None,
+                'on_done': on_done,
+            }
+            self._wakeup.notify()
+    
+    def _run(self):
+        """Timer-Schleife: Rampen fortschreiben und Watcher aufrufen"""
+        while True:
+            with self.lock:
+                while self._running and not self._ramps and not self._watchers:
+                    self._wakeup.wait()
+                if not self._running:
+                    return
+                
+                self._tick_ramps(time.monotonic())
+                
+                for callback in list(self._watchers):
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"[VLC-Crossfader] Watcher-Fehler: {e}")
+            
+            time.sleep(self.tick_interval)
+    
+    def _tick_ramps(self, now):
+        """Lautstärken aller Rampen für den aktuellen Zeitpunkt setzen"""
+        finished = []
+        for key, ramp in list(self._ramps.items()):
+            progress = min(1.0, (now - ramp['start']) / ramp['duration'])
+            if ramp['curve'] == "in":
+                gain = math.sin(progress * math.pi / 2)
+            else:
+                gain = math.cos(progress * math.pi / 2)
+            
+            volume = int(round(ramp['low'] + (ramp['high'] - ramp['low']) * gain))
+            if volume != ramp['last_volume']:
+                try:
+                    ramp['player'].audio_set_volume(volume)
+                except Exception as e:
+                    print(f"[VLC-Crossfader] Lautstärke-Fehler: {e}")
+                ramp['last_volume'] = volume
+            
+            if progress >= 1.0:
+                finished.append(key)
+        
+        for key in finished:
+            ramp = self._ramps.pop(key)
+            if ramp['on_done']:
+                try:
+                    ramp['on_done']()
+                except Exception as e:
+                    print(f"[VLC-Crossfader] on_done-Fehler: {e}")
+
+
+def get_crossfader():
+    """Gemeinsamen Crossfader-Thread holen (Singleton)"""
+    global _crossfader_singleton
+    if _crossfader_singleton is None:
+        _crossfader_singleton = AudioCrossfader()
+    return _crossfader_singleton
+
+
+class VLCAudioPlayer:
+    """Reiner Audio-Player (--no-video) für den Soundtrack im Audio-Modus
+    
+    Läuft mit eigener VLC-Instanz unabhängig vom Video-Player, damit Bilder
+    (Slideshow) und Audio getrennt getaktet werden und sich nicht die
+    Audio-Ausgabe streitig machen. Zwei Player ("Decks") werden abwechselnd
+    benutzt, damit Tracks mit AUDIO_FADE_TIME überblendet werden können.
+    """
+    def __init__(self):
+        self.vlc_instance = None
+        self.decks = []
+        self.active_deck = 0
+        self.current_playlist = []
+        self.current_index = 0
+        self.is_playing = False
+        self.fade_time = AUDIO_FADE_TIME
+        self.crossfader = get_crossfader()
+        self.failures = get_failure_registry()
+        self._crossfading = False
+        
+        if VLC_AVAILABLE:
+            self._init_vlc()
+        else:
+            print("[VLC-AudioPlayer] VLC fehlt - kein Audio möglich")
+    
+    def _init_vlc(self):
+        """Eigene VLC-Instanz ohne Video-Ausgabe mit zwei Playern erstellen"""
+        try:
+            self.vlc_instance = vlc.Instance('--no-video', '--quiet')
+            if self.vlc_instance is None:
+                raise Exception("VLC-Instance konnte nicht erstellt werden")
+            
+            self.decks = [self.vlc_instance.media_player_new(), self.vlc_instance.media_player_new()]
+            if None in self.decks:
+                raise Exception("VLC Audio-Player konnten nicht erstellt werden")
+            
+            print("[VLC-AudioPlayer] Audio-Instanz (--no-video) mit zwei Decks erstellt")
+            
+        except Exception as e:
+            print(f"[VLC-AudioPlayer] Initialisierung fehlgeschlagen: {e}")
+            self.vlc_instance = None
+            self.decks = []
+    
+    def set_fade_time(self, seconds):
+        """Überblendzeit zwischen Tracks setzen"""
+        self.fade_time = max(0.0, float(seconds))
+        print(f"[VLC-AudioPlayer] Fade-Zeit: {self.fade_time}s")
+    
+    def play_playlist(self, audio_files, shuffle=False):
+        """Audio-Playlist als Endlosschleife starten (eingeblendet)"""
+        audio_files = self.failures.filter_playable(audio_files or [])
+        if not self.decks or not audio_files:
+            print("[VLC-AudioPlayer] Kein Player oder keine (abspielbaren) Audio-Dateien")
+            return False
+        
+        with self.crossfader.lock:
+            # Evtl. noch laufendes Ausblenden abbrechen
+            self._stop_decks()
+            
+            try:
+                self.current_playlist = list(audio_files)
+                if shuffle:
+                    random.shuffle(self.current_playlist)
+                self.current_index = 0
+                self.active_deck = 0
+                
+                if not self._start_track(self.active_deck, self.current_playlist[0], fade_in=True):
+                    return False
+                
+                self.is_playing = True
+                self.crossfader.add_watcher(self._watch_track_end)
+                print(f"[VLC-AudioPlayer] Audio-Playlist gestartet: {[os.path.basename(f) for f in self.current_playlist]}")
+                return True
+                
+            except Exception as e:
+                print(f"[VLC-AudioPlayer] Fehler beim Starten der Audio-Playlist: {e}")
+                return False
+    
+    def _start_track(self, deck_index, path, fade_in):
+        """Track auf einem Deck starten, optional eingeblendet"""
+        player = self.decks[deck_index]
+        media = self.vlc_instance.media_new(path)
+        if media is None:
+            print(f"[VLC-AudioPlayer] Media-Objekt konnte nicht erstellt werden: {os.path.basename(path)}")
+            self.failures.record_failure(path, "Media-Objekt konnte nicht erstellt werden")
+            return False
+        
+        player.set_media(media)
+        player.audio_set_volume(0 if fade_in and self.fade_time > 0 else 100)
+        if player.play() != 0:
+            print(f"[VLC-AudioPlayer] Play fehlgeschlagen: {os.path.basename(path)}")
+            self.failures.record_failure(path, "VLC-Play fehlgeschlagen")
+            return False
+        
+        if fade_in and self.fade_time > 0:
+            self.crossfader.fade_in(player, self.fade_time)
+        print(f"[VLC-AudioPlayer] Spiele: {os.path.basename(path)} (Deck {'AB'[deck_index]})")
+        return True
+    
+    def _watch_track_end(self):
+        """Pro Crossfader-Tick: Überblendung kurz vor Track-Ende starten"""
+        if not self.is_playing or self._crossfading or not self.decks:
+            return
+        
+        player = self.decks[self.active_deck]
+        state = player.get_state()
+        if state in (vlc.State.Opening, vlc.State.Buffering, vlc.State.NothingSpecial):
+            return
+        
+        ended = state in (vlc.State.Ended, vlc.State.Error, vlc.State.Stopped)
+        length = player.get_length()
+        position = player.get_time()
+        lead_ms = (self.fade_time + self.crossfader.tick_interval) * 1000
+        near_end = length > 0 and position >= 0 and (length - position) <= lead_ms
+        
+        if ended or near_end:
+            self._advance()
+    
+    def _advance(self):
+        """Nächsten Track auf dem anderen Deck starten und überblenden"""
+        old_player = self.decks[self.active_deck]
+        next_deck = 1 - self.active_deck
+        new_player = self.decks[next_deck]
+        
+        # Höchstens eine Runde durch die Playlist: Quarantäne überspringen, Fehlschläge weiterreichen
+        count = len(self.current_playlist)
+        for step in range(1, count + 1):
+            index = (self.current_index + step) % count
+            next_file = self.current_playlist[index]
+            if self.failures.is_quarantined(next_file):
+                continue
+            if self._start_track(next_deck, next_file, fade_in=False):
+                break
+        else:
+            # Kein Track startbar - altes Deck bleibt aktiv, Wiedergabe endet
+            print("[VLC-AudioPlayer] Kein abspielbarer Track mehr in der Playlist - Audio gestoppt")
+            self.is_playing = False
+            self.crossfader.remove_watcher(self._watch_track_end)
+            old_player.stop()
+            return
+        
+        self.active_deck = next_deck
+        self.current_index = index
+        
+        if self.fade_time > 0:
+            self._crossfading = True
+            new_player.audio_set_volume(0)
+            
+            def finish():
+                old_player.stop()
+                old_player.audio_set_volume(100)
+                self._crossfading = False
+            
+            self.crossfader.crossfade(old_player, new_player, self.fade_time, on_done=finish)
+        else:
+            old_player.stop()
+    
+    def stop(self, fade=False):
+        """Audio-Wiedergabe stoppen - mit fade=True sanft ausgeblendet"""
+        with self.crossfader.lock:
+            was_playing = self.is_playing
+            self.is_playing = False
+            self.crossfader.remove_watcher(self._watch_track_end)
+            
+            if not self.decks:
+                return
+            
+            try:
+                if fade and was_playing and self.fade_time > 0:
+                    for player in self.decks:
+                        self.crossfader.cancel(player)
+                        self.crossfader.fade_out(player, self.fade_time,
+                                                 on_done=lambda p=player: self._finish_fade_out(p))
+                    self._crossfading = False
+                    print(f"[VLC-AudioPlayer] Audio wird ausgeblendet ({self.fade_time}s)")
+                else:
+                    self._stop_decks()
+                    if was_playing:
+                        print("[VLC-AudioPlayer] Audio gestoppt")
+            except Exception as e:
+                print(f"[VLC-AudioPlayer] Fehler beim Stoppen: {e}")
+    
+    def _finish_fade_out(self, player):
+        """Nach dem Ausblenden stoppen - außer es wurde inzwischen neu gestartet"""
+        if not self.is_playing:
+            player.stop()
+            player.audio_set_volume(100)
+    
+    def _stop_decks(self):
+        """Beide Decks sofort stoppen und Rampen abbrechen"""
+        for player in self.decks:
+            self.crossfader.cancel(player)
+            player.stop()
+            player.audio_set_volume(100)
+        self._crossfading = False
+    
+    def pause(self):
+        """Audio pausieren/fortsetzen"""
+        try:
+            if self.decks and self.is_playing:
+                self.decks[self.active_deck].pause()
+        except Exception as e:
+            print(f"[VLC-AudioPlayer] Fehler beim Pausieren: {e}")
+    
+    def get_current_file(self):
+        """Pfad des aktuell laufenden Tracks"""
+        if not self.is_playing or not self.current_playlist:
+            return None
+        return self.current_playlist[self.current_index]
+    
+    def cleanup(self):
+        """Audio stoppen und eigene VLC-Instanz freigeben"""
+        self.stop()
+        try:
+            for player in self.decks:
+                player.release()
+            self.decks = []
+            if self.vlc_instance:
+                self.vlc_instance.release()
+                self.vlc_instance = None
+            print("[VLC-AudioPlayer] Cleanup abgeschlossen")
+        except Exception as e:
+            print(f"[VLC-AudioPlayer] Fehler beim Cleanup: {e}")
+
 # Kompatibilitäts-Alias für bestehenden Code
 MediaPlayer = VLCMediaPlayer
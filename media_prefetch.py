@@ -0,0 +1,182 @@
+"""
+Page-Cache-Vorladen für Medien auf langsamen SD-Karten/USB-Sticks
+Ein Hintergrund-Thread liest den Anfang der nächsten Playlist-Einträge und des wahrscheinlichen
+Sensor-Videos, damit der Start nicht auf den Datenträger wartet
+"""
+import os
+import threading
+import time
+
+from config import (PREFETCH_ENABLED, PREFETCH_COUNT, PREFETCH_HEAD_BYTES, PREFETCH_BUDGET_BYTES,
+                    PREFETCH_REFRESH)
+from media_cache import get_hot_media_cache
+
+CHUNK_SIZE = 1024 * 1024  # Lesegröße beim Vorwärmen
+
+_prefetcher_singleton = None
+
+
+class MediaPrefetcher:
+    def __init__(self, head_bytes=PREFETCH_HEAD_BYTES, budget_bytes=PREFETCH_BUDGET_BYTES,
+                 refresh=PREFETCH_REFRESH, enabled=PREFETCH_ENABLED):
+        self.count = max(0, PREFETCH_COUNT)
+        self.head_bytes = max(CHUNK_SIZE, head_bytes)
+        self.budget_bytes = max(0, budget_bytes)
+        self.refresh = refresh
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._running = True
+        self._generation = 0  # Erhöht sich bei jeder neuen Anforderung - alter Plan wird abgebrochen
+
+        self._trigger = []  # Wahrscheinliche Sensor-Medien (von der GUI)
+        self._upcoming = []  # Nächste Playlist-Einträge (vom Player)
+
+        self._warmed = {}  # {pfad: {'mtime', 'bytes', 'warmed_at', 'mbps'}}
+        self.stats = {'warmed_files': 0, 'warmed_bytes': 0, 'hits': 0, 'misses': 0, 'last_start': None}
+
+        self._thread = None
+        if self.enabled:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    # Anforderungen (aus dem tk-Thread oder dem Player)
+    def set_trigger(self, paths):
+        """Medien, die der Sensor als nächstes starten dürfte (wichtigste zuerst)"""
+        with self._lock:
+            self._trigger = list(paths)
+            self._generation += 1
+            self._wakeup.notify()
+
+    def set_upcoming(self, paths):
+        """Nächste Einträge der laufenden Playlist"""
+        with self._lock:
+            self._upcoming = list(paths)
+            self._generation += 1
+            self._wakeup.notify()
+
+    def prefetch_playlist(self, playlist, index):
+        """Die nächsten PREFETCH_COUNT Einträge nach index vorladen"""
+        if not self.enabled or not playlist:
+            return
+        count = min(self.count, len(playlist) - 1)
+        self.set_upcoming([playlist[(index + i) % len(playlist)] for i in range(1, count + 1)])
+
+    def report_start(self, path, cached=False):
+        """Beim Start festhalten, ob das Vorladen gewirkt hat - ohne Datei-I/O im Play-Pfad
+
+        Treffer: Kopie im RAM (cached) oder innerhalb von PREFETCH_REFRESH vorgewärmt.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._warmed.get(path)
+            age = time.monotonic() - entry['warmed_at'] if entry else None
+            hit = cached or (age is not None and age < self.refresh)
+            self.stats['hits' if hit else 'misses'] += 1
+            self.stats['last_start'] = {'file': path, 'hit': hit, 'cached': cached,
+                                        'prefetched': entry is not None, 'age': age}
+        if cached:
+            detail = "Kopie im RAM"
+        elif entry:
+            detail = f"vorgewärmt vor {age:.0f}s"
+        else:
+            detail = "nicht vorgewärmt"
+        print(f"[Prefetch] Start {os.path.basename(path)}: {'Treffer' if hit else 'kein Treffer'} ({detail})")
+        return hit
+
+    def get_stats(self):
+        """Zähler und Messung des letzten Starts"""
+        with self._lock:
+            return dict(self.stats)
+
+    def shutdown(self):
+        """Worker-Thread beenden"""
+        with self._lock:
+            self._running = False
+            self._wakeup.notify_all()
+
+    # Worker
+    def _run(self):
+        planned = -1
+        while True:
+            with self._lock:
+                if self._running and self._generation == planned:
+                    # Nichts Neues - nach PREFETCH_REFRESH erneut vorwärmen (Page-Cache kann verdrängt sein)
+                    if not self._wakeup.wait(self.refresh):
+                        planned = -1
+                if not self._running:
+                    return
+                generation = self._generation
+                plan = list(dict.fromkeys(self._trigger + self._upcoming))
+
+            planned = generation
+            self._warm_plan(plan, generation)
+
+    def _warm_plan(self, plan, generation):
+        """Dateianfänge bis zum Byte-Budget in den Page-Cache lesen"""
+        remaining = self.budget_bytes
+        for path in plan:
+            if remaining <= 0 or not self._running:
+                return
+            with self._lock:
+                if self._generation != generation:
+                    return  # Neue Anforderung - Plan neu aufstellen
+
+            if get_hot_media_cache().contains(path):
+                continue  # Wird aus dem RAM abgespielt
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            limit = min(stat.st_size, self.head_bytes, remaining)
+            remaining -= limit
+
+            entry = self._warmed.get(path)
+            if entry and entry['mtime'] == stat.st_mtime and entry['bytes'] >= limit \
+                    and time.monotonic() - entry['warmed_at'] < self.refresh:
+                continue  # Kürzlich vorgewärmt - liegt noch im Page-Cache
+
+            read_bytes, seconds = self._warm(path, limit)
+            if read_bytes:
+                mbps = read_bytes / (1024 * 1024) / seconds if seconds > 0 else 0.0
+                with self._lock:
+                    self._warmed[path] = {'mtime': stat.st_mtime, 'bytes': read_bytes,
+                                          'warmed_at': time.monotonic(), 'mbps': mbps}
+                    self.stats['warmed_files'] += 1
+                    self.stats['warmed_bytes'] += read_bytes
+                print(f"[Prefetch] Vorgewärmt: {os.path.basename(path)} "
+                      f"({read_bytes / (1024 * 1024):.0f} MB in {seconds:.2f}s, {mbps:.0f} MB/s)")
+
+    def _warm(self, path, limit):
+        """Anfang einer Datei lesen - posix_fadvise kündigt den Bereich zusätzlich dem Kernel an"""
+        start = time.monotonic()
+        read_bytes = 0
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError as e:
+            print(f"[Prefetch] Kann {os.path.basename(path)} nicht öffnen: {e}")
+            return 0, 0.0
+        try:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, limit, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, limit, os.POSIX_FADV_WILLNEED)
+            while read_bytes < limit and self._running:
+                data = os.read(fd, min(CHUNK_SIZE, limit - read_bytes))
+                if not data:
+                    break
+                read_bytes += len(data)
+        except OSError as e:
+            print(f"[Prefetch] Lesefehler {os.path.basename(path)}: {e}")
+        finally:
+            os.close(fd)
+        return read_bytes, time.monotonic() - start
+
+
+def get_media_prefetcher():
+    """Gemeinsamen Prefetcher holen (Singleton)"""
+    global _prefetcher_singleton
+    if _prefetcher_singleton is None:
+        _prefetcher_singleton = MediaPrefetcher()
+    return _prefetcher_singleton
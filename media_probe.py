@@ -0,0 +1,312 @@
+"""
+Medien-Index: Dauer, Container, Codecs, Auflösung, Bildrate und Bitrate aller Mediendateien
+Wird im Hintergrund per libvlc ermittelt und in SQLite gespeichert (Schlüssel: Pfad + mtime + Größe)
+"""
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import PROBE_DB_PATH, PROBE_WORKERS, PROBE_TIMEOUT
+from media_scanner import scan_tree
+from media_catalog import MEDIA_FOLDERS, extensions
+
+# VLC-Integration
+try:
+    import vlc
+    VLC_AVAILABLE = True
+except ImportError:
+    VLC_AVAILABLE = False
+    print("[MediaProbe] VLC nicht verfügbar - Medien-Index nur mit Dateigröße")
+
+PROBE_COLUMNS = (
+    'path', 'mtime', 'size', 'duration_ms', 'container', 'video_codec', 'audio_codec',
+    'width', 'height', 'frame_rate', 'bitrate', 'probed_at', 'error'
+)
+
+_probe_index_singleton = None
+
+
+class MediaProbeIndex:
+    def __init__(self, db_path=PROBE_DB_PATH, workers=PROBE_WORKERS, timeout=PROBE_TIMEOUT):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries = {}  # {pfad: dict} - Abfragen ohne SQLite-Zugriff
+        self._pending = set()
+        self._closed = False
+        self._futures = set()  # Noch nicht erledigte Aufträge - close() bricht sie ab
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="probe")
+        self._vlc_instance = None
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS media_probe (
+                path TEXT PRIMARY KEY,
+                mtime REAL,
+                size INTEGER,
+                duration_ms INTEGER,
+                container TEXT,
+                video_codec TEXT,
+                audio_codec TEXT,
+                width INTEGER,
+                height INTEGER,
+                frame_rate REAL,
+                bitrate INTEGER,
+                probed_at REAL,
+                error TEXT
+            )
+        """)
+        self._db.commit()
+        self._load()
+
+        if VLC_AVAILABLE:
+            try:
+                self._vlc_instance = vlc.Instance('--quiet', '--no-video-title-show')
+            except Exception as e:
+                print(f"[MediaProbe] VLC-Instanz fehlgeschlagen: {e}")
+
+    def _load(self):
+        """Bestehenden Index aus SQLite in den Speicher laden"""
+        rows = self._db.execute(f"SELECT {', '.join(PROBE_COLUMNS)} FROM media_probe").fetchall()
+        with self._lock:
+            self._entries = {row[0]: dict(zip(PROBE_COLUMNS, row)) for row in rows}
+        print(f"[MediaProbe] Index geladen: {len(self._entries)} Einträge")
+
+    # Abfragen (O(1), aus jedem Thread)
+    def get(self, path):
+        """Probe-Daten einer Datei oder None falls (noch) nicht bekannt"""
+        with self._lock:
+            entry = self._entries.get(path)
+            return dict(entry) if entry else None
+
+    def get_duration(self, path):
+        """Dauer in Sekunden oder None"""
+        entry = self.get(path)
+        if entry and entry['duration_ms'] and entry['duration_ms'] > 0:
+            return entry['duration_ms'] / 1000.0
+        return None
+
+    def is_pending(self, path):
+        """Prüft ob die Datei gerade analysiert wird"""
+        with self._lock:
+            return path in self._pending
+
+    def pending_count(self):
+        """Anzahl der noch laufenden/wartenden Analysen"""
+        with self._lock:
+            return len(self._pending)
+
+    # Aktualisierung
+    def _submit(self, func, *args):
+        """Auftrag an die Worker - nach close() ignoriert"""
+        with self._lock:
+            if self._closed:
+                return None
+            future = self._executor.submit(func, *args)
+            self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return future
+
+    def _queue_probe(self, path, mtime, size):
+        with self._lock:
+            self._pending.add(path)
+        if self._submit(self._probe_and_store, path, mtime, size) is None:
+            with self._lock:
+                self._pending.discard(path)
+
+    def update_async(self, folders=None):
+        """Ordner im Hintergrund inkrementell abgleichen"""
+        self._submit(self.update, folders)
+
+    def update_paths_async(self, stats, removed=()):
+        """Nur diese Dateien abgleichen (z.B. Katalog-Änderungen) - stats: {pfad: (mtime, größe)}"""
+        self._submit(self.update_paths, dict(stats), list(removed))
+
+    def update_paths(self, stats, removed=()):
+        """Neue/geänderte Dateien aus stats analysieren, removed aus dem Index entfernen - ohne Ordner-Scan"""
+        queued = 0
+        for path, (mtime, size) in stats.items():
+            if self._needs_probe(path, mtime, size):
+                self._queue_probe(path, mtime, size)
+                queued += 1
+        dropped = self._remove_paths(removed)
+        if queued or dropped:
+            print(f"[MediaProbe] Abgleich: {queued} zu analysieren, {dropped} entfernt")
+        return queued
+
+    def update(self, folders=None):
+        """Neue/geänderte Dateien analysieren, gelöschte aus dem Index entfernen"""
+        folders = folders or list(MEDIA_FOLDERS.values())
+        folder_kinds = {folder: kind for kind, folder in MEDIA_FOLDERS.items()}
+        seen = set()
+        queued = 0
+
+        for folder in folders:
+            if not os.path.exists(folder):
+                continue
+            for path, (mtime, size) in scan_tree(folder, extensions(folder_kinds.get(folder))).items():
+                seen.add(path)
+                if self._needs_probe(path, mtime, size):
+                    self._queue_probe(path, mtime, size)
+                    queued += 1
+
+        removed = self._remove_missing(folders, seen)
+        print(f"[MediaProbe] Abgleich: {queued} zu analysieren, {removed} entfernt, {len(seen)} Dateien")
+        return queued
+
+    def _needs_probe(self, path, mtime, size):
+        """Prüft ob Datei neu oder verändert ist"""
+        with self._lock:
+            if path in self._pending:
+                return False
+            entry = self._entries.get(path)
+        return entry is None or entry['mtime'] != mtime or entry['size'] != size
+
+    def _remove_missing(self, folders, seen):
+        """Einträge für nicht mehr vorhandene Dateien löschen"""
+        prefixes = tuple(os.path.join(folder, '') for folder in folders)
+        with self._lock:
+            missing = [p for p in self._entries if p.startswith(prefixes) and p not in seen]
+        return self._remove_paths(missing)
+
+    def _remove_paths(self, paths):
+        """Einträge entfernen - gibt die Anzahl der tatsächlich gelöschten zurück"""
+        with self._lock:
+            removed = [path for path in paths if self._entries.pop(path, None) is not None]
+            if removed and self._db is not None:
+                self._db.executemany("DELETE FROM media_probe WHERE path = ?", [(p,) for p in removed])
+                self._db.commit()
+        return len(removed)
+
+    def _probe_and_store(self, path, mtime, size):
+        """Worker: Datei analysieren und Ergebnis speichern"""
+        try:
+            entry = self._probe(path, mtime, size)
+            with self._lock:
+                if self._db is None:
+                    return
+                self._entries[path] = entry
+                if self._vlc_instance is None:
+                    # Ohne VLC nur im Speicher - beim nächsten Start mit VLC neu analysieren
+                    return
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO media_probe ({', '.join(PROBE_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in PROBE_COLUMNS)})",
+                    [entry[c] for c in PROBE_COLUMNS]
+                )
+                self._db.commit()
+            self._on_probed(entry)
+        except Exception as e:
+            print(f"[MediaProbe] Fehler bei {os.path.basename(path)}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(path)
+
+    def _on_probed(self, entry):
+        """Kurze Log-Zeile pro analysierter Datei"""
+        if entry['error']:
+            print(f"[MediaProbe] {os.path.basename(entry['path'])}: {entry['error']}")
+            return
+        resolution = f"{entry['width']}x{entry['height']}" if entry['width'] else "-"
+        print(f"[MediaProbe] {os.path.basename(entry['path'])}: {entry['duration_ms'] / 1000.0:.1f}s, "
+              f"{entry['video_codec'] or entry['audio_codec'] or '-'}, {resolution}")
+
+    def _probe(self, path, mtime, size):
+        """Metadaten per libvlc-Parser ermitteln"""
+        entry = dict.fromkeys(PROBE_COLUMNS)
+        entry.update({
+            'path': path,
+            'mtime': mtime,
+            'size': size,
+            'duration_ms': 0,
+            'container': os.path.splitext(path)[1].lower().lstrip('.'),
+            'width': 0,
+            'height': 0,
+            'frame_rate': 0.0,
+            'bitrate': 0,
+            'probed_at': time.time(),
+        })
+
+        if self._vlc_instance is None:
+            entry['error'] = "VLC nicht verfügbar"
+            return entry
+
+        media = self._vlc_instance.media_new(path)
+        try:
+            media.parse_with_options(vlc.MediaParseFlag.local, int(self.timeout * 1000))
+            deadline = time.monotonic() + self.timeout
+            while media.get_parsed_status() == 0 and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            status = media.get_parsed_status()
+            if status != vlc.MediaParsedStatus.done:
+                entry['error'] = f"Analyse fehlgeschlagen ({status})"
+                return entry
+
+            entry['duration_ms'] = max(0, media.get_duration())
+            track_bitrate = 0
+            for track in media.tracks_get() or ():
+                codec = self._codec_name(track)
+                track_bitrate += track.bitrate or 0
+                if track.type == vlc.TrackType.video and not entry['video_codec']:
+                    video = track.u.video.contents
+                    entry['video_codec'] = codec
+                    entry['width'] = video.width
+                    entry['height'] = video.height
+                    if video.frame_rate_den:
+                        entry['frame_rate'] = round(video.frame_rate_num / video.frame_rate_den, 3)
+                elif track.type == vlc.TrackType.audio and not entry['audio_codec']:
+                    entry['audio_codec'] = codec
+
+            # Bitrate: Container-Angabe oder aus Größe/Dauer abgeleitet
+            if track_bitrate > 0:
+                entry['bitrate'] = track_bitrate
+            elif entry['duration_ms'] > 0:
+                entry['bitrate'] = int(size * 8 * 1000 / entry['duration_ms'])
+            return entry
+        finally:
+            media.release()
+
+    @staticmethod
+    def _codec_name(track):
+        """Lesbarer Codec-Name, sonst FourCC"""
+        try:
+            description = vlc.libvlc_media_get_codec_description(track.type, track.codec)
+            if description:
+                return description.decode() if isinstance(description, bytes) else description
+        except Exception:
+            pass
+        return track.codec.to_bytes(4, 'little').decode('ascii', 'replace').strip()
+
+    def close(self):
+        """Worker beenden und Datenbank schließen
+
+        Der Index bleibt das Singleton: Abfragen antworten weiter aus dem Speicher,
+        Aktualisierungen werden ignoriert - späte Aufrufe öffnen keine neue Datenbank.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            futures = list(self._futures)
+        # Wartende Aufträge von Hand abbrechen (shutdown(cancel_futures=) erst ab Python 3.9)
+        for future in futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            self._pending.clear()
+            self._db.close()
+            self._db = None
+        if self._vlc_instance:
+            self._vlc_instance.release()
+            self._vlc_instance = None
+
+
+def get_probe_index():
+    """Gemeinsamen Medien-Index holen (Singleton)"""
+    global _probe_index_singleton
+    if _probe_index_singleton is None:
+        _probe_index_singleton = MediaProbeIndex()
+    return _probe_index_singleton
@@ -0,0 +1,123 @@
+"""
+Hintergrund-Scanner für die Medienordner
+Durchläuft die Ordner rekursiv mit os.scandir in einem Worker-Thread; Ergebnisse kommen über eine
+Queue in den tk-Thread. Andere blockierende Aktionen (Dateimanager öffnen) laufen im selben Worker.
+"""
+import os
+import queue
+import threading
+
+SCANNER_POLL_MS = 100  # Abfrageintervall der Ergebnis-Queue im tk-Thread
+
+
+def scan_tree(folder, extensions, dirs=None):
+    """Medienordner rekursiv einlesen als {pfad: (mtime, size)}
+
+    Nutzt die von os.scandir gelieferten Verzeichniseinträge - stat() wird pro
+    Eintrag höchstens einmal ausgeführt (unter Windows gar nicht).
+    Mit dirs (dict) werden zusätzlich die mtimes aller besuchten Ordner eingetragen.
+    """
+    listing = {}
+    pending = [folder]
+    while pending:
+        directory = pending.pop()
+        try:
+            if dirs is not None:
+                dirs[directory] = os.stat(directory).st_mtime
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith('.'):
+                                pending.append(entry.path)
+                            continue
+                        if not entry.name.lower().endswith(extensions) or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # Während des Scans gelöscht
+                    listing[entry.path] = (stat.st_mtime, stat.st_size)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[Scanner] Ordner {directory} nicht lesbar: {e}")
+    return listing
+
+
+class MediaScanner:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._jobs = queue.Queue()  # (funktion, args, on_done) für den Worker
+        self._results = queue.Queue()  # (on_done, ergebnis) für den tk-Thread
+        self._root = None
+        self._poll_id = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def start(self, root):
+        """Ergebnisse ab jetzt per root.after im tk-Thread ausliefern"""
+        self._root = root
+        if self._poll_id is None:
+            self._poll_id = root.after(SCANNER_POLL_MS, self._poll)
+
+    # Aufträge (aus dem tk-Thread)
+    def submit(self, func, *args, on_done=None):
+        """func(*args) im Worker ausführen - on_done(ergebnis) danach im tk-Thread"""
+        self._jobs.put((func, args, on_done))
+
+    def scan(self, kinds=None, on_done=None, full=True):
+        """Medienordner im Hintergrund einlesen - pro Typ ein Katalog-Abgleich, sobald er fertig ist
+
+        full=False prüft nur die Ordner-mtimes gegen den Snapshot und liest bei Abweichung neu ein.
+        on_done(changes) bekommt am Ende alle Unterschiede des Scans.
+        """
+        kinds = list(kinds or self.catalog.folders)
+        changes = {}
+        for i, kind in enumerate(kinds):
+            last = i == len(kinds) - 1
+
+            def apply(result, last=last):
+                changes.update(self.catalog.apply_scan(result))
+                if last and on_done:
+                    on_done(changes)
+
+            self.submit(self.catalog.scan_kind if full else self.catalog.validate_kind, kind, on_done=apply)
+
+    def shutdown(self):
+        """Worker und Abfrage beenden"""
+        self._jobs.put(None)
+        if self._poll_id is not None and self._root is not None:
+            try:
+                self._root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+
+    # Worker
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            func, args, on_done = job
+            try:
+                result = func(*args)
+            except Exception as e:
+                print(f"[Scanner] Fehler in {getattr(func, '__name__', func)}: {e}")
+                continue
+            if on_done is not None:
+                self._results.put((on_done, result))
+
+    def _poll(self):
+        """Im tk-Thread: fertige Ergebnisse ausliefern"""
+        while True:
+            try:
+                on_done, result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                on_done(result)
+            except Exception as e:
+                print(f"[Scanner] Fehler beim Übernehmen eines Ergebnisses: {e}")
+        self._poll_id = self._root.after(SCANNER_POLL_MS, self._poll)
+
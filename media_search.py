@@ -0,0 +1,145 @@
+"""
+Suchindex für die Dateilisten der GUI
+Token-Index über Dateinamen, Ordner und Probe-Daten - Abfragen bei jedem Tastendruck ohne die Bibliothek
+zu durchlaufen (Präfixsuche per bisect über die sortierten Tokens)
+
+Abfrage: Begriffe mit Leerzeichen getrennt, alle müssen passen
+  intro       Token-Präfix oder Teilstring des Dateinamens
+  ordner:abc  Präfix eines Ordnernamens
+  1080p, 4k   Auflösung (aus dem Medien-Index), ebenso Codec (h264) und Container
+  dauer>30    Dauer in Sekunden (auch dauer<2m, dauer>1h)
+"""
+import bisect
+import os
+import re
+
+_TOKEN_SPLIT = re.compile(r'[^0-9a-zäöüß]+')
+_DURATION = re.compile(r'^dauer([<>])(\d+(?:\.\d+)?)([smh]?)$')
+_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600}
+MIN_SUBSTRING = 3  # Ab dieser Länge passt ein Begriff auch mitten im Dateinamen
+
+
+def _tokens(text):
+    return [t for t in _TOKEN_SPLIT.split(text.lower()) if t]
+
+
+def _probe_tokens(probe):
+    """Suchbegriffe aus Probe-Daten: Auflösung, Codecs, Container"""
+    if not probe or probe.get('error'):
+        return []
+    tokens = []
+    width, height = probe.get('width') or 0, probe.get('height') or 0
+    if height:
+        tokens.append(f"{width}x{height}")
+        tokens.append(f"{height}p")
+        if height >= 2160:
+            tokens.append("4k")
+    for key in ('video_codec', 'audio_codec', 'container'):
+        if probe.get(key):
+            tokens.extend(_tokens(str(probe[key])))
+    return tokens
+
+
+class SearchIndex:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._postings = {}  # {token: set(pfade)}
+        self._folder_postings = {}  # {ordner-token: set(pfade)}
+        self._sorted_tokens = None  # Sortierte Tokens für die Präfixsuche - neu aufgebaut bei Änderungen
+        self._sorted_folder_tokens = None
+        self._path_tokens = {}  # {pfad: (tokens, ordner-tokens)} - zum Entfernen
+        self._names = {}  # {pfad: dateiname klein} - Teilstring-Suche
+        self.update(path for kind in catalog.folders for path in catalog.files(kind))
+
+    def update(self, paths):
+        """Pfade (neu) indizieren bzw. entfernen falls nicht mehr im Katalog"""
+        for path in paths:
+            self._remove(path)
+            record = self.catalog.get(path)
+            if record is None:
+                continue
+            folder = os.path.relpath(record.folder, self.catalog.folders[record.kind])
+            tokens = set(_tokens(record.name)) | set(_probe_tokens(record.probe))
+            folder_tokens = set(_tokens(folder)) if folder != '.' else set()
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(path)
+            for token in folder_tokens:
+                self._folder_postings.setdefault(token, set()).add(path)
+            self._path_tokens[path] = (tokens, folder_tokens)
+            self._names[path] = record.name.lower()
+        self._sorted_tokens = None
+        self._sorted_folder_tokens = None
+
+    def on_catalog_changed(self, changes):
+        """Katalog-Beobachter: nur geänderte Pfade neu indizieren"""
+        self.update(path for change in changes.values()
+                    for path in change.added + change.removed + change.changed)
+
+    def _remove(self, path):
+        entry = self._path_tokens.pop(path, None)
+        if entry is None:
+            return
+        self._names.pop(path, None)
+        for postings, tokens in ((self._postings, entry[0]), (self._folder_postings, entry[1])):
+            for token in tokens:
+                paths = postings.get(token)
+                if paths is not None:
+                    paths.discard(path)
+                    if not paths:
+                        del postings[token]
+
+    # Abfrage
+    def search(self, query, paths=None):
+        """Pfade, auf die alle Begriffe passen - None bei leerer Abfrage
+
+        paths schränkt die Suche auf eine Liste ein (z.B. einen Medientyp); die Reihenfolge bleibt erhalten.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return None
+        candidates = set(paths) if paths is not None else set(self._path_tokens)
+        for term in terms:
+            candidates &= self._match(term, candidates)
+            if not candidates:
+                break
+        if paths is None:
+            return sorted(candidates)
+        return [path for path in paths if path in candidates]
+
+    def _match(self, term, candidates):
+        duration = _DURATION.match(term)
+        if duration:
+            op, value, unit = duration.groups()
+            limit = float(value) * _UNITS[unit]
+            return {path for path in candidates if self._duration_matches(path, op, limit)}
+
+        if term.startswith('ordner:'):
+            return self._prefix(self._folder_postings, '_sorted_folder_tokens', term[len('ordner:'):])
+
+        matches = None
+        for token in _tokens(term) or [term]:
+            token_matches = self._prefix(self._postings, '_sorted_tokens', token)
+            matches = token_matches if matches is None else matches & token_matches
+        if len(term) >= MIN_SUBSTRING:
+            matches |= {path for path in candidates if term in self._names.get(path, '')}
+        return matches
+
+    def _prefix(self, postings, cache_name, prefix):
+        """Alle Pfade mit einem Token, das mit prefix beginnt"""
+        tokens = getattr(self, cache_name)
+        if tokens is None:
+            tokens = sorted(postings)
+            setattr(self, cache_name, tokens)
+        result = set()
+        i = bisect.bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            result |= postings[tokens[i]]
+            i += 1
+        return result
+
+    def _duration_matches(self, path, op, limit):
+        record = self.catalog.get(path)
+        if record is None or not record.probe or not record.probe.get('duration_ms'):
+            return False
+        seconds = record.probe['duration_ms'] / 1000.0
+        return seconds > limit if op == '>' else seconds < limit
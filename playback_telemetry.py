@@ -0,0 +1,217 @@
+"""
+Wiedergabe-Telemetrie aus den libvlc-Medienstatistiken
+Ein Hintergrund-Thread liest in großen Abständen media.get_stats() und summiert pro Datei und pro Stunde
+"""
+import json
+import os
+import socket
+import threading
+import time
+
+from config import TELEMETRY_INTERVAL, TELEMETRY_EXPORT_FILE, TELEMETRY_EXPORT_INTERVAL, TELEMETRY_KEEP_HOURS
+from media_probe import get_probe_index
+
+# VLC-Integration
+try:
+    import vlc
+    VLC_AVAILABLE = True
+except ImportError:
+    VLC_AVAILABLE = False
+
+# Zählerstände aus libvlc_media_stats_t, die aufsummiert werden
+COUNTERS = ('decoded_video', 'displayed_pictures', 'lost_pictures',
+            'decoded_audio', 'played_abuffers', 'lost_abuffers', 'demux_corrupted')
+
+_telemetry_singleton = None
+
+
+def _empty_totals():
+    totals = dict.fromkeys(COUNTERS, 0)
+    totals.update({'samples': 0, 'seconds': 0.0, 'bitrate_sum': 0.0})
+    return totals
+
+
+class PlaybackTelemetry:
+    def __init__(self, interval=TELEMETRY_INTERVAL, export_file=TELEMETRY_EXPORT_FILE,
+                 export_interval=TELEMETRY_EXPORT_INTERVAL):
+        self.interval = max(1.0, interval)
+        self.export_file = export_file
+        self.export_interval = export_interval
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = True
+
+        # Aktuell beobachtetes Medium
+        self._path = None
+        self._media = None
+        self._last_counts = None
+        self._last_sample_at = 0.0
+        self._current = None  # Letzte Intervall-Werte für get_current_media_info
+
+        # Aggregate
+        self.per_file = {}  # {pfad: totals}
+        self.per_hour = {}  # {"YYYY-MM-DD HH": totals}
+        self._last_export = time.monotonic()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # Steuerung durch den Player
+    def track(self, path, media):
+        """Neues Medium beobachten (nach erfolgreichem Start)"""
+        with self._lock:
+            self._path = path
+            self._media = media
+            self._last_counts = None
+            self._last_sample_at = time.monotonic()
+            self._current = None
+
+    def untrack(self):
+        """Beobachtung beenden - letzter Stand wird noch verbucht"""
+        self._sample()
+        with self._lock:
+            self._path = None
+            self._media = None
+            self._last_counts = None
+            self._current = None
+
+    # Abfragen
+    def get_current(self):
+        """Werte des letzten Messintervalls (fps, verlorene Frames, Bitrate) oder None"""
+        with self._lock:
+            return dict(self._current) if self._current else None
+
+    def get_file_totals(self, path):
+        """Summen für eine Datei inkl. Verlustquote oder None"""
+        with self._lock:
+            totals = self.per_file.get(path)
+            return self._summarize(totals) if totals else None
+
+    @staticmethod
+    def _summarize(totals):
+        summary = dict(totals)
+        pictures = totals['displayed_pictures'] + totals['lost_pictures']
+        summary['lost_ratio'] = totals['lost_pictures'] / pictures if pictures else 0.0
+        summary['avg_bitrate_kbps'] = totals['bitrate_sum'] / totals['samples'] if totals['samples'] else 0.0
+        del summary['bitrate_sum']
+        return summary
+
+    # Messung
+    def _run(self):
+        """Sampler-Thread: misst im festen Abstand und exportiert periodisch"""
+        while self._running:
+            self._wakeup.wait(self.interval)
+            if not self._running:
+                break
+            self._sample()
+            if self.export_file and time.monotonic() - self._last_export >= self.export_interval:
+                self.export()
+
+    def _sample(self):
+        """Zählerstände lesen und Differenz zur letzten Messung verbuchen"""
+        if not VLC_AVAILABLE:
+            return
+
+        with self._lock:
+            path, media = self._path, self._media
+            if path is None or media is None:
+                return
+
+            try:
+                stats = vlc.MediaStats()
+                if not media.get_stats(stats):
+                    return
+            except Exception as e:
+                print(f"[Telemetry] Statistik nicht lesbar: {e}")
+                return
+
+            now = time.monotonic()
+            elapsed = now - self._last_sample_at
+            self._last_sample_at = now
+            counts = {name: getattr(stats, name) for name in COUNTERS}
+
+            delta = {}
+            for name, value in counts.items():
+                previous = self._last_counts[name] if self._last_counts else 0
+                # Zähler springt zurück (z.B. neue Schleife) - aktueller Stand ist die Differenz
+                delta[name] = value - previous if value >= previous else value
+            self._last_counts = counts
+
+            bitrate_kbps = stats.demux_bitrate * 8000  # libvlc: Bytes pro µs - ×8 Bit ×1e6 µs/s ÷1000 = kbit/s
+            self._current = {
+                'fps': delta['displayed_pictures'] / elapsed if elapsed > 0 else 0.0,
+                'lost_frames': delta['lost_pictures'],
+                'lost_audio_buffers': delta['lost_abuffers'],
+                'bitrate_kbps': bitrate_kbps,
+                'total_lost_frames': counts['lost_pictures'],
+            }
+
+            hour = time.strftime('%Y-%m-%d %H')
+            for totals in (self.per_file.setdefault(path, _empty_totals()),
+                           self.per_hour.setdefault(hour, _empty_totals())):
+                for name, value in delta.items():
+                    totals[name] += value
+                totals['samples'] += 1
+                totals['seconds'] += elapsed
+                totals['bitrate_sum'] += bitrate_kbps
+
+            if delta['lost_pictures'] or delta['lost_abuffers']:
+                print(f"[Telemetry] {os.path.basename(path)}: {delta['lost_pictures']} Frames, "
+                      f"{delta['lost_abuffers']} Audio-Puffer verloren ({elapsed:.0f}s)")
+
+    # Export
+    def export(self, export_file=None):
+        """Aggregierte Werte als JSON schreiben (pro Datei mit Probe-Daten zur Zuordnung)"""
+        export_file = export_file or self.export_file
+        self._last_export = time.monotonic()
+
+        with self._lock:
+            # Alte Stunden verwerfen
+            for hour in sorted(self.per_hour)[:-TELEMETRY_KEEP_HOURS]:
+                del self.per_hour[hour]
+            files = {path: self._summarize(totals) for path, totals in self.per_file.items()}
+            hours = {hour: self._summarize(totals) for hour, totals in self.per_hour.items()}
+
+        probe_index = get_probe_index()
+        for path, summary in files.items():
+            probe = probe_index.get(path)
+            if probe:
+                summary['profile'] = {key: probe[key] for key in
+                                      ('container', 'video_codec', 'audio_codec', 'width', 'height',
+                                       'frame_rate', 'bitrate')}
+
+        data = {
+            'host': socket.gethostname(),
+            'exported_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'interval': self.interval,
+            'files': files,
+            'hours': hours,
+        }
+        try:
+            tmp_file = f"{export_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, export_file)
+        except Exception as e:
+            print(f"[Telemetry] Export fehlgeschlagen: {e}")
+        return data
+
+    def shutdown(self):
+        """Sampler beenden und letzten Stand exportieren"""
+        if not self._running:
+            return
+        self.untrack()
+        self._running = False
+        self._wakeup.set()
+        # Ohne eigene Messwerte (z.B. GUI-Prozess bei Player-Prozess) nicht den Export überschreiben
+        if self.export_file and self.per_file:
+            self.export()
+
+
+def get_playback_telemetry():
+    """Gemeinsame Telemetrie holen (Singleton)"""
+    global _telemetry_singleton
+    if _telemetry_singleton is None:
+        _telemetry_singleton = PlaybackTelemetry()
+    return _telemetry_singleton
@@ -0,0 +1,456 @@
+"""
+Video-Player in einem eigenen Prozess (Absturz-Isolation)
+Ein libvlc-Absturz beendet nur den Kindprozess - GUI und Sensor laufen weiter, der Player wird neu gestartet
+"""
+import multiprocessing
+import os
+import time
+
+from config import PLAYER_CALL_TIMEOUT, PLAYER_START_TIMEOUT, PLAYER_SUPERVISE_INTERVAL
+import media_player_vlc
+from media_player_vlc import VLCMediaPlayer
+from media_catalog import media_type
+
+# Methoden, die der Elternprozess im Kindprozess aufrufen darf
+REMOTE_METHODS = {
+    'play_media_list', 'play_single_media', 'restore_playback', 'stop', 'fade_out', 'pause',
+    'next_media', 'previous_media', 'show_black', 'get_current_media_info', 'is_media_finished',
+    'can_switch_media', 'clear_resume_positions', 'set_fade_time', 'set_resume_timeout',
+    'set_loop_single_video', 'set_min_display_time',
+}
+
+# Nach einem Neustart einmal wiederholen
+RETRY_METHODS = {'play_media_list', 'play_single_media', 'restore_playback'}
+
+CHILD_POLL_INTERVAL = 0.25  # Sekunden - gleichzeitig Takt für check_playback im Kindprozess
+STATE_PUSH_INTERVAL = 1.0  # Sekunden zwischen Positions-Updates an den Elternprozess
+QUERY_TIMEOUT = 1.0  # Sekunden, die eine Abfrage (get_current_media_info) den tk-Thread höchstens aufhält
+
+
+def _is_finished(player):
+    """Wie is_media_finished, aber ohne Ausgabe (wird mit jedem Zustand gemeldet)"""
+    if not player.is_playing:
+        return True
+    if player.active_backend != "engine":
+        return player._routed_finished()
+    try:
+        return player.vlc_player is None or player.vlc_player.get_state() == media_player_vlc.vlc.State.Ended
+    except Exception:
+        return True
+
+
+def _player_state(player):
+    """Zustand, den der Elternprozess spiegelt (für Anzeige und Wiederherstellung)"""
+    position = 0
+    if player.is_playing and player.vlc_player:
+        try:
+            position = max(0, player.vlc_player.get_time())
+        except Exception:
+            pass
+    return {
+        'is_playing': player.is_playing,
+        'current_mode': player.current_mode,
+        'current_playlist': list(player.current_playlist),
+        'current_index': player.current_index,
+        'active_backend': player.active_backend,
+        'media_start_time': player.media_start_time,
+        'finished': _is_finished(player),
+        'position_ms': position,
+    }
+
+
+def _child_main(conn, window_id):
+    """Einstiegspunkt des Player-Prozesses
+
+    Nachrichten vom Elternprozess: (aufruf_id, methode, args, kwargs) oder None zum Beenden.
+    Antworten: ('ready', vlc_ok), ('reply', aufruf_id, ok, ergebnis) und ('state', zustand) -
+    zustand['seq'] ist die ID des zuletzt bearbeiteten Aufrufs.
+    """
+    player = VLCMediaPlayer(window_id=window_id)
+    conn.send(('ready', player.vlc_player is not None))
+
+    last_state = None
+    last_push = 0.0
+    seq = 0
+
+    def push_state(force=False):
+        nonlocal last_state, last_push
+        state = _player_state(player)
+        state['seq'] = seq
+        # Position allein löst höchstens einmal pro Intervall ein Update aus
+        changed = last_state is None or {k: v for k, v in state.items() if k != 'position_ms'} != \
+            {k: v for k, v in last_state.items() if k != 'position_ms'}
+        now = time.monotonic()
+        if force or changed or (state['is_playing'] and now - last_push >= STATE_PUSH_INTERVAL):
+            conn.send(('state', state))
+            last_state = state
+            last_push = now
+
+    while True:
+        try:
+            if conn.poll(CHILD_POLL_INTERVAL):
+                message = conn.recv()
+                if message is None:
+                    break
+                seq, method, args, kwargs = message
+                if method not in REMOTE_METHODS:
+                    conn.send(('reply', seq, False, f"Unbekannte Methode: {method}"))
+                    continue
+                try:
+                    result, ok = getattr(player, method)(*args, **kwargs), True
+                except Exception as e:
+                    result, ok = str(e), False
+                push_state(force=True)
+                conn.send(('reply', seq, ok, result))
+            else:
+                player.check_playback()
+                push_state()
+        except (EOFError, OSError):
+            break  # Elternprozess beendet
+
+    player.stop()
+    VLCMediaPlayer.cleanup_singleton()
+
+
+class ProcessMediaPlayer(VLCMediaPlayer):
+    """VLCMediaPlayer-API, libvlc läuft aber in einem Kindprozess
+
+    Das Media-Fenster (Bilder, Schwarzbild, Slideshow) bleibt im GUI-Prozess,
+    der Kindprozess rendert Videos per Fenster-ID in dessen video_frame.
+    Aufrufe werden nur gesendet - Antworten und Zustand kommen über _drain()
+    im tk-Loop, der tk-Thread wartet also nie auf den Player. Stirbt oder
+    hängt der Kindprozess, wird er neu gestartet und die Wiedergabe an der
+    zuletzt gemeldeten Position fortgesetzt.
+    """
+    engine_name = "process"
+
+    def __init__(self):
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._conn = None
+        self._ready = False
+        self._started_at = 0.0
+        self._shutting_down = False
+        self._restarting = False
+        self.restarts = 0
+        self._call_id = 0
+        self._pending_calls = {}  # {aufruf_id: (methode, args, kwargs, gesendet_um, wiederholen)}
+        self._awaited_seq = 0  # Zustand erst übernehmen, wenn der Kindprozess diesen Aufruf bearbeitet hat
+        self.remote_state = {'is_playing': False, 'current_mode': 'black', 'current_playlist': [],
+                             'current_index': 0, 'active_backend': 'engine', 'media_start_time': 0,
+                             'finished': True, 'position_ms': 0, 'seq': 0}
+        super().__init__()
+
+    # Kindprozess
+    def _init_backend(self):
+        """Statt libvlc im GUI-Prozess: Player-Prozess an das video_frame binden"""
+        self.media_window.update()  # GUI aktualisieren für korrekte IDs
+        self.video_window_id = self.video_frame.winfo_id()
+        self._start_child()
+        self.media_window.after(int(PLAYER_SUPERVISE_INTERVAL * 1000), self._supervise)
+
+    def _router_backends(self):
+        return ()  # Auswahl pro Medientyp trifft der Kindprozess
+
+    def _backend_available(self):
+        return self._conn is not None
+
+    def _start_child(self):
+        """Player-Prozess starten - ohne auf ihn zu warten
+
+        Aufrufe können sofort gesendet werden, sie warten in der Pipe bis der Player
+        bereit ist. Die Bereitschaft meldet er per 'ready', _supervise prüft die Frist.
+        """
+        parent_conn, child_conn = self._context.Pipe()
+        try:
+            self._process = self._context.Process(target=_child_main, args=(child_conn, self.video_window_id),
+                                                  name="vlc-player", daemon=True)
+            self._process.start()
+        except OSError as e:
+            print(f"[VLC-PlayerProcess] Player-Prozess konnte nicht gestartet werden: {e}")
+            parent_conn.close()
+            self._process = None
+            return False
+        finally:
+            child_conn.close()
+        self._conn = parent_conn
+        self._ready = False
+        self._started_at = time.monotonic()
+        self._awaited_seq = 0
+        print(f"[VLC-PlayerProcess] Player-Prozess gestartet (PID {self._process.pid})")
+        return True
+
+    def _kill_child(self):
+        """Hängenden oder abgestürzten Player-Prozess sicher beenden"""
+        if self._process and self._process.is_alive():
+            self._process.kill()
+        if self._process:
+            self._process.join(timeout=1.0)
+        if self._conn:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+        self._ready = False
+
+    def _restart_child(self, reason):
+        """Player-Prozess neu starten und laufende Wiedergabe wiederherstellen"""
+        if self._shutting_down or self._restarting:
+            return False
+
+        self._restarting = True
+        try:
+            start = time.monotonic()
+            exit_code = self._process.exitcode if self._process else None
+            print(f"[VLC-PlayerProcess] {reason} (Exit-Code {exit_code}) - starte Player-Prozess neu")
+            self._kill_child()
+
+            state = self.remote_state
+            playlist = state['current_playlist']
+            if state['is_playing'] and playlist and exit_code:
+                # Absturz während der Wiedergabe zählt als Fehlschlag dieser Datei
+                media_file = playlist[state['current_index'] % len(playlist)]
+                self.failures.record_failure(media_file, f"Player-Prozess abgestürzt (Exit-Code {exit_code})")
+
+            # Unbeantwortete Starts einmal wiederholen, sonst die Wiedergabe wiederherstellen
+            retry = [call for _, call in sorted(self._pending_calls.items())
+                     if call[0] in RETRY_METHODS and call[4]]
+            self._pending_calls = {}
+
+            if not self._start_child():
+                return False
+            self.restarts += 1
+
+            if retry:
+                method, args, kwargs = retry[-1][:3]
+                self._send(method, *args, retry=False, **kwargs)
+            elif state['is_playing'] and playlist:
+                self._send('restore_playback', playlist, state['current_index'], state['position_ms'],
+                           self.media_options, retry=False)
+            print(f"[VLC-PlayerProcess] Neustart nach {(time.monotonic() - start) * 1000:.0f}ms abgeschlossen")
+            return True
+        finally:
+            self._restarting = False
+
+    def _supervise(self):
+        """Zyklisch im tk-Loop: Antworten übernehmen, abgestürzten oder hängenden Prozess neu starten"""
+        if self._shutting_down:
+            return
+        try:
+            if self._process is None or not self._process.is_alive():
+                self._restart_child("Player-Prozess beendet")
+            else:
+                self._drain()
+                self._check_timeouts()
+        except Exception as e:
+            print(f"[VLC-PlayerProcess] Fehler bei Überwachung: {e}")
+        self.media_window.after(int(PLAYER_SUPERVISE_INTERVAL * 1000), self._supervise)
+
+    def _check_timeouts(self):
+        """Kindprozess gilt als hängend, wenn er nicht startet oder einen Aufruf nicht beantwortet"""
+        if self._conn is None:
+            return
+        now = time.monotonic()
+        if not self._ready:
+            if now - self._started_at > PLAYER_START_TIMEOUT:
+                self._restart_child(f"Player-Prozess nach {PLAYER_START_TIMEOUT}s nicht bereit")
+            return
+        for method, _, _, sent_at, _ in self._pending_calls.values():
+            if now - max(sent_at, self._started_at) > PLAYER_CALL_TIMEOUT:
+                self._restart_child(f"{method} antwortet nicht nach {PLAYER_CALL_TIMEOUT}s")
+                return
+
+    def _drain(self):
+        """Wartende Nachrichten des Kindprozesses ohne Blockieren lesen"""
+        try:
+            while self._conn is not None and self._conn.poll():
+                self._handle(self._conn.recv())
+        except (EOFError, OSError):
+            self._restart_child("Verbindung zum Player-Prozess verloren")
+
+    def _handle(self, message):
+        """Eine Nachricht verarbeiten - gibt (aufruf_id, ok, ergebnis) für Antworten zurück"""
+        kind = message[0]
+        if kind == 'ready':
+            self._ready = True
+            self._started_at = time.monotonic()
+            print(f"[VLC-PlayerProcess] Player-Prozess bereit (VLC: {message[1]})")
+        elif kind == 'state':
+            # Ältere Zustände würden gerade gesendete Aufrufe (z.B. Start) überschreiben
+            if message[1]['seq'] >= self._awaited_seq:
+                self._apply_state(message[1])
+        elif kind == 'reply':
+            _, call_id, ok, payload = message
+            call = self._pending_calls.pop(call_id, None)
+            method = call[0] if call else "?"
+            if not ok:
+                print(f"[VLC-PlayerProcess] Fehler in {method}: {payload}")
+            elif method in RETRY_METHODS and not payload:
+                print(f"[VLC-PlayerProcess] {method} im Player-Prozess fehlgeschlagen")
+            return call_id, ok, payload
+        return None
+
+    def _apply_state(self, state):
+        """Zustand des Kindprozesses spiegeln und Media-Label passend ein-/ausblenden"""
+        self.remote_state = state
+        self.is_playing = state['is_playing']
+        self.current_mode = state['current_mode']
+        self.current_playlist = state['current_playlist']
+        self.current_index = state['current_index']
+        self.active_backend = state['active_backend']
+        self.media_start_time = state['media_start_time'] if self.is_playing else 0
+
+        if self.is_playing and self.current_playlist and self.media_label:
+            media_file = self.current_playlist[self.current_index % len(self.current_playlist)]
+            if media_type(media_file) in ('image', 'audio'):
+                self.media_label.config(text=f"Spielt:\n{os.path.basename(media_file)}", image='', fg='yellow')
+                self.media_label.pack(fill='both', expand=True)
+            else:
+                self.media_label.pack_forget()  # Video sichtbar machen
+
+    def _send(self, method, *args, retry=True, **kwargs):
+        """Methode im Player-Prozess anstoßen ohne zu warten - gibt die Aufruf-ID zurück (0 bei Fehler)"""
+        if self._conn is None and not self._restart_child("Kein Player-Prozess"):
+            return 0
+
+        call_id = self._call_id + 1
+        try:
+            self._conn.send((call_id, method, args, kwargs))
+        except (EOFError, OSError) as e:
+            if self._restarting:
+                # Fehler während der Wiederherstellung - nächster Versuch durch _supervise
+                print(f"[VLC-PlayerProcess] Aufruf {method} während Neustart fehlgeschlagen: {e}")
+                self._kill_child()
+                return 0
+            if not self._restart_child(f"Aufruf {method} fehlgeschlagen: {e}"):
+                return 0
+            if retry and method in RETRY_METHODS:
+                return self._send(method, *args, retry=False, **kwargs)
+            return 0
+
+        self._call_id = call_id
+        self._awaited_seq = call_id
+        self._pending_calls[call_id] = (method, args, kwargs, time.monotonic(), retry)
+        return call_id
+
+    def _call(self, method, *args, **kwargs):
+        """Abfrage im Player-Prozess - wartet höchstens QUERY_TIMEOUT, Hänger erkennt _supervise"""
+        call_id = self._send(method, *args, retry=False, **kwargs)
+        if not call_id:
+            return None
+        deadline = time.monotonic() + QUERY_TIMEOUT
+        try:
+            while call_id in self._pending_calls:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._conn.poll(remaining):
+                    print(f"[VLC-PlayerProcess] {method}: keine Antwort innerhalb {QUERY_TIMEOUT}s")
+                    return None
+                reply = self._handle(self._conn.recv())
+                if reply and reply[0] == call_id:
+                    return reply[2] if reply[1] else None
+        except (EOFError, OSError) as e:
+            self._restart_child(f"Aufruf {method} fehlgeschlagen: {e}")
+        return None
+
+    def _expect_playing(self):
+        """Start wurde gesendet - bis zur Antwort als laufend gelten (Mindestlaufzeiten, Status)"""
+        self.is_playing = True
+        self.current_mode = "playing"
+        self.media_start_time = time.time()
+
+    # VLCMediaPlayer-API
+    def play_media_list(self, media_files, shuffle=False, options=None):
+        media_files = list(media_files or [])
+        self.media_options = dict(options or {})  # Für die Wiederherstellung nach einem Neustart
+        if not media_files or not self._send('play_media_list', media_files, shuffle, self.media_options):
+            return False
+        self._expect_playing()
+        return True
+
+    def play_single_media(self, media_file):
+        self.media_options = {}
+        if not self._send('play_single_media', media_file):
+            return False
+        self._expect_playing()
+        return True
+
+    def restore_playback(self, playlist, index, position_ms=0, options=None):
+        if options is not None:
+            self.media_options = dict(options)
+        if not self._send('restore_playback', list(playlist), index, position_ms, self.media_options):
+            return False
+        self._expect_playing()
+        return True
+
+    def next_media(self):
+        return bool(self._send('next_media'))
+
+    def previous_media(self):
+        return bool(self._send('previous_media'))
+
+    def stop(self):
+        if self._conn is not None:
+            self._send('stop', retry=False)
+        self.is_playing = False
+        self.current_mode = "black"
+
+    def fade_out(self):
+        self._send('fade_out', retry=False)
+
+    def pause(self):
+        self._send('pause')
+
+    def check_playback(self):
+        """Playlist-Weiterschaltung läuft im Kindprozess - hier nur Updates übernehmen"""
+        self._drain()
+
+    def show_black(self):
+        if self.is_playing:
+            self._send('show_black', retry=False)
+        super().show_black()
+
+    def show_image_frame(self, photo, name, position=""):
+        if self.is_playing:
+            self._send('stop', retry=False)
+        super().show_image_frame(photo, name, position)
+
+    def get_current_media_info(self):
+        return self._call('get_current_media_info')
+
+    def is_media_finished(self):
+        """Aus dem zuletzt gemeldeten Zustand - ohne Rundreise zum Kindprozess"""
+        return not self.is_playing or self.remote_state.get('finished', True)
+
+    def clear_resume_positions(self):
+        self._send('clear_resume_positions')
+
+    def set_fade_time(self, seconds):
+        super().set_fade_time(seconds)
+        self._send('set_fade_time', seconds)
+
+    def set_resume_timeout(self, seconds):
+        super().set_resume_timeout(seconds)
+        self._send('set_resume_timeout', seconds)
+
+    def set_loop_single_video(self, enabled):
+        super().set_loop_single_video(enabled)
+        self._send('set_loop_single_video', enabled)
+
+    def set_min_display_time(self, seconds):
+        super().set_min_display_time(seconds)
+        self._send('set_min_display_time', seconds)
+
+    def cleanup(self):
+        """Player-Prozess beenden und Media-Fenster schließen"""
+        self._shutting_down = True
+        try:
+            if self._conn is not None:
+                self._conn.send(None)
+                self._process.join(timeout=3.0)
+        except (EOFError, OSError):
+            pass
+        self._kill_child()
+
+        if self.media_window:
+            self.media_window.destroy()
+            self.media_window = None
+        print("[VLC-PlayerProcess] Player-Prozess beendet")
@@ -0,0 +1,234 @@
+"""
+Playlists speichern und laden (Format v2)
+Einträge mit Pfad relativ zum Medienordner, Inhalts-Fingerabdruck, Reihenfolge und Optionen pro Eintrag
+({"duration": s, "start": s, "stop": s} - bleiben beim erneuten Speichern erhalten).
+Aufgelöst wird über den Katalog: Pfad, dann Fingerabdruck (verschobene/umbenannte Dateien), dann Dateiname.
+Alte Playlists (v1: nur Dateinamen) werden beim Laden umgewandelt.
+"""
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import sys
+from collections import namedtuple
+
+from media_catalog import MEDIA_FOLDERS
+
+PLAYLIST_DIR = "playlists"
+PLAYLIST_VERSION = 2
+FINGERPRINT_BYTES = 64 * 1024  # Gelesener Dateianfang für den Fingerabdruck
+
+V1_KEYS = {'video': 'videos', 'image': 'images', 'audio': 'audios'}
+
+# Aufgelöster Playlist-Eintrag - options wie gespeichert ({} falls keine)
+PlaylistEntry = namedtuple('PlaylistEntry', ['kind', 'path', 'options'])
+
+
+def playlist_path(name):
+    return os.path.join(PLAYLIST_DIR, f"{name}.json")
+
+
+def list_playlists():
+    """Namen aller gespeicherten Playlists (sortiert)"""
+    if not os.path.exists(PLAYLIST_DIR):
+        os.makedirs(PLAYLIST_DIR)
+    return sorted(f[:-5] for f in os.listdir(PLAYLIST_DIR) if f.endswith('.json'))
+
+
+def fingerprint(record):
+    """Größe plus BLAKE2 des Dateianfangs - im Record zwischengespeichert"""
+    if record.fingerprint is None:
+        digest = hashlib.blake2b(digest_size=12)
+        with open(record.path, 'rb') as f:
+            digest.update(f.read(FINGERPRINT_BYTES))
+        record.fingerprint = f"{record.size}:{digest.hexdigest()}"
+    return record.fingerprint
+
+
+def _relative(record):
+    return os.path.relpath(record.path, MEDIA_FOLDERS[record.kind]).replace(os.sep, '/')
+
+
+def _write(name, data):
+    """Playlist atomar schreiben"""
+    file_path = playlist_path(name)
+    tmp_file = f"{file_path}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, file_path)
+
+
+def _read(name):
+    with open(playlist_path(name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Speichern
+def save_playlist(name, selections, catalog):
+    """Auswahl {typ: [pfade]} speichern - Optionen bestehender Einträge bleiben erhalten"""
+    old_options = {}
+    try:
+        old = _read(name)
+        if old.get('version') == PLAYLIST_VERSION:
+            # Auch über den Fingerabdruck - Optionen bleiben beim Verschieben/Umbenennen erhalten
+            for item in old['items']:
+                if item.get('options'):
+                    for key in (item['path'], item.get('fingerprint')):
+                        old_options[(item['type'], key)] = item['options']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    items = []
+    for kind in ('video', 'image', 'audio'):
+        for path in selections.get(kind, []):
+            record = catalog.get(path)
+            if record is None:
+                continue
+            relative = _relative(record)
+            item = {'type': kind, 'path': relative}
+            try:
+                item['fingerprint'] = fingerprint(record)
+            except OSError:
+                pass
+            for key in (relative, item.get('fingerprint')):
+                if (kind, key) in old_options:
+                    item['options'] = old_options[(kind, key)]
+                    break
+            items.append(item)
+
+    data = {
+        'version': PLAYLIST_VERSION,
+        'name': name,
+        'created': str(datetime.datetime.now()),
+        'items': items,  # Reihenfolge = Abspielreihenfolge
+    }
+    if not os.path.exists(PLAYLIST_DIR):
+        os.makedirs(PLAYLIST_DIR)
+    _write(name, data)
+    return data
+
+
+# Laden
+class _Resolver:
+    """Playlist-Einträge über die Katalog-Indizes auflösen"""
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._by_fingerprint = {}  # {typ: {fingerprint: pfad}} - nur über Dateien passender Größe aufgebaut
+        self._by_size = None
+
+    def resolve(self, kind, relative, print_=None, name=None):
+        # 1. Unveränderter Pfad (O(1))
+        if relative:
+            record = self.catalog.get(os.path.join(MEDIA_FOLDERS[kind], *relative.split('/')))
+            if record is not None and record.kind == kind:
+                return record.path
+
+        # 2. Fingerabdruck: nur Dateien gleicher Größe werden angelesen
+        if print_:
+            path = self._by_print(kind, print_)
+            if path:
+                return path
+
+        # 3. Dateiname (v1 oder Datei geändert und verschoben) - bei Dubletten der erste Pfad
+        records = sorted((r for r in self.catalog.find_by_name(name or os.path.basename(relative or ''))
+                          if r.kind == kind), key=lambda r: r.path)
+        return records[0].path if records else None
+
+    def _by_print(self, kind, print_):
+        index = self._by_fingerprint.setdefault(kind, {})
+        if print_ in index:
+            return index[print_]
+        if self._by_size is None:
+            self._by_size = {}
+            for record_kind in MEDIA_FOLDERS:
+                for record in self.catalog.records(record_kind):
+                    self._by_size.setdefault((record.kind, record.size), []).append(record)
+        try:
+            size = int(print_.split(':', 1)[0])
+        except ValueError:
+            return None
+        for record in self._by_size.get((kind, size), []):
+            try:
+                index[fingerprint(record)] = record.path
+            except OSError:
+                continue
+        return index.get(print_)
+
+
+def load_playlist(name, catalog):
+    """Playlist auflösen: ([PlaylistEntry in Playlist-Reihenfolge], fehlende Einträge)
+
+    v1-Dateien werden nach dem Auflösen als v2 gespeichert (Original als .json.v1).
+    """
+    data = _read(name)
+    resolver = _Resolver(catalog)
+    entries = []
+    seen = set()
+    missing = 0
+
+    if data.get('version') == PLAYLIST_VERSION:
+        for item in data.get('items', []):
+            kind = item.get('type')
+            if kind not in MEDIA_FOLDERS:
+                continue
+            path = resolver.resolve(kind, item.get('path'), item.get('fingerprint'))
+            if path is None:
+                missing += 1
+            elif path not in seen:
+                seen.add(path)
+                entries.append(PlaylistEntry(kind, path, dict(item.get('options') or {})))
+        return entries, missing
+
+    # v1: nur Dateinamen pro Typ
+    for kind, key in V1_KEYS.items():
+        for filename in data.get(key, []):
+            path = resolver.resolve(kind, None, name=filename)
+            if path is None:
+                missing += 1
+            elif path not in seen:
+                seen.add(path)
+                entries.append(PlaylistEntry(kind, path, {}))
+    _migrate(name, paths_by_kind(entries), catalog, missing)
+    return entries, missing
+
+
+def paths_by_kind(entries):
+    """{typ: [pfade in Playlist-Reihenfolge]} aus load_playlist()-Einträgen"""
+    paths = {kind: [] for kind in MEDIA_FOLDERS}
+    for entry in entries:
+        paths[entry.kind].append(entry.path)
+    return paths
+
+
+def _migrate(name, resolved, catalog, missing):
+    """v1-Playlist als v2 speichern - nur wenn alle Einträge gefunden wurden"""
+    if missing:
+        print(f"[Playlist] '{name}' bleibt v1: {missing} Einträge nicht gefunden")
+        return
+    try:
+        # Original nur kopieren - save_playlist ersetzt die Datei atomar, sie verschwindet also nie
+        shutil.copy2(playlist_path(name), f"{playlist_path(name)}.v1")
+        save_playlist(name, resolved, catalog)
+        print(f"[Playlist] '{name}' auf Format v{PLAYLIST_VERSION} umgestellt (Original: {name}.json.v1)")
+    except OSError as e:
+        print(f"[Playlist] Umstellung von '{name}' fehlgeschlagen: {e}")
+
+
+if __name__ == "__main__":
+    # Alle Playlists prüfen und v1-Dateien umwandeln: python playlist_store.py
+    from media_catalog import get_media_catalog
+    catalog = get_media_catalog()
+    catalog.rescan()
+    names = list_playlists()
+    if not names:
+        print("✗ Keine Playlists gefunden")
+        sys.exit(1)
+    for playlist_name in names:
+        try:
+            playlist_entries, missing_count = load_playlist(playlist_name, catalog)
+        except (OSError, ValueError) as e:
+            print(f"✗ {playlist_name}: {e}")
+            continue
+        counts = ", ".join(f"{len(p)} {kind}" for kind, p in paths_by_kind(playlist_entries).items())
+        print(f"{'✓' if not missing_count else '⚠'} {playlist_name}: {counts}, {missing_count} fehlen")
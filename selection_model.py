@@ -0,0 +1,170 @@
+"""
+Auswahl-Modell für die Dateilisten der GUI
+Geordnete Dateiliste plus Menge der ausgewählten Pfade - ohne tk-Variablen pro Datei
+"""
+import bisect
+import fnmatch
+import os
+
+from media_catalog import sort_key
+
+
+class SelectionModel:
+    def __init__(self):
+        self.items = []  # Pfade in Anzeige-Reihenfolge
+        self._keys = []  # sort_key() der Einträge (parallel zu items) - bisect ohne key= (Python < 3.10)
+        self.revision = 0  # Erhöht sich bei jeder Änderung der Einträge (nicht der Auswahl)
+        self._members = set()
+        self._index = None  # {pfad: position} - bei Bedarf neu aufgebaut
+        self._selected = set()
+        self._selected_list = None  # Ausgewählte Pfade in Anzeige-Reihenfolge - neu berechnet nach Änderungen
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """callback(changed, selection_changed) bei Änderungen
+
+        changed ist eine Liste von Pfaden oder None (alles), selection_changed ist False,
+        wenn sich nur Einträge geändert haben, die Auswahl aber gleich blieb.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, changed, selection_changed=True):
+        if selection_changed:
+            self._selected_list = None
+        for callback in list(self._listeners):
+            callback(changed, selection_changed)
+
+    # Dateiliste
+    def _set_items(self, items):
+        self.items = list(items)
+        self._keys = [sort_key(path) for path in self.items]
+        self._members = set(self.items)
+        self._index = None
+        self.revision += 1
+
+    def set_items(self, items, selected=True):
+        """Dateiliste ersetzen - alle Einträge aus- oder abgewählt"""
+        self._set_items(items)
+        self._selected = set(self.items) if selected else set()
+        self._notify(None)
+
+    def update_items(self, items, selected=True):
+        """Dateiliste abgleichen - bestehende Einträge behalten ihre Auswahl, neue werden (ab)gewählt"""
+        known = self._members
+        self._set_items(items)
+        self._selected = {path for path in self._selected if path in self._members}
+        if selected:
+            self._selected.update(path for path in self.items if path not in known)
+        self._notify(None)
+
+    def apply_change(self, change, selected=True):
+        """Katalog-Änderung (CatalogChange) übernehmen - nur die betroffenen Pfade werden einsortiert/entfernt
+
+        Die Einträge bleiben wie MediaCatalog.files() sortiert. Neue Einträge werden (ab)gewählt.
+        """
+        removed = [path for path in change.removed if path in self._members]
+        added = [path for path in change.added if path not in self._members]
+        for path in removed:
+            position = bisect.bisect_left(self._keys, sort_key(path))
+            del self.items[position]
+            del self._keys[position]
+            self._members.discard(path)
+        if len(added) > len(self.items):
+            # Erstbefüllung: einmal sortieren
+            self.items = sorted(self.items + added, key=sort_key)
+            self._keys = [sort_key(path) for path in self.items]
+        else:
+            for path in added:
+                key = sort_key(path)
+                position = bisect.bisect_right(self._keys, key)
+                self._keys.insert(position, key)
+                self.items.insert(position, path)
+        self._members.update(added)
+        if removed or added:
+            self._index = None
+            self.revision += 1
+
+        selection_changed = not self._selected.isdisjoint(removed) or (selected and bool(added))
+        self._selected.difference_update(removed)
+        if selected:
+            self._selected.update(added)
+
+        changed = added + removed + [path for path in change.changed if path in self._members]
+        if changed:
+            if removed or added:
+                self._selected_list = None
+            self._notify(changed, selection_changed)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, path):
+        return path in self._members
+
+    def index(self, path):
+        """Position eines Pfades oder None"""
+        if self._index is None:
+            self._index = {path: i for i, path in enumerate(self.items)}
+        return self._index.get(path)
+
+    # Auswahl
+    def is_selected(self, path):
+        return path in self._selected
+
+    def set_selected(self, path, selected):
+        if path not in self._members or (path in self._selected) == bool(selected):
+            return
+        if selected:
+            self._selected.add(path)
+        else:
+            self._selected.discard(path)
+        self._notify([path])
+
+    def toggle(self, path):
+        """Auswahl umkehren - gibt den neuen Zustand zurück"""
+        self.set_selected(path, path not in self._selected)
+        return path in self._selected
+
+    # Sammel-Operationen (eine Benachrichtigung pro Aufruf)
+    # paths beschränkt die Operation auf einen Teil der Einträge (z.B. die Suchtreffer)
+    def select_all(self, paths=None):
+        if paths is None:
+            self._replace(set(self.items))
+        else:
+            self._replace(self._selected | {path for path in paths if path in self._members})
+
+    def select_none(self, paths=None):
+        self._replace(set() if paths is None else self._selected - set(paths))
+
+    def invert(self, paths=None):
+        """Auswahl aller (bzw. der übergebenen) Einträge umkehren"""
+        scope = self.items if paths is None else [path for path in paths if path in self._members]
+        self._replace(self._selected.symmetric_difference(scope))
+
+    def select_matching(self, pattern, selected=True):
+        """Einträge mit passendem Dateinamen (Muster wie *.mp4 oder *intro*) an- bzw. abwählen
+
+        Gibt die Anzahl der passenden Einträge zurück.
+        """
+        pattern = pattern.lower()
+        matches = {path for path in self.items if fnmatch.fnmatchcase(os.path.basename(path).lower(), pattern)}
+        self._replace(self._selected | matches if selected else self._selected - matches)
+        return len(matches)
+
+    def set_selection(self, paths):
+        """Genau diese Pfade auswählen (unbekannte werden ignoriert)"""
+        self._replace({path for path in paths if path in self._members})
+
+    def _replace(self, selected):
+        if selected != self._selected:
+            self._selected = selected
+            self._notify(None)
+
+    def selected(self):
+        """Ausgewählte Pfade in Anzeige-Reihenfolge (Kopie)"""
+        if self._selected_list is None:
+            self._selected_list = [path for path in self.items if path in self._selected]
+        return list(self._selected_list)
+
+    def selected_count(self):
+        return len(self._selected)
@@ -0,0 +1,266 @@
+"""
+Slideshow-Engine für die VLC-Edition
+Bildwechsel auf driftfreien monotonen Deadlines, nächste Bilder werden im Hintergrund dekodiert
+"""
+import os
+import threading
+import time
+
+from config import IMAGE_DISPLAY_TIME, SLIDESHOW_PREFETCH_COUNT
+
+# PIL für Vorab-Dekodierung
+try:
+    from PIL import Image, ImageTk
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    print("[Slideshow] PIL nicht verfügbar - Bilder werden direkt über VLC angezeigt")
+
+
+class SlideshowEngine:
+    def __init__(self, media_player, display_time=IMAGE_DISPLAY_TIME, prefetch_count=SLIDESHOW_PREFETCH_COUNT):
+        self.media_player = media_player
+        self.display_time = max(1.0, display_time)
+        self.prefetch_count = max(1, prefetch_count)
+
+        # Playlist-Zustand
+        self.images = []
+        self.index = 0
+        self.current_image = None
+        self.running = False
+        self.paused = False
+
+        # Timing (time.monotonic, unabhängig von Systemzeit-Sprüngen)
+        self._next_deadline = 0.0
+        self._remaining_on_pause = 0.0
+        self._after_id = None
+
+        # Dekodier-Cache: {pfad: PIL.Image}, nur das aktuelle Vorschaufenster
+        self._decoded = {}
+        self._wanted = []
+        self._target_size = (1920, 1080)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._worker_running = True
+        self._worker = None
+
+        if PIL_AVAILABLE:
+            self._worker = threading.Thread(target=self._decode_worker, daemon=True)
+            self._worker.start()
+
+    # Öffentliche Steuerung (nur aus dem tk-Thread aufrufen)
+    def start(self, images):
+        """Slideshow mit neuer Bildliste starten"""
+        self._cancel_timer()
+        self.images = list(images)
+        self.index = 0
+        self.paused = False
+
+        if not self.images:
+            self.stop()
+            return False
+
+        self._update_target_size()
+        self.running = True
+        print(f"[Slideshow] Start mit {len(self.images)} Bildern ({self.display_time}s pro Bild)")
+
+        self._next_deadline = time.monotonic()
+        self._on_deadline()
+        return True
+
+    def stop(self):
+        """Slideshow beenden und Vorab-Cache leeren"""
+        self._cancel_timer()
+        self.running = False
+        self.paused = False
+        self.current_image = None
+        with self._lock:
+            self._wanted = []
+            self._decoded.clear()
+
+    def pause(self):
+        """Slideshow anhalten (z.B. während Sensor-Wiedergabe), Restzeit merken"""
+        if not self.running or self.paused:
+            return
+
+        self._cancel_timer()
+        self._remaining_on_pause = max(0.0, self._next_deadline - time.monotonic())
+        self.paused = True
+        print(f"[Slideshow] Pausiert (Rest: {self._remaining_on_pause:.1f}s)")
+
+    def resume(self):
+        """Slideshow fortsetzen - aktuelles Bild sofort wieder anzeigen"""
+        if not self.running or not self.paused:
+            return
+
+        self.paused = False
+        if self.current_image:
+            self._show(self.current_image)
+        self._next_deadline = time.monotonic() + self._remaining_on_pause
+        self._schedule()
+        print(f"[Slideshow] Fortgesetzt (nächster Wechsel in {self._remaining_on_pause:.1f}s)")
+
+    def set_images(self, images):
+        """Bildliste austauschen ohne den Takt neu zu starten"""
+        new_images = list(images)
+        if not new_images:
+            self.stop()
+            return
+
+        if not self.running:
+            self.images = new_images
+            return
+
+        # Aktuelles Bild beibehalten falls noch enthalten
+        if self.current_image in new_images:
+            self.index = (new_images.index(self.current_image) + 1) % len(new_images)
+        else:
+            self.index = 0
+        self.images = new_images
+        self._request_prefetch()
+
+    def set_display_time(self, seconds):
+        """Anzeigezeit pro Bild ändern - gilt ab dem nächsten Wechsel"""
+        self.display_time = max(1.0, float(seconds))
+        print(f"[Slideshow] Anzeigezeit: {self.display_time}s")
+
+    def current_name(self):
+        """Dateiname des aktuell angezeigten Bildes"""
+        return os.path.basename(self.current_image) if self.current_image else None
+
+    def shutdown(self):
+        """Worker-Thread beenden"""
+        self.stop()
+        with self._lock:
+            self._worker_running = False
+            self._wakeup.notify_all()
+
+    # Taktung
+    def _on_deadline(self):
+        """Bildwechsel zur Deadline ausführen und nächste Deadline planen"""
+        self._after_id = None
+        if not self.running or self.paused or not self.images:
+            return
+
+        image_path = self.images[self.index % len(self.images)]
+        self.index = (self.index + 1) % len(self.images)
+        self.current_image = image_path
+        self._show(image_path)
+        self._request_prefetch()
+
+        # Driftfrei: Deadline fortschreiben statt "jetzt + Intervall"
+        self._next_deadline += self.display_time
+        now = time.monotonic()
+        if self._next_deadline <= now:
+            # Mehr als ein Intervall verpasst (z.B. blockierter tk-Loop) - neu synchronisieren
+            self._next_deadline = now + self.display_time
+        self._schedule()
+
+    def _schedule(self):
+        """tk-Timer auf die nächste Deadline setzen"""
+        widget = self.media_player.media_window
+        if widget is None:
+            return
+        delay_ms = max(0, int((self._next_deadline - time.monotonic()) * 1000))
+        self._after_id = widget.after(delay_ms, self._on_deadline)
+
+    def _cancel_timer(self):
+        """Geplanten Bildwechsel abbrechen"""
+        if self._after_id is not None and self.media_player.media_window is not None:
+            try:
+                self.media_player.media_window.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._after_id = None
+
+    def _show(self, image_path):
+        """Bild anzeigen - vorab dekodiert falls verfügbar"""
+        name = os.path.basename(image_path)
+        position = f"{self.images.index(image_path) + 1}/{len(self.images)}" if image_path in self.images else ""
+
+        if not PIL_AVAILABLE:
+            # Fallback: VLC zeigt das Bild direkt
+            self.media_player.play_single_media(image_path)
+            return
+
+        with self._lock:
+            image = self._decoded.get(image_path)
+
+        if image is None:
+            # Cache-Miss (z.B. erster Start) - synchron dekodieren
+            print(f"[Slideshow] Cache-Miss: {name} - dekodiere synchron")
+            image = self._decode(image_path)
+            if image is None:
+                self.media_player.play_single_media(image_path)
+                return
+
+        try:
+            photo = ImageTk.PhotoImage(image)
+            self.media_player.show_image_frame(photo, name, position)
+        except Exception as e:
+            print(f"[Slideshow] Fehler bei Bildanzeige {name}: {e}")
+
+    def _update_target_size(self):
+        """Zielgröße für Skalierung aus dem Media-Fenster ermitteln"""
+        window = self.media_player.media_window
+        if window is None:
+            return
+        try:
+            self._target_size = (window.winfo_screenwidth(), window.winfo_screenheight())
+        except Exception:
+            pass
+
+    # Vorab-Dekodierung
+    def _request_prefetch(self):
+        """Nächste N Bilder zur Dekodierung anfordern, Rest aus dem Cache werfen"""
+        if not PIL_AVAILABLE or not self.images:
+            return
+
+        count = min(self.prefetch_count, len(self.images))
+        upcoming = [self.images[(self.index + i) % len(self.images)] for i in range(count)]
+        keep = set(upcoming)
+        if self.current_image:
+            keep.add(self.current_image)
+
+        with self._lock:
+            for path in list(self._decoded):
+                if path not in keep:
+                    del self._decoded[path]
+            self._wanted = [p for p in upcoming if p not in self._decoded]
+            self._wakeup.notify()
+
+    def _decode_worker(self):
+        """Worker-Thread: dekodiert angeforderte Bilder vorab"""
+        while True:
+            with self._lock:
+                while self._worker_running and not self._wanted:
+                    self._wakeup.wait()
+                if not self._worker_running:
+                    return
+                image_path = self._wanted.pop(0)
+                if image_path in self._decoded:
+                    continue
+
+            image = self._decode(image_path)
+            if image is None:
+                continue
+
+            with self._lock:
+                # Nur behalten wenn noch im Vorschaufenster
+                if self.running and image_path in self.images:
+                    self._decoded[image_path] = image
+
+    def _decode(self, image_path):
+        """Bild laden, auf Bildschirmgröße skalieren und vollständig dekodieren"""
+        try:
+            start = time.monotonic()
+            image = Image.open(image_path)
+            image.draft('RGB', self._target_size)  # JPEG: verkleinert direkt beim Dekodieren
+            image = image.convert('RGB')
+            image.thumbnail(self._target_size, Image.Resampling.LANCZOS)
+            image.load()
+            print(f"[Slideshow] Dekodiert: {os.path.basename(image_path)} ({(time.monotonic() - start) * 1000:.0f}ms)")
+            return image
+        except Exception as e:
+            print(f"[Slideshow] Dekodier-Fehler {os.path.basename(image_path)}: {e}")
+            return None
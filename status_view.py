@@ -0,0 +1,56 @@
+"""
+Status-Labels nur bei Änderungen neu konfigurieren
+Die Status-Schleife setzt ihre Texte alle 200 ms - jeder config-Aufruf ist ein Tcl-Aufruf und kann
+eine Neuberechnung des Layouts auslösen, auch wenn sich nichts geändert hat.
+"""
+
+
+class LabelView:
+    """Ersetzt ein Label für config-Aufrufe - gleiche Optionen werden nicht erneut gesetzt
+
+    Alle anderen Attribute (pack, cget, ...) gehen direkt an das Label.
+    """
+    def __init__(self, widget, view):
+        self.widget = widget
+        self._view = view
+        self._rendered = {}  # Zuletzt gesetzte Optionen
+
+    def config(self, **options):
+        if not options:
+            return self.widget.config()
+        changed = {key: value for key, value in options.items() if self._rendered.get(key) != value}
+        if not changed:
+            self._view.skipped += 1
+            return None
+        self.widget.config(**changed)
+        self._rendered.update(changed)
+        self._view.rendered += 1
+        return None
+
+    configure = config
+
+    def __getattr__(self, name):
+        return getattr(self.widget, name)
+
+
+class StatusView:
+    def __init__(self):
+        self.rendered = 0  # Tatsächliche config-Aufrufe
+        self.skipped = 0  # Übersprungene Aufrufe (Optionen unverändert)
+
+    def wrap(self, widget):
+        """Label in eine LabelView einpacken"""
+        return LabelView(widget, self)
+
+    def stats(self):
+        total = self.rendered + self.skipped
+        return {
+            'rendered': self.rendered,
+            'skipped': self.skipped,
+            'skipped_ratio': self.skipped / total if total else 0.0,
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"{stats['rendered']} aktualisiert, {stats['skipped']} übersprungen "
+                f"({stats['skipped_ratio']:.0%})")
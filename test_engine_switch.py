@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test-Script: vergleicht libvlc und mpv (IPC) beim Wechsel zwischen Videos
+Misst für beide Backends gleich: Zeit von play_media_list() bis die Position fortschreitet
+(feste Wartezeiten im Player herausgerechnet) und die CPU-Zeit des ganzen Player-Stacks
+(Testprozess plus ggf. mpv-Prozess)
+
+Aufruf: python3 test_engine_switch.py [wechsel] [videodateien...]
+Ohne Dateien werden die ersten Videos aus dem videos/-Ordner verwendet.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+SWITCH_LIMIT_MS = 500  # Ab dieser Wartezeit ist der Wechsel deutlich sichtbar
+
+
+def find_test_videos(limit=3):
+    """Videos aus dem videos/-Ordner verwenden"""
+    from config import VIDEO_FOLDER
+    from media_catalog import extensions
+    if not os.path.exists(VIDEO_FOLDER):
+        return []
+    return [os.path.join(VIDEO_FOLDER, name) for name in sorted(os.listdir(VIDEO_FOLDER))
+            if name.lower().endswith(extensions('video'))][:limit]
+
+
+def cpu_seconds(pid):
+    """Verbrauchte CPU-Zeit (user + system) eines Prozesses aus /proc"""
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def cpu_total(pids):
+    """CPU-Zeit mehrerer Prozesse zusammen"""
+    return sum(cpu_seconds(pid) for pid in pids)
+
+
+@contextmanager
+def count_sleeps():
+    """Feste time.sleep()-Pausen im Player zählen - sie werden weiter ausgeführt, aber nicht mitgemessen"""
+    slept = [0.0]
+    original = time.sleep
+
+    def counting_sleep(seconds):
+        slept[0] += seconds
+        original(seconds)
+
+    time.sleep = counting_sleep
+    try:
+        yield slept
+    finally:
+        time.sleep = original
+
+
+def measure_switches(root, player, videos, switches, pids):
+    """Wechsel-Latenzen in ms und CPU-Zeit pro Sekunde Wiedergabe messen
+
+    Beide Backends werden gleich gemessen: vom Aufruf bis die Position fortschreitet,
+    abzüglich fester Pausen im Aufruf; CPU-Zeit über alle Prozesse des Backends.
+    """
+    latencies = []
+    cpu_start = cpu_total(pids)
+    wall_start = time.monotonic()
+
+    for n in range(switches):
+        video = videos[n % len(videos)]
+        player.clear_resume_positions()
+        start = time.monotonic()
+        with count_sleeps() as slept:
+            started = player.play_media_list([video])
+        if not started:
+            print(f"  Wechsel {n + 1}: ✗ {os.path.basename(video)} startet nicht")
+            continue
+
+        # Warten bis die Position tatsächlich fortschreitet
+        latency = None
+        deadline = start + 10
+        while time.monotonic() < deadline:
+            root.update()
+            position, _ = player._get_position()
+            if position and position > 0:
+                latency = (time.monotonic() - start - slept[0]) * 1000.0
+                break
+            time.sleep(0.005)
+
+        if latency is None:
+            print(f"  Wechsel {n + 1}: ✗ {os.path.basename(video)} läuft nicht an")
+            continue
+        latencies.append(latency)
+        print(f"  Wechsel {n + 1}: {latency:.0f}ms ({os.path.basename(video)}, "
+              f"{slept[0] * 1000:.0f}ms feste Pausen nicht gezählt)")
+
+        # Kurz laufen lassen, damit auch die Dekodierlast in die CPU-Zeit eingeht
+        until = time.monotonic() + 2
+        while time.monotonic() < until:
+            root.update()
+            time.sleep(0.02)
+
+    cpu_load = (cpu_total(pids) - cpu_start) / max(0.001, time.monotonic() - wall_start)
+    player.stop()
+    return latencies, cpu_load
+
+
+def report(label, latencies, cpu_load):
+    """Ergebnis einer Messreihe ausgeben"""
+    if not latencies:
+        print(f"✗ {label}: keine Wechsel gemessen")
+        return
+    avg = sum(latencies) / len(latencies)
+    worst = max(latencies)
+    mark = "✓" if worst <= SWITCH_LIMIT_MS else "⚠"
+    print(f"{mark} {label}: Mittel {avg:.0f}ms, Maximum {worst:.0f}ms, CPU {cpu_load * 100:.0f}% "
+          f"({len(latencies)} Wechsel)")
+
+
+if __name__ == "__main__":
+    print("=== Backend-Vergleich: libvlc / mpv ===")
+
+    switches = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    videos = sys.argv[2:] or find_test_videos()
+
+    if len(videos) < 2:
+        print("✗ Mindestens zwei Testvideos nötig - Pfade als Argument angeben oder in videos/ ablegen")
+        sys.exit(1)
+
+    try:
+        import tkinter as tk
+        from media_player_vlc import VLCMediaPlayer, VLC_AVAILABLE
+        from media_player_mpv import MPVMediaPlayer
+    except ImportError as e:
+        print(f"✗ Import-Fehler: {e}")
+        sys.exit(1)
+
+    root = tk.Tk()
+    root.withdraw()
+    results = []
+
+    if VLC_AVAILABLE:
+        print("\n--- libvlc (im GUI-Prozess) ---")
+        player = VLCMediaPlayer()
+        # libvlc dekodiert in diesem Prozess
+        results.append(("libvlc", *measure_switches(root, player, videos, switches, [os.getpid()])))
+        player.cleanup()
+        VLCMediaPlayer.cleanup_singleton()
+    else:
+        print("⚠ python-vlc nicht verfügbar - libvlc wird übersprungen")
+
+    print("\n--- mpv (IPC, ein Prozess) ---")
+    player = MPVMediaPlayer()
+    if player.mpv is None:
+        print("⚠ mpv nicht verfügbar - sudo apt install mpv")
+    else:
+        # mpv dekodiert im eigenen Prozess, Steuerung und IPC laufen hier
+        pids = [os.getpid(), player.mpv.process.pid]
+        results.append(("mpv", *measure_switches(root, player, videos, switches, pids)))
+    player.cleanup()
+
+    print("\n=== Ergebnis ===")
+    for label, latencies, cpu_load in results:
+        report(label, latencies, cpu_load)
+
+    root.destroy()
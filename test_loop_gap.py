@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test-Script: misst die Lücke zwischen zwei Durchläufen eines Einzelvideos
+Vergleicht die Schleife per input-repeat mit dem alten Neu-Öffnen (media_new/set_media/play)
+
+Aufruf: python3 test_loop_gap.py [videodatei] [durchläufe]
+Am besten mit einem kurzen Video (3-10s) testen.
+"""
+import os
+import sys
+import time
+
+GAP_LIMIT_MS = 50  # Ab dieser Lücke ist der Übergang sichtbar
+
+
+def find_test_video():
+    """Erstes Video aus dem videos/-Ordner verwenden"""
+    from config import VIDEO_FOLDER
+    from media_catalog import extensions
+    if not os.path.exists(VIDEO_FOLDER):
+        return None
+    for name in sorted(os.listdir(VIDEO_FOLDER)):
+        if name.lower().endswith(extensions('video')):
+            return os.path.join(VIDEO_FOLDER, name)
+    return None
+
+
+def measure_gaps(root, player, video, loops, reopen):
+    """Lücken pro Schleifenübergang in ms messen
+
+    Die Lücke ist die Zeit zwischen dem erwarteten Ende eines Durchlaufs
+    (letzte Position + Restlänge) und dem rechnerischen Start des nächsten
+    (Wanduhr minus neue Position).
+    """
+    import vlc
+
+    vlc_player = player.vlc_player
+    player.set_loop_single_video(not reopen)
+    player.stop()
+    player.clear_resume_positions()
+    if not player.play_media_list([video]):
+        print("✗ Wiedergabe konnte nicht gestartet werden")
+        return []
+
+    gaps = []
+    last_pos = -1
+    last_wall = 0.0
+    length = 0
+    deadline = time.monotonic() + 120
+
+    while len(gaps) < loops and time.monotonic() < deadline:
+        root.update()
+        now = time.monotonic()
+        state = vlc_player.get_state()
+
+        if reopen and state == vlc.State.Ended:
+            # Alter Ablauf: Media komplett neu öffnen
+            media = player.vlc_instance.media_new(video)
+            vlc_player.set_media(media)
+            vlc_player.play()
+            continue
+
+        pos = vlc_player.get_time()
+        if length <= 0:
+            length = vlc_player.get_length()
+
+        if pos > 0 and length > 0:
+            if last_pos > length / 2 and pos < length / 2:
+                # Neuer Durchlauf erkannt
+                expected_end = last_wall + (length - last_pos) / 1000.0
+                restart = now - pos / 1000.0
+                gap_ms = max(0.0, (restart - expected_end) * 1000.0)
+                gaps.append(gap_ms)
+                print(f"  Durchlauf {len(gaps)}: Lücke {gap_ms:.1f}ms")
+            last_pos = pos
+            last_wall = now
+
+        time.sleep(0.002)
+
+    player.stop()
+    return gaps
+
+
+def report(label, gaps):
+    """Ergebnis einer Messreihe ausgeben"""
+    if not gaps:
+        print(f"✗ {label}: keine Schleifenübergänge gemessen")
+        return
+    avg = sum(gaps) / len(gaps)
+    worst = max(gaps)
+    mark = "✓" if worst <= GAP_LIMIT_MS else "⚠"
+    print(f"{mark} {label}: Mittel {avg:.1f}ms, Maximum {worst:.1f}ms ({len(gaps)} Übergänge)")
+
+
+if __name__ == "__main__":
+    print("=== Schleifen-Lücken-Test ===")
+
+    video = sys.argv[1] if len(sys.argv) > 1 else find_test_video()
+    loops = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    if not video or not os.path.exists(video):
+        print("✗ Kein Testvideo gefunden - Pfad als Argument angeben oder Video in videos/ ablegen")
+        sys.exit(1)
+
+    try:
+        import tkinter as tk
+        import vlc  # noqa: F401
+        from media_player_vlc import VLCMediaPlayer
+    except ImportError as e:
+        print(f"✗ Import-Fehler: {e}")
+        print("  → Führen Sie aus: pip3 install python-vlc")
+        sys.exit(1)
+
+    root = tk.Tk()
+    root.withdraw()
+    player = VLCMediaPlayer()
+
+    print(f"\n--- Schleife per input-repeat: {os.path.basename(video)} ---")
+    loop_gaps = measure_gaps(root, player, video, loops, reopen=False)
+
+    print(f"\n--- Neu-Öffnen pro Durchlauf: {os.path.basename(video)} ---")
+    reopen_gaps = measure_gaps(root, player, video, loops, reopen=True)
+
+    print("\n=== Ergebnis ===")
+    report("input-repeat", loop_gaps)
+    report("Neu-Öffnen", reopen_gaps)
+
+    player.cleanup()
+    VLCMediaPlayer.cleanup_singleton()
+    root.destroy()
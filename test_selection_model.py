@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test für SelectionModel.apply_change - Katalog-Änderungen einsortieren und entfernen
+Aufruf: python3 test_selection_model.py (oder per pytest)
+"""
+from media_catalog import CatalogChange, sort_key
+from selection_model import SelectionModel
+
+
+def _model(paths):
+    model = SelectionModel()
+    notifications = []
+    model.add_listener(lambda changed, selection_changed: notifications.append((changed, selection_changed)))
+    model.set_items(sorted(paths, key=sort_key))
+    notifications.clear()
+    return model, notifications
+
+
+def test_apply_change_inserts_sorted_and_removes():
+    model, notifications = _model(['/v/b.mp4', '/v/D.mp4', '/v/f.mp4'])
+    model.apply_change(CatalogChange(['/v/a.mp4', '/v/C.mp4', '/v/e.mp4'], ['/v/D.mp4'], []))
+
+    assert model.items == ['/v/a.mp4', '/v/b.mp4', '/v/C.mp4', '/v/e.mp4', '/v/f.mp4']
+    assert model.items == sorted(model.items, key=sort_key)
+    assert '/v/D.mp4' not in model
+    assert model.index('/v/e.mp4') == 3
+    assert model.is_selected('/v/a.mp4')  # Neue Einträge ausgewählt
+    assert notifications == [(['/v/a.mp4', '/v/C.mp4', '/v/e.mp4', '/v/D.mp4'], True)]
+
+
+def test_apply_change_rename_keeps_order():
+    model, notifications = _model(['/v/a.mp4', '/v/b.mp4', '/v/c.mp4'])
+    model.select_none()
+    notifications.clear()
+    model.apply_change(CatalogChange(['/v/z.mp4'], ['/v/a.mp4'], []), selected=False)
+
+    assert model.items == ['/v/b.mp4', '/v/c.mp4', '/v/z.mp4']
+    assert model.selected() == []
+    assert notifications == [(['/v/z.mp4', '/v/a.mp4'], False)]
+
+    # Weitere Änderungen arbeiten auf der angepassten Reihenfolge
+    model.apply_change(CatalogChange(['/v/bb.mp4'], ['/v/z.mp4'], []), selected=False)
+    assert model.items == ['/v/b.mp4', '/v/bb.mp4', '/v/c.mp4']
+
+
+def test_apply_change_content_only():
+    model, notifications = _model(['/v/a.mp4', '/v/b.mp4'])
+    revision = model.revision
+    model.apply_change(CatalogChange([], [], ['/v/b.mp4', '/v/unbekannt.mp4']))
+
+    assert model.revision == revision
+    assert notifications == [(['/v/b.mp4'], False)]
+
+
+if __name__ == "__main__":
+    for test in (test_apply_change_inserts_sorted_and_removes, test_apply_change_rename_keeps_order,
+                 test_apply_change_content_only):
+        test()
+        print(f"✓ {test.__name__}")